@@ -9,6 +9,19 @@ router = APIRouter()
 def health():
     return {"ok": True}
 
+@router.post("/reload-index")
+def reload_index():
+    """
+    Re-sync the RAG index with datasets/*.json; only changed songs are embedded, serving continues meanwhile.
+
+    Per process: only the worker that handles this request reloads. It also saves the artifact, so
+    the other workers load it (without re-embedding) on their next watcher tick when
+    RAG_WATCH_INTERVAL_S is set, and otherwise at their next restart.
+    """
+    from chains.music_rag_chain import rag_chain
+    from app.core.config import DATASET_FOLDER, RAG_INDEX_DIR
+    return rag_chain.sync(DATASET_FOLDER, index_dir=RAG_INDEX_DIR)
+
 @router.get("/env")
 def env():
     load_dotenv(find_dotenv())
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+from app.services.downloader import get_download_job, cancel_download_job
+
+router = APIRouter()
+
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    job = get_download_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    if get_download_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return {"job_id": job_id, "cancelled": cancel_download_job(job_id)}
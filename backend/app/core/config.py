@@ -1,2 +1,39 @@
+import os
+
 # Most reliable model
 DEFAULT_MODEL_NAME = "gpt-4o-mini"
+
+# RAG catalog: dataset JSON files, sentence embedding model, and the prebuilt
+# index artifact written by `python -m chains.build_index`
+DATASET_FOLDER = os.getenv("RAG_DATASET_FOLDER", "datasets")
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "sentence-transformers/all-mpnet-base-v2")
+# encoder runtime: torch, onnx or openvino; EMBEDDING_MODEL_FILE picks an export in the model repo
+# (e.g. onnx/model_qint8_avx512_vnni.onnx). The index records model, runtime and export; changing
+# any of them (e.g. to sentence-transformers/all-MiniLM-L6-v2) re-embeds the catalog at startup.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_MODEL_FILE = os.getenv("EMBEDDING_MODEL_FILE") or None
+# load the encoder at import instead of on first query, so workers forked after import
+# (gunicorn --preload) share its weights copy-on-write
+EMBEDDING_PRELOAD = os.getenv("EMBEDDING_PRELOAD", "0") == "1"
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", os.path.join("artifacts", "rag_index"))
+# seconds between dataset folder checks for hot reload (0 = off; POST /diag/reload-index still works,
+# but only for the worker that serves it). With several workers, one embeds and saves a change and
+# the others load the saved artifact.
+RAG_WATCH_INTERVAL_S = float(os.getenv("RAG_WATCH_INTERVAL_S", "0"))
+# query embeddings kept in memory (LRU); repeated playlist-edit queries skip the model
+RAG_QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "1024"))
+
+# FAISS index type: flat (exact), ivf-flat, hnsw or ivf-pq; see chains/classes/index_spec_class.py.
+# Changing type/nlist/M rebuilds the index from stored vectors at startup (no re-embedding);
+# nprobe / ef_search are query-time recall knobs. Dataset syncs edit the index in place, except
+# that hnsw rebuilds its whole graph when songs are removed or edited (minutes on large catalogs).
+RAG_INDEX_TYPE = os.getenv("RAG_INDEX_TYPE", "flat")
+RAG_INDEX_NLIST = int(os.getenv("RAG_INDEX_NLIST", "0"))
+RAG_INDEX_NPROBE = int(os.getenv("RAG_INDEX_NPROBE", "8"))
+RAG_INDEX_HNSW_M = int(os.getenv("RAG_INDEX_HNSW_M", "32"))
+RAG_INDEX_EF_SEARCH = int(os.getenv("RAG_INDEX_EF_SEARCH", "64"))
+RAG_INDEX_PQ_M = int(os.getenv("RAG_INDEX_PQ_M", "16"))
+# vector storage in the index: float32, float16 (1/2 RAM) or int8 (1/4 RAM); lossy storage
+# re-scores RAG_INDEX_RERANK x k candidates against the full-precision vectors.npy
+RAG_INDEX_STORAGE = os.getenv("RAG_INDEX_STORAGE", "float32")
+RAG_INDEX_RERANK = int(os.getenv("RAG_INDEX_RERANK", "4"))
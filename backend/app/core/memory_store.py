@@ -1,8 +1,76 @@
-from langchain_core.chat_history import InMemoryChatMessageHistory
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import List, Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, SystemMessage
+
+MAX_SESSIONS = 1000
+SESSION_TTL_S = 6 * 3600
+HISTORY_TOKEN_BUDGET = 2000
+SUMMARY_CHARS = 1200
+
+
+def _tokens(message: BaseMessage) -> int:
+    # ~4 characters per token plus per-message overhead
+    return len(str(message.content)) // 4 + 4
+
+
+class WindowedChatMessageHistory(BaseChatMessageHistory):
+    """
+    Recent turns verbatim within HISTORY_TOKEN_BUDGET; older turns become
+    clipped "- type: text" summary lines sent as one leading system message.
+    A trimmed-down backend_new state/history.py (fixed extractive summary),
+    producing the same prompt for the same conversation.
+    """
+
+    def __init__(self):
+        self._summary: List[str] = []
+        self._recent: List[BaseMessage] = []
+        self._lock = RLock()
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        with self._lock:
+            if not self._summary:
+                return list(self._recent)
+            summary = "Summary of earlier conversation:\n" + "\n".join(self._summary)
+            return [SystemMessage(content=summary)] + self._recent
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        with self._lock:
+            self._recent.extend(messages)
+            total = sum(_tokens(m) for m in self._recent)
+            while total > HISTORY_TOKEN_BUDGET and len(self._recent) > 4:
+                old = self._recent.pop(0)
+                total -= _tokens(old)
+                text = " ".join(str(old.content).split())
+                self._summary.append(f"- {old.type}: {text[:160]}{'…' if len(text) > 160 else ''}")
+            while self._summary and sum(len(l) + 1 for l in self._summary) > SUMMARY_CHARS:
+                self._summary.pop(0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summary = []
+            self._recent = []
+
+
+# session_id -> (last access, history); oldest access first
+_sessions: "OrderedDict[str, tuple]" = OrderedDict()
+_lock = RLock()
 
-_sessions = {}
 
 def get_memory(session_id: str):
-    if session_id not in _sessions:
-        _sessions[session_id] = InMemoryChatMessageHistory()
-    return _sessions[session_id]
+    now = time.time()
+    with _lock:
+        # drop idle sessions, then the least recently used past the cap
+        while _sessions and now - next(iter(_sessions.values()))[0] >= SESSION_TTL_S:
+            _sessions.popitem(last=False)
+        entry = _sessions.get(session_id)
+        history = entry[1] if entry else WindowedChatMessageHistory()
+        _sessions[session_id] = (now, history)
+        _sessions.move_to_end(session_id)
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        return history
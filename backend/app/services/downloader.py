@@ -1,7 +1,24 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from tools.youtube_downloader import YouTubeDownloader
 
 _downloader = YouTubeDownloader()
 
+MAX_PENDING_JOBS = 8
+MAX_KEPT_JOBS = 200
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="download-job")
+_pending = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+class DownloadQueueFull(RuntimeError):
+    pass
+
+
 def download_song_list(songs: list[str], session_id: str = "default") -> list[str]:
     downloaded_files = []
     for song in songs:
@@ -11,3 +28,70 @@ def download_song_list(songs: list[str], session_id: str = "default") -> list[st
         except Exception as e:
             downloaded_files.append(f"Error downloading '{song}' for session {session_id}: {str(e)}")
     return downloaded_files
+
+
+def start_download_job(songs: list[str], session_id: str = "default") -> str:
+    """Queue the songs for background download and return a job id (see get_download_job)."""
+    if not _pending.acquire(blocking=False):
+        raise DownloadQueueFull("Too many downloads in progress, try again later.")
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "session_id": session_id,
+        "status": "queued",
+        "created_at": time.time(),
+        "items": [{"query": s, "stage": "queued", "downloaded_bytes": None, "total_bytes": None,
+                   "eta": None, "path": None, "error": None} for s in songs],
+        "cancel": threading.Event(),
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+        finished = [k for k, j in _jobs.items() if j["status"] in ("done", "cancelled")]
+        for k in finished[:max(0, len(_jobs) - MAX_KEPT_JOBS)]:
+            del _jobs[k]
+    _executor.submit(_run_job, job)
+    return job_id
+
+
+def get_download_job(job_id: str):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+    return {k: v for k, v in job.items() if k != "cancel"}
+
+
+def cancel_download_job(job_id: str) -> bool:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None or job["status"] in ("done", "cancelled"):
+        return False
+    job["cancel"].set()
+    return True
+
+
+def _run_job(job: dict) -> None:
+    try:
+        job["status"] = "running"
+        for item in job["items"]:
+            if job["cancel"].is_set():
+                item["stage"] = "cancelled"
+                continue
+
+            def progress(update, item=item):
+                if job["cancel"].is_set():
+                    raise RuntimeError("cancelled")
+                item.update(update)
+
+            item["stage"] = "fetching"
+            try:
+                item["path"] = _downloader.download(item["query"], progress=progress)
+                item["stage"], item["eta"] = "done", 0
+            except Exception as e:
+                if job["cancel"].is_set():
+                    item["stage"] = "cancelled"
+                else:
+                    item["stage"], item["error"] = "error", str(e)
+        job["status"] = "cancelled" if job["cancel"].is_set() else "done"
+    finally:
+        _pending.release()
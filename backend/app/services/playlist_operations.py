@@ -1,37 +1,32 @@
 import copy
 
+ACTIONS = ["replace", "add", "exclude", "remove", "clear"]
+
 def execute_playlist_operations(current_playlist, operations, rag_chain):
     """
     Executes playlist operations like replace, add, exclude, remove, clear.
     Handles cases where range might be invalid or incomplete.
     """
     playlist = copy.deepcopy(current_playlist)
+    ops = [op for op in operations.get("operations", []) if op.get("action") in ACTIONS]
 
-    for op in operations.get("operations", []):
-        action = op.get("action")
+    # all "replace"/"add" lookups in one batched embedding + search
+    searches = [op for op in ops if op["action"] in ("replace", "add")]
+    found = iter(rag_chain.search_songs_many([search_request(op) for op in searches]))
 
-        # Validate action
-        if action not in ["replace", "add", "exclude", "remove", "clear"]:
-            continue
+    for op in ops:
+        action = op.get("action")
 
         # === 1. REPLACE ===
         if action == "replace":
             start, end = normalize_range(op.get("range", []))
-            filters = op.get("filters", {})
-            count = (end - start) + 1
-            query = build_query(filters)
-            rag_result = rag_chain.recommend_songs(query, top_k=count)
-            new_songs = convert_rag_to_struct(rag_result)
+            new_songs = [song.as_dict() for song in next(found)]
             playlist[start - 1:end] = new_songs
 
         # === 2. ADD ===
         elif action == "add":
-            filters = op.get("filters", {})
-            count = op.get("count", 1)
             position = op.get("position", "end")
-            query = build_query(filters)
-            rag_result = rag_chain.recommend_songs(query, top_k=count)
-            new_songs = convert_rag_to_struct(rag_result)
+            new_songs = [song.as_dict() for song in next(found)]
 
             if position == "start":
                 playlist = new_songs + playlist
@@ -67,6 +62,16 @@ def execute_playlist_operations(current_playlist, operations, rag_chain):
     return playlist
 
 
+def search_request(op):
+    """search_songs kwargs for a "replace" or "add" operation."""
+    if op["action"] == "replace":
+        start, end = normalize_range(op.get("range", []))
+        count = (end - start) + 1
+    else:
+        count = op.get("count", 1)
+    return {"query": build_query(op.get("filters", {})), "top_k": count}
+
+
 def normalize_range(song_range):
     """Ensure range is always a (start, end) tuple."""
     if isinstance(song_range, list):
@@ -88,27 +93,6 @@ def build_query(filters):
     return " ".join(parts)
 
 
-def convert_rag_to_struct(rag_result: str):
-    """Convert rag_chain output string into list of song dicts."""
-    structured = []
-    for line in rag_result.splitlines():
-        if " – " in line:
-            try:
-                _, rest = line.split(". ", 1)
-                artist, title_decade = rest.split(" – ", 1)
-                title, decade = title_decade.rsplit("(", 1)
-                structured.append({
-                    "artist": artist.strip(),
-                    "title": title.strip(),
-                    "decade": decade.replace(")", "").strip(),
-                    "genre": "unknown",
-                    "mood": "unknown"
-                })
-            except ValueError:
-                continue
-    return structured
-
-
 def song_matches_filters(song, filters):
     """Check if a song dict matches given filters."""
     for key, value in filters.items():
@@ -0,0 +1,97 @@
+"""
+Startup cost and query latency of each sentence encoder:
+
+    cd backend && python -m chains.bench_embeddings
+    python -m chains.bench_embeddings --encoder sentence-transformers/all-MiniLM-L6-v2,onnx
+
+Each encoder ("model[,backend[,model_file]]") runs in a fresh interpreter, so
+"load s" is what a worker pays on its first RAG request: imports, weights and
+the first query. Then it reports single-query latency (what a chat turn
+waits for) and batch throughput (what ingest sees). The first run also
+downloads the models; run twice and read the second.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+ENCODERS = [
+    "sentence-transformers/all-mpnet-base-v2,torch",
+    "sentence-transformers/all-MiniLM-L6-v2,torch",
+    "sentence-transformers/all-MiniLM-L6-v2,onnx",
+    "sentence-transformers/all-MiniLM-L6-v2,onnx,onnx/model_qint8_avx512_vnni.onnx",
+]
+
+QUERIES = [
+    "upbeat 80s synth pop for a road trip",
+    "sad acoustic ballads from the 70s",
+    "genre: rock mood: energetic",
+    "something like Fleetwood Mac but newer",
+    "chill lo-fi beats to study to",
+    "decade: 1990s genre: hip hop",
+    "romantic slow dance songs",
+    "workout playlist with heavy guitar riffs",
+]
+
+
+def _parse(encoder: str):
+    parts = encoder.split(",")
+    return parts[0], parts[1] if len(parts) > 1 else "torch", parts[2] if len(parts) > 2 else None
+
+
+def _measure(encoder: str, rounds: int, batch: int) -> dict:
+    """Runs inside the child process."""
+    t0 = time.perf_counter()
+    from chains.embeddings import load_embeddings
+    model = load_embeddings(*_parse(encoder))
+    dim = len(model.embed_query("warm up"))
+    load_s = time.perf_counter() - t0
+
+    times = []
+    for i in range(rounds):
+        query = f"{QUERIES[i % len(QUERIES)]} {i}"  # distinct text, like uncached user queries
+        t0 = time.perf_counter()
+        model.embed_query(query)
+        times.append((time.perf_counter() - t0) * 1000)
+
+    docs = [f"Title: Song {i} | Artist: Band {i % 97} | Decade: 1980s | Genre: rock | Mood: happy" for i in range(batch)]
+    t0 = time.perf_counter()
+    model.embed_documents(docs)
+    docs_per_s = batch / (time.perf_counter() - t0)
+
+    times.sort()
+    return {"dim": dim, "load_s": load_s, "p50_ms": statistics.median(times),
+            "p95_ms": times[int(len(times) * 0.95) - 1], "docs_per_s": docs_per_s}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--encoder", action="append", help="model[,backend[,model_file]] (repeatable)")
+    parser.add_argument("--rounds", type=int, default=100, help="single queries per encoder")
+    parser.add_argument("--batch", type=int, default=512, help="documents in the throughput batch")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_measure(args.child, args.rounds, args.batch)))
+        return
+
+    print(f"{'encoder':70s} {'dim':>4s} {'load s':>7s} {'p50 ms':>7s} {'p95 ms':>7s} {'docs/s':>8s}")
+    for encoder in args.encoder or ENCODERS:
+        proc = subprocess.run(
+            [sys.executable, "-m", "chains.bench_embeddings", "--child", encoder,
+             "--rounds", str(args.rounds), "--batch", str(args.batch)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+            print(f"{encoder:70s} {error}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{encoder:70s} {r['dim']:4d} {r['load_s']:7.2f} {r['p50_ms']:7.2f} {r['p95_ms']:7.2f} {r['docs_per_s']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Recall vs. latency of the RAG index types against the exact (flat) baseline:
+
+    cd backend && python -m chains.bench_index [--songs 100000] [--index-dir artifacts/rag_index]
+
+Uses the stored vectors.npy of a built index when --index-dir is given, else a
+synthetic catalog of clustered unit vectors (--songs x --dim). Queries are
+perturbed catalog vectors. For each index type and recall knob it prints
+build time, index size, recall@k vs. flat and per-query latency. Lossy
+storage (float16/int8, PQ) is shown without and with full-precision re-ranking.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import faiss
+import numpy as np
+
+from chains.classes.index_spec_class import IndexSpec
+
+SWEEP = [
+    (IndexSpec(kind="flat"), [None]),
+    (IndexSpec(kind="ivf-flat"), [1, 4, 16, 64]),
+    (IndexSpec(kind="hnsw"), [16, 32, 64, 128]),
+    (IndexSpec(kind="ivf-pq", rerank=1), [16, 64]),
+    (IndexSpec(kind="ivf-pq"), [16, 64]),
+    (IndexSpec(kind="flat", storage="float16", rerank=1), [None]),
+    (IndexSpec(kind="flat", storage="int8", rerank=1), [None]),
+    (IndexSpec(kind="flat", storage="int8"), [None]),
+    (IndexSpec(kind="hnsw", storage="int8", rerank=1), [64]),
+    (IndexSpec(kind="hnsw", storage="int8"), [64]),
+]
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype("float32")
+
+
+def _synthetic(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((max(1, n // 200), d))
+    return _normalize(centers[rng.integers(0, len(centers), n)] + 0.6 * rng.standard_normal((n, d)))
+
+
+def _size_mb(index: faiss.Index) -> float:
+    return len(faiss.serialize_index(index)) / 2**20
+
+
+def _run(index: faiss.Index, spec: IndexSpec, vectors: np.ndarray, queries: np.ndarray, k: int):
+    times, found = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        _, ids = spec.search(index, vectors, q[None, :], k)
+        times.append((time.perf_counter() - t0) * 1000)
+        found.append(ids[0])
+    return np.array(found), times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-dir", help="built index whose vectors.npy to use")
+    parser.add_argument("--songs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(1)  # per-query latency, as one request sees it
+    rng = np.random.default_rng(0)
+    if args.index_dir:
+        vectors = np.load(os.path.join(args.index_dir, "vectors.npy"))
+    else:
+        vectors = _synthetic(args.songs, args.dim, rng)
+    picks = rng.integers(0, len(vectors), args.queries)
+    queries = _normalize(vectors[picks] + 0.3 * rng.standard_normal((args.queries, vectors.shape[1])) / np.sqrt(vectors.shape[1]))
+    print(f"{len(vectors)} vectors x {vectors.shape[1]} dims, {args.queries} queries, recall@{args.k} vs flat\n")
+
+    truth = None
+    print(f"{'index':12s} {'knob':>18s} {'build s':>8s} {'size MB':>8s} {'recall':>7s} {'p50 ms':>7s} {'p95 ms':>7s}")
+    for spec, knobs in SWEEP:
+        t0 = time.perf_counter()
+        index = spec.build(vectors)
+        build_s = time.perf_counter() - t0
+        for knob in knobs:
+            label = "-"
+            if spec.kind.startswith("ivf"):
+                spec.nprobe, label = knob, f"nprobe={knob}"
+            elif spec.kind == "hnsw":
+                spec.ef_search, label = knob, f"ef={knob}"
+            lossy = spec.kind == "ivf-pq" or spec.storage != "float32"
+            if lossy:
+                label += " rerank" if spec.rerank > 1 else " raw"
+            found, times = _run(index, spec, vectors, queries, args.k)
+            if truth is None:
+                truth = found
+            recall = np.mean([len(set(f) & set(t)) / args.k for f, t in zip(found, truth)])
+            times.sort()
+            name = spec.kind if spec.storage == "float32" or spec.kind == "ivf-pq" else f"{spec.kind}/{spec.storage}"
+            print(f"{name:12s} {label:>18s} {build_s:8.2f} {_size_mb(index):8.1f} {recall:7.3f} "
+                  f"{statistics.median(times):7.3f} {times[int(len(times) * 0.95) - 1]:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
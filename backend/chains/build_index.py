@@ -0,0 +1,50 @@
+"""
+Build the RAG index artifact ahead of time, so backend startup only loads it:
+
+    cd backend && python -m chains.build_index [--force] [--index-type hnsw]
+
+Writes index.faiss, vectors.npy (full-precision embeddings), songs.*
+(columnar song metadata) and manifest.json (dataset fingerprint, index spec
+and per-file row hashes) to RAG_INDEX_DIR. An existing artifact is updated
+incrementally: only new or edited songs are embedded, deleted ones removed.
+"""
+import argparse
+
+from app.core.config import DATASET_FOLDER, EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, EMBEDDING_MODEL_FILE, RAG_INDEX_DIR
+from chains.classes.music_rag_chain_class import MusicRAGChain
+from chains.classes.index_spec_class import IndexSpec, KINDS, STORAGES
+from chains.embeddings import BACKENDS, LazyEmbeddings, same_encoder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the persisted FAISS index for MusicRAGChain.")
+    parser.add_argument("--datasets", default=DATASET_FOLDER, help="folder of dataset *.json files")
+    parser.add_argument("--out", default=RAG_INDEX_DIR, help="artifact directory")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME, help="sentence embedding model")
+    parser.add_argument("--backend", choices=BACKENDS, default=EMBEDDING_BACKEND, help="encoder runtime")
+    parser.add_argument("--model-file", default=EMBEDDING_MODEL_FILE, help="ONNX/OpenVINO export inside the model repo")
+    parser.add_argument("--force", action="store_true", help="re-embed everything instead of updating")
+    parser.add_argument("--index-type", choices=KINDS, help="FAISS index type (default: RAG_INDEX_TYPE)")
+    parser.add_argument("--nlist", type=int, help="IVF lists (0 = about 4*sqrt(n))")
+    parser.add_argument("--hnsw-m", type=int, help="HNSW neighbours per node")
+    parser.add_argument("--pq-m", type=int, help="IVF-PQ bytes per vector")
+    parser.add_argument("--storage", choices=STORAGES, help="vector storage (default: RAG_INDEX_STORAGE)")
+    args = parser.parse_args()
+
+    spec = IndexSpec.from_config(
+        kind=args.index_type, nlist=args.nlist, hnsw_m=args.hnsw_m, pq_m=args.pq_m, storage=args.storage,
+    )
+    manifest = MusicRAGChain.read_manifest(args.out)
+    embeddings = LazyEmbeddings(args.model, args.backend, args.model_file)
+    reuse = not args.force and manifest and same_encoder(manifest, args.model, embeddings)
+    chain = MusicRAGChain(embedding_model_name=args.model, index_dir=args.out if reuse else None,
+                          index_spec=spec, embeddings=embeddings)
+    if reuse and IndexSpec.from_dict(manifest.get("index")).build_key != spec.build_key:
+        chain.reindex()
+        chain.save(args.out)
+    stats = chain.sync(args.datasets, index_dir=args.out)
+    print(f"{args.out}: {stats['total']} songs (+{stats['added']} / -{stats['removed']}), {spec.kind}/{spec.storage} index")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from app.core.memory_store import get_memory
-from app.services.downloader import download_song_list
+from app.services.downloader import start_download_job, DownloadQueueFull
 from app.core.config import DEFAULT_MODEL_NAME
 from app.services.playlist_operations import execute_playlist_operations
 import os
@@ -83,34 +83,13 @@ Extract and return strict JSON:
         except json.JSONDecodeError:
             return {"exclude_artists": [], "exclude_decades": [], "exclude_genres": [], "exclude_moods": []}
 
-    def convert_rag_to_struct(self, rag_result: str) -> list:
-        structured = []
-        for line in rag_result.splitlines():
-            if " – " in line:
-                try:
-                    _, rest = line.split(". ", 1)
-                    artist, title_decade = rest.split(" – ", 1)
-                    title, decade = title_decade.rsplit("(", 1)
-                    structured.append({
-                        "artist": artist.strip(),
-                        "title": title.strip(),
-                        "decade": decade.replace(")", "").strip(),
-                        "genre": "unknown",
-                        "mood": "unknown"
-                    })
-                except ValueError:
-                    continue
-        return structured
-    
-    
     def format_playlist(self, playlist: list) -> str:
         return "\n".join(f"{i+1}. {s['artist']} – {s['title']} ({s['decade']})" for i, s in enumerate(playlist))
 
     def ask(self, user_message: str, session_id: str = "default") -> str:
         intent = self.detect_intent(user_message)
         if intent == "recommendation":
-            rag_result = self.rag_chain.recommend_songs(user_message, top_k=10)
-            playlist = self.convert_rag_to_struct(rag_result)
+            playlist = [song.as_dict() for song in self.rag_chain.search_songs(user_message, top_k=10)]
             self.session_playlists[session_id] = playlist
             self.song_memory[session_id] = [f"{s['artist']} – {s['title']}" for s in playlist]
             return self.format_playlist(playlist)
@@ -130,8 +109,11 @@ Extract and return strict JSON:
             songs = self.song_memory.get(session_id)
             if not songs:
                 return "⚠️ No songs to download for this session."
-            paths = download_song_list(songs, session_id=session_id)
-            return "✅ Downloaded songs:\n" + "\n".join(paths)
+            try:
+                job_id = start_download_job(songs, session_id=session_id)
+            except DownloadQueueFull as e:
+                return f"⚠️ {e}"
+            return f"⏳ Downloading {len(songs)} songs in the background. Progress: GET /jobs/{job_id}"
         # fallback to generic chat
         response = self.llm.invoke(user_message)
         return response if isinstance(response, str) else self._extract_content(response)
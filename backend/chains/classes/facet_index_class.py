@@ -0,0 +1,60 @@
+# backend/chains/classes/facet_index_class.py
+from typing import Dict, List, Tuple
+import numpy as np
+
+FACETS = ("Decade", "Genre", "Mood")
+
+
+class FacetIndex:
+    """
+    Inverted indexes over song metadata: facet -> lowercased value -> sorted
+    int64 FAISS ids. select() resolves the require_* filters to the exact id
+    subset, which the vector search is then restricted to.
+    """
+
+    def __init__(self, columns: Dict[str, Tuple[np.ndarray, List[str]]]):
+        """`columns`: facet -> (vocabulary code per FAISS id, vocabulary), as kept by SongTable."""
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {}
+        for facet in FACETS:
+            codes, vocab = columns[facet]
+            codes = np.asarray(codes)
+            order = np.argsort(codes, kind="stable").astype("int64")
+            bounds = np.searchsorted(codes[order], np.arange(len(vocab) + 1))
+            values: Dict[str, np.ndarray] = {}
+            for code, value in enumerate(vocab):
+                value = value.strip().lower()
+                if not value:
+                    continue
+                ids = order[bounds[code]:bounds[code + 1]]
+                values[value] = np.union1d(values[value], ids) if value in values else ids
+            self.postings[facet] = values
+
+    def _match(self, facet: str, needle: str, exact: bool) -> np.ndarray:
+        needle = needle.strip().lower()
+        values = self.postings[facet]
+        if exact:
+            return values.get(needle, np.empty(0, dtype="int64"))
+        # substring semantics ("rock" matches "soft rock"); the vocabulary is small
+        hits = [ids for v, ids in values.items() if needle in v]
+        return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype="int64")
+
+    def select(
+        self,
+        require_decade: str | None = None,
+        require_genre: str | None = None,
+        require_mood: str | None = None,
+    ) -> np.ndarray | None:
+        """Ids matching every given filter (decade exact, genre/mood substring); None if no filter is set."""
+        subset = None
+        for facet, needle, exact in (
+            ("Decade", require_decade, True),
+            ("Genre", require_genre, False),
+            ("Mood", require_mood, False),
+        ):
+            if not needle:
+                continue
+            ids = self._match(facet, needle, exact)
+            subset = ids if subset is None else np.intersect1d(subset, ids, assume_unique=True)
+            if len(subset) == 0:
+                break
+        return subset
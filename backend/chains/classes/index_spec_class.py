@@ -0,0 +1,222 @@
+# backend/chains/classes/index_spec_class.py
+import math
+from dataclasses import dataclass, asdict, fields
+import numpy as np
+import faiss
+
+KINDS = ("flat", "ivf-flat", "hnsw", "ivf-pq")
+STORAGES = ("float32", "float16", "int8")
+
+_SQ_TYPES = {"float16": faiss.ScalarQuantizer.QT_fp16, "int8": faiss.ScalarQuantizer.QT_8bit}
+# zero-copy mmap of flat/SQ codes and HNSW storage (older FAISS builds: plain read)
+_MMAP_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+
+
+@dataclass
+class IndexSpec:
+    """
+    Which FAISS index MusicRAGChain builds, and how hard it searches.
+
+    flat      exact brute force; best up to a few hundred thousand songs
+    ivf-flat  k-means lists, visits `nprobe` of `nlist`; exact vectors
+    hnsw      graph search, `ef_search` candidates per query; no training
+    ivf-pq    ivf + product-quantized codes (`pq_m` bytes/vector); smallest
+
+    `storage` keeps the vectors of flat/ivf-flat/hnsw as float16 (half the
+    RAM) or int8 scalar-quantized codes (a quarter). Lossy codes are only used
+    to find candidates: `rerank` x k of them are re-scored against the
+    full-precision vectors.npy, which is memory-mapped and read only for them.
+
+    nprobe / ef_search / rerank only affect queries and can be changed without
+    a rebuild. All indexes use inner product on normalized vectors (cosine similarity).
+
+    Dataset syncs edit the index in place (update()). The exception is HNSW:
+    its graph can't drop nodes, so a sync that removes or edits songs rebuilds
+    the whole graph, which takes minutes on a large catalog. Adding songs is
+    incremental.
+    """
+
+    kind: str = "flat"
+    nlist: int = 0            # 0 = about 4*sqrt(n), capped so every list gets >= 39 training points
+    nprobe: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+    pq_m: int = 16
+    pq_bits: int = 8
+    storage: str = "float32"  # ignored by ivf-pq, which has its own codes
+    rerank: int = 4           # candidates per result re-scored at full precision (<= 1: off)
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown index kind {self.kind!r}; expected one of {KINDS}")
+        if self.storage not in STORAGES:
+            raise ValueError(f"Unknown index storage {self.storage!r}; expected one of {STORAGES}")
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "IndexSpec":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
+
+    @classmethod
+    def from_config(cls, **overrides) -> "IndexSpec":
+        """Spec from the RAG_INDEX_* settings in app.core.config; None overrides are ignored."""
+        from app.core import config
+        spec = dict(
+            kind=config.RAG_INDEX_TYPE,
+            nlist=config.RAG_INDEX_NLIST,
+            nprobe=config.RAG_INDEX_NPROBE,
+            hnsw_m=config.RAG_INDEX_HNSW_M,
+            ef_search=config.RAG_INDEX_EF_SEARCH,
+            pq_m=config.RAG_INDEX_PQ_M,
+            storage=config.RAG_INDEX_STORAGE,
+            rerank=config.RAG_INDEX_RERANK,
+        )
+        spec.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**spec)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def build_key(self) -> tuple:
+        """Fields that shape the stored index (a change needs a rebuild, not a re-embed)."""
+        return (self.kind, self.nlist, self.hnsw_m, self.ef_construction, self.pq_m, self.pq_bits, self.storage)
+
+    @property
+    def read_flags(self) -> int:
+        """faiss.read_index flags for an index built from this spec."""
+        # IVF inverted lists read with IO_FLAG_MMAP cannot be cloned for incremental rebuilds
+        return _MMAP_FLAG if self.kind in ("flat", "hnsw") else 0
+
+    # ---------- build ----------
+
+    def build(self, vectors: np.ndarray, previous: faiss.Index | None = None) -> faiss.Index:
+        """
+        Index over `vectors` (ids 0..n-1). IVF kinds are trained on them, unless
+        `previous` is a trained index of the same shape and the catalog hasn't
+        doubled since, in which case its centroids/codebooks are reused.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        n, d = vectors.shape
+        if self._reusable(previous, n, d):
+            index = faiss.clone_index(previous)
+            index.reset()
+        else:
+            index = self._new(n, d)
+            if not index.is_trained and n:
+                index.train(vectors)
+        if n:
+            index.add(vectors)
+        return index
+
+    def update(self, previous: faiss.Index, removed: np.ndarray, added: np.ndarray) -> faiss.Index | None:
+        """
+        Copy of `previous` (built from this spec) without the ids in `removed`,
+        with `added` appended; remaining ids are renumbered to stay dense, so
+        the result equals build() over the same rows. Costs about the size of
+        the change instead of a rebuild. Returns None when build() is needed:
+        an untrained (empty) index, an HNSW graph with deletions (unsupported
+        by FAISS), or an IVF index whose training no longer fits the catalog.
+        """
+        if not previous.is_trained or (len(removed) and isinstance(previous, faiss.IndexHNSW)):
+            return None
+        n = previous.ntotal - len(removed) + len(added)
+        if self.kind.startswith("ivf") and not self._reusable(previous, n, previous.d):
+            return None
+        index = faiss.clone_index(previous)
+        if len(removed):
+            removed = np.asarray(removed, dtype="int64")
+            index.remove_ids(faiss.IDSelectorBatch(removed))
+            ivf = faiss.try_extract_index_ivf(index)
+            if ivf is not None:  # flat codes compact in order on removal; IVF lists keep the old ids
+                _renumber(ivf, removed, previous.ntotal)
+        if len(added):
+            index.add(np.ascontiguousarray(added, dtype="float32"))
+        return index
+
+    def _reusable(self, previous: faiss.Index | None, n: int, d: int) -> bool:
+        if previous is None or not self.kind.startswith("ivf") or previous.d != d:
+            return False
+        ivf = faiss.try_extract_index_ivf(previous)
+        return ivf is not None and ivf.is_trained and n <= 2 * max(previous.ntotal, 1)
+
+    def _new(self, n: int, d: int) -> faiss.Index:
+        ip = faiss.METRIC_INNER_PRODUCT
+        sq = _SQ_TYPES.get(self.storage)
+        # too few songs to train lists/codebooks: brute force is both exact and faster
+        if self.kind == "flat" or (self.kind.startswith("ivf") and n < 2 * 39):
+            return faiss.IndexScalarQuantizer(d, sq, ip) if sq is not None else faiss.IndexFlatIP(d)
+        if self.kind == "hnsw":
+            if sq is not None:
+                index = faiss.IndexHNSWSQ(d, sq, self.hnsw_m, ip)
+            else:
+                index = faiss.IndexHNSWFlat(d, self.hnsw_m, ip)
+            index.hnsw.efConstruction = self.ef_construction
+            return index
+        nlist = self.nlist or max(1, min(int(4 * math.sqrt(n)), n // 39))
+        quantizer = faiss.IndexFlatIP(d)
+        if self.kind == "ivf-flat":
+            if sq is not None:
+                return faiss.IndexIVFScalarQuantizer(quantizer, d, nlist, sq, ip)
+            return faiss.IndexIVFFlat(quantizer, d, nlist, ip)
+        m = max(k for k in range(1, min(self.pq_m, d) + 1) if d % k == 0)
+        nbits = max(1, min(self.pq_bits, int(math.log2(max(n // 39, 2)))))
+        return faiss.IndexIVFPQ(quantizer, d, nlist, m, nbits, ip)
+
+    # ---------- search ----------
+
+    def search_params(self, index: faiss.Index, subset: np.ndarray | None = None):
+        """SearchParameters for `index` with this spec's recall knobs and an optional id selector."""
+        kw = {"sel": faiss.IDSelectorBatch(subset)} if subset is not None else {}
+        if faiss.try_extract_index_ivf(index) is not None:
+            return faiss.SearchParametersIVF(nprobe=self.nprobe, **kw)
+        if isinstance(index, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(efSearch=self.ef_search, **kw)
+        return faiss.SearchParameters(**kw) if kw else None
+
+    def search(
+        self,
+        index: faiss.Index,
+        vectors: np.ndarray,
+        queries: np.ndarray,
+        k: int,
+        subset: np.ndarray | None = None,
+    ) -> tuple:
+        """
+        (scores, ids) like index.search, restricted to `subset`. When the index
+        stores lossy codes, rerank*k candidates are fetched and re-scored exactly
+        against `vectors` (full precision, row i = id i).
+        """
+        params = self.search_params(index, subset)
+        limit = index.ntotal if subset is None else len(subset)
+        if self.rerank <= 1 or _exact_scores(index):
+            return index.search(queries, k, params=params)
+        _, candidates = index.search(queries, min(limit, k * self.rerank), params=params)
+        scores = np.full(candidates.shape, -np.inf, dtype="float32")
+        for row, ids in enumerate(candidates):
+            found = ids >= 0
+            scores[row, found] = np.asarray(vectors[ids[found]], dtype="float32") @ queries[row]
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(candidates, order, axis=1)
+
+
+def _renumber(ivf: faiss.IndexIVF, removed: np.ndarray, old_ntotal: int) -> None:
+    """Rewrite the ids in `ivf`'s lists (in place) as positions among the ids that survived `removed`."""
+    alive = np.ones(old_ntotal, dtype=bool)
+    alive[removed] = False
+    remap = np.cumsum(alive, dtype="int64") - 1
+    invlists = ivf.invlists
+    for list_no in range(ivf.nlist):
+        size = invlists.list_size(list_no)
+        if not size:
+            continue
+        ptr = invlists.get_ids(list_no)
+        ids = faiss.rev_swig_ptr(ptr, size)
+        ids[:] = remap[ids]
+        invlists.release_ids(list_no, ptr)
+
+
+def _exact_scores(index: faiss.Index) -> bool:
+    """True when the index scores with the original float32 vectors (no codes to re-rank)."""
+    return isinstance(index, (faiss.IndexFlat, faiss.IndexHNSWFlat, faiss.IndexIVFFlat))
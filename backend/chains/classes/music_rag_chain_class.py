@@ -1,10 +1,32 @@
 # backend/chains/classes/music_rag_chain_class.py
-from typing import List, Dict, Tuple
-from langchain_community.vectorstores import FAISS
-from langchain_community.docstore.in_memory import InMemoryDocstore
-from langchain.docstore.document import Document
-from langchain_huggingface import HuggingFaceEmbeddings
+import os, glob, json, pickle, shutil, logging, tempfile, threading, time
+from collections import OrderedDict
+from typing import List, Dict, NamedTuple, Tuple
+from langchain_core.embeddings import Embeddings
 import faiss
+import numpy as np
+
+from chains.classes.facet_index_class import FacetIndex
+from chains.classes.index_spec_class import IndexSpec
+from chains.classes.song_match_class import SongMatch, format_songs
+from chains.classes.song_table_class import SongTable
+from chains.embeddings import LazyEmbeddings, encoder_id, same_encoder
+from chains.index_lock import index_dir_lock
+
+from chains.music_datasets import (
+    load_all_music_datasets, read_dataset_file, row_id, file_hashes, dataset_fingerprint, dataset_signature,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.faiss"
+VECTORS_FILE = "vectors.npy"  # full-precision embeddings, row i = FAISS id i
+LEGACY_DOCSTORE_FILE = "index.pkl"  # LangChain FAISS.save_local docstore of older artifacts
+
+# filtered queries whose id subset is at most this large are scored exactly
+# against the stored vectors instead of going through an approximate index
+EXACT_SUBSET_MAX = 4096
 
 def _parse_row(row: str) -> Dict[str, str]:
     # Expect: "Title: X | Artist: Y | Decade: 1970s | Genre: rock | Mood: ballad"
@@ -15,76 +37,440 @@ def _parse_row(row: str) -> Dict[str, str]:
             parts[k.strip()] = v.strip()
     return parts
 
+def _doc_text(meta: Dict[str, str]) -> str:
+    return " | ".join([f"{k}: {meta.get(k,'')}" for k in ["Title","Artist","Decade","Genre","Mood"]])
+
+class _Snapshot(NamedTuple):
+    """Everything one search reads; replaced as a whole, never mutated."""
+    index: faiss.Index
+    songs: SongTable
+    facets: FacetIndex
+    vectors: np.ndarray
+    built: tuple  # IndexSpec.build_key the index was built with
+
+
 class MusicRAGChain:
-    def __init__(self, music_data: list[str], embedding_model_name: str = "sentence-transformers/all-mpnet-base-v2"):
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=embedding_model_name,
-            encode_kwargs={"normalize_embeddings": True}
-        )
-
-        docs: List[Document] = []
-        for row in music_data:
-            meta = _parse_row(row)
-            text = " | ".join([f"{k}: {meta.get(k,'')}" for k in ["Title","Artist","Decade","Genre","Mood"]])
-            docs.append(Document(page_content=text, metadata=meta))
-
-        # Cosine sim FAISS (normalize + IndexFlatIP)
-        dim = len(self.embeddings.embed_query("test"))
-        index = faiss.IndexFlatIP(dim)
-        self.vectorstore = FAISS(
-            embedding_function=self.embeddings,
-            index=index,
-            docstore=InMemoryDocstore({}),
-            index_to_docstore_id={},
-        )
-        self.vectorstore.add_documents(docs)
-
-    def _mmr(self, query: str, k: int, fetch_k: int = 40):
-        # Diversify results (helps avoid 60s entries for a 70s rock ballad query)
-        return self.vectorstore.max_marginal_relevance_search(query, k=k, fetch_k=fetch_k)
-
-    def recommend_songs(
+    def __init__(
+        self,
+        music_data: list[str] | None = None,
+        embedding_model_name: str = "sentence-transformers/all-mpnet-base-v2",
+        index_dir: str | None = None,
+        index_spec: IndexSpec | None = None,
+        query_cache_size: int = 1024,
+        embeddings: Embeddings | None = None,
+    ):
+        """
+        Embed `music_data`, or, with `index_dir`, load a prebuilt index without
+        embedding anything. The encoder (default: `embedding_model_name` on
+        PyTorch) is only loaded when something is first embedded.
+        """
+        self.embedding_model_name = embedding_model_name
+        self.embeddings = embeddings or LazyEmbeddings(embedding_model_name)
+        self.index_spec = index_spec or IndexSpec()
+        # dataset file name -> {"sha256", "rows": [row ids]}; lets sync() skip unchanged files
+        self.files: Dict[str, dict] = {}
+        self.fingerprint: str | None = None
+        self._sync_lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        # normalized query -> embedding, least recently used first
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_lock = threading.Lock()
+        if index_dir is not None:
+            self.reload(index_dir)
+        else:
+            dim = len(self.embeddings.embed_query("test"))
+            empty = np.empty((0, dim), dtype="float32")
+            self._publish(self.index_spec.build(empty), SongTable.from_rows([]), empty)
+            if music_data:
+                self._publish(*self._rebuild({row_id(r): r for r in music_data}, []))
+
+    @property
+    def index(self) -> faiss.Index:
+        return self._state.index
+
+    @property
+    def songs(self) -> SongTable:
+        return self._state.songs
+
+    def reload(self, index_dir: str) -> None:
+        """Replace the live snapshot with the artifact saved in `index_dir`."""
+        with index_dir_lock(index_dir):
+            manifest = self.read_manifest(index_dir) or {}
+            built = IndexSpec.from_dict(manifest.get("index"))
+            state = self._load(index_dir, built)
+        self.files = manifest.get("files", {})
+        self.fingerprint = manifest.get("fingerprint")
+        self._publish(*state, built=built.build_key)
+
+    def _publish(self, index: faiss.Index, songs: SongTable, vectors: np.ndarray, built: tuple | None = None) -> None:
+        """Swap in a new snapshot; searches read self._state once and use only that."""
+        built = self.index_spec.build_key if built is None else built
+        self._state = _Snapshot(index, songs, FacetIndex(songs.categories), vectors, built)
+
+    def _rebuild(
+        self, add: Dict[str, str], remove: List[str], retrain: bool = False,
+    ) -> Tuple[faiss.Index, SongTable, np.ndarray]:
+        """
+        New index/table = current rows minus `remove` plus `add` (id -> dataset row).
+        Only the added rows are embedded, and the current index is edited by
+        the difference. It is rebuilt from the stored vectors per
+        self.index_spec only when it can't be edited (see IndexSpec.update) or
+        on `retrain`; trained IVF centroids are reused unless `retrain`.
+        """
+        snap = self._state
+        removed = set(remove)
+        ids = snap.songs.ids()
+        keep = [pos for pos, i in enumerate(ids) if i not in removed]
+        gone = np.array([pos for pos, i in enumerate(ids) if i in removed], dtype="int64")
+        rows = [(ids[pos], snap.songs.row(pos)) for pos in keep]
+        d = snap.vectors.shape[1]
+        added = np.empty((0, d), dtype="float32")
+        if add:
+            new_ids = list(add)
+            metas = [_parse_row(add[i]) for i in new_ids]
+            added = np.asarray(self.embeddings.embed_documents([_doc_text(m) for m in metas]), dtype="float32")
+            rows += zip(new_ids, metas)
+        vectors = np.vstack([np.asarray(snap.vectors[keep], dtype="float32").reshape(len(keep), d), added])
+
+        index = None
+        if not retrain and snap.built == self.index_spec.build_key:
+            index = self.index_spec.update(snap.index, gone, added)
+        if index is None:
+            t0 = time.perf_counter()
+            index = self.index_spec.build(vectors, previous=None if retrain else snap.index)
+            logger.info("RAG index rebuilt (%s, %d vectors) in %.1fs", self.index_spec.kind, len(vectors),
+                        time.perf_counter() - t0)
+        return index, SongTable.from_rows(rows), vectors
+
+    # ---------- incremental ingestion ----------
+
+    def sync(self, dataset_folder: str, index_dir: str | None = None) -> dict:
+        """
+        Bring the index in line with `dataset_folder`: only files whose hash
+        changed are re-read, only new or edited rows are embedded, and rows that
+        disappeared are deleted. Changes build a new snapshot that replaces
+        the live one in one assignment, so searches keep running on the old
+        snapshot meanwhile. With `index_dir`, the result is saved there too.
+
+        Workers of one deployment share `index_dir`. The first one to see a
+        change embeds and saves it; the others, holding the directory lock after
+        it, find the saved artifact already current and load it instead.
+        """
+        if index_dir is None:
+            with self._sync_lock:
+                return self._sync(dataset_folder, file_hashes(dataset_folder), None)
+        with self._sync_lock, index_dir_lock(index_dir):
+            hashes = file_hashes(dataset_folder)
+            fingerprint = dataset_fingerprint(dataset_folder, self.embedding_model_name, hashes)
+            manifest = self.read_manifest(index_dir)
+            if (fingerprint != self.fingerprint and manifest and manifest.get("fingerprint") == fingerprint
+                    and same_encoder(manifest, self.embedding_model_name, self.embeddings)
+                    and IndexSpec.from_dict(manifest.get("index")).build_key == self.index_spec.build_key):
+                return self._adopt(index_dir)
+            return self._sync(dataset_folder, hashes, index_dir)
+
+    def _adopt(self, index_dir: str) -> dict:
+        """Load the artifact another process already synced; same stats as a local sync."""
+        before, files = set(self.songs.ids()), self.files
+        self.reload(index_dir)
+        after = set(self.songs.ids())
+        changed = [name for name, f in self.files.items() if files.get(name, {}).get("sha256") != f["sha256"]]
+        stats = {"added": len(after - before), "removed": len(before - after), "changed_files": changed,
+                 "total": self.index.ntotal, "reloaded": True}
+        logger.info("RAG index reloaded from %s: %s", index_dir, stats)
+        return stats
+
+    def _sync(self, dataset_folder: str, hashes: Dict[str, str], index_dir: str | None) -> dict:
+        """sync() proper; caller holds self._sync_lock (and the index_dir lock when saving)."""
+        files, rows, changed = {}, {}, []
+        for name, digest in hashes.items():
+            prev = self.files.get(name)
+            if prev and prev["sha256"] == digest:
+                files[name] = prev
+                continue
+            texts = read_dataset_file(os.path.join(dataset_folder, name))
+            ids = [row_id(t) for t in texts]
+            rows.update(zip(ids, texts))
+            files[name] = {"sha256": digest, "rows": ids}
+            changed.append(name)
+
+        wanted = {i for f in files.values() for i in f["rows"]}
+        current = set(self.songs.ids())
+        if any(i not in rows for i in wanted - current):
+            # manifest and index disagree (e.g. an older artifact): re-read everything
+            rows = {row_id(t): t for t in load_all_music_datasets(dataset_folder)}
+        add = {i: rows[i] for i in wanted - current}
+        remove = list(current - wanted)
+
+        if add or remove:
+            self._publish(*self._rebuild(add, remove))
+        dirty = bool(add or remove or changed or set(self.files) != set(files))
+        self.files = files
+        self.fingerprint = dataset_fingerprint(dataset_folder, self.embedding_model_name, hashes)
+        if index_dir and dirty:
+            self.save(index_dir)
+
+        stats = {"added": len(add), "removed": len(remove), "changed_files": changed,
+                 "total": self.index.ntotal}
+        if dirty:
+            logger.info("RAG index sync: %s", stats)
+        return stats
+
+    def watch(self, dataset_folder: str, index_dir: str | None = None, interval: float = 5.0) -> None:
+        """Poll the dataset folder (sizes/mtimes) in a daemon thread and sync() when it changes."""
+        if self._watcher is not None:
+            return
+
+        def loop():
+            last = dataset_signature(dataset_folder)
+            while True:
+                time.sleep(interval)
+                sig = dataset_signature(dataset_folder)
+                if sig == last:
+                    continue
+                try:
+                    self.sync(dataset_folder, index_dir=index_dir)
+                    last = sig
+                except Exception:
+                    logger.exception("RAG index sync failed; will retry")
+
+        self._watcher = threading.Thread(target=loop, name="rag-index-watch", daemon=True)
+        self._watcher.start()
+
+    def reindex(self) -> None:
+        """Rebuild (and retrain) the FAISS index from the stored vectors, e.g. after changing index_spec."""
+        with self._sync_lock:
+            self._publish(*self._rebuild({}, [], retrain=True))
+
+    # ---------- persisted index ----------
+
+    @classmethod
+    def load_or_build(
+        cls,
+        dataset_folder: str,
+        index_dir: str,
+        embedding_model_name: str,
+        index_spec: IndexSpec | None = None,
+        query_cache_size: int = 1024,
+        embeddings: Embeddings | None = None,
+    ) -> "MusicRAGChain":
+        """
+        Load the artifact in `index_dir`. If the datasets changed since it was
+        built, embed only the difference; if the index type changed, rebuild the
+        index from the stored vectors. Embed everything only when there is no
+        artifact for this encoder (model, runtime and export).
+        """
+        index_spec = index_spec or IndexSpec()
+        # workers starting together build or upgrade the artifact once: the others wait
+        # for the lock and then find it current
+        with index_dir_lock(index_dir):
+            manifest = cls.read_manifest(index_dir)
+            if manifest and same_encoder(manifest, embedding_model_name, embeddings):
+                chain = cls(embedding_model_name=embedding_model_name, index_dir=index_dir,
+                            index_spec=index_spec, query_cache_size=query_cache_size, embeddings=embeddings)
+                if IndexSpec.from_dict(manifest.get("index")).build_key != index_spec.build_key:
+                    logger.info("RAG index type changed to %s; rebuilding from stored vectors", index_spec)
+                    chain.reindex()
+                    chain.save(index_dir)
+                elif not SongTable.exists(index_dir):
+                    chain.save(index_dir)  # upgrade an older artifact to the columnar song table
+                if manifest.get("fingerprint") != dataset_fingerprint(dataset_folder, embedding_model_name):
+                    chain.sync(dataset_folder, index_dir=index_dir)
+                return chain
+
+            if manifest:
+                logger.warning("RAG index in %s was embedded with %s, not %s; re-embedding %s", index_dir,
+                               cls._encoder_label(manifest), cls._encoder_label(encoder_id(embedding_model_name, embeddings)),
+                               dataset_folder)
+            else:
+                logger.info("No RAG index for %s in %s; embedding %s", embedding_model_name, index_dir, dataset_folder)
+            chain = cls(embedding_model_name=embedding_model_name, index_spec=index_spec,
+                        query_cache_size=query_cache_size, embeddings=embeddings)
+            chain.sync(dataset_folder, index_dir=index_dir)
+            return chain
+
+    @staticmethod
+    def _encoder_label(fields: dict) -> str:
+        label = f"{fields.get('embedding_model')} ({fields.get('embedding_backend') or 'torch'}"
+        return label + (f", {fields['embedding_model_file']})" if fields.get("embedding_model_file") else ")")
+
+    @staticmethod
+    def read_manifest(index_dir: str) -> dict | None:
+        try:
+            with open(os.path.join(index_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, index_dir: str, fingerprint: str | None = None) -> None:
+        """
+        Write index.faiss + vectors.npy + songs.* (metadata) + manifest.json to a
+        fresh directory next to `index_dir` and swap it in whole, holding the
+        index_dir lock so other processes neither write nor load meanwhile.
+        """
+        snap = self._state
+        parent, name = os.path.split(os.path.abspath(index_dir))
+        os.makedirs(parent, exist_ok=True)
+        with index_dir_lock(index_dir):
+            # leftovers of writers that died mid-save; live ones would be holding the lock
+            for stale in glob.glob(os.path.join(parent, glob.escape(name) + ".tmp-*")):
+                shutil.rmtree(stale, ignore_errors=True)
+            tmp_dir = tempfile.mkdtemp(prefix=name + ".tmp-", dir=parent)
+            try:
+                faiss.write_index(snap.index, os.path.join(tmp_dir, INDEX_FILE))
+                np.save(os.path.join(tmp_dir, VECTORS_FILE), np.asarray(snap.vectors, dtype="float32"))
+                snap.songs.save(tmp_dir)
+                with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                    json.dump({
+                        "fingerprint": fingerprint or self.fingerprint,
+                        **encoder_id(self.embedding_model_name, self.embeddings),
+                        "index": self.index_spec.to_dict(),
+                        "count": snap.index.ntotal,
+                        "built_at": time.time(),
+                        "files": self.files,
+                    }, f, indent=2)
+                old_dir = tmp_dir + ".old"
+                if os.path.isdir(index_dir):
+                    os.replace(index_dir, old_dir)
+                os.replace(tmp_dir, index_dir)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                shutil.rmtree(tmp_dir + ".old", ignore_errors=True)
+
+    def _load(self, index_dir: str, built: IndexSpec) -> Tuple[faiss.Index, SongTable, np.ndarray]:
+        # memory-mapped where FAISS supports it: pages are shared between workers and loaded on demand
+        index = faiss.read_index(os.path.join(index_dir, INDEX_FILE), built.read_flags)
+        if SongTable.exists(index_dir):
+            songs = SongTable.load(index_dir)
+        else:
+            with open(os.path.join(index_dir, LEGACY_DOCSTORE_FILE), "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+            songs = SongTable.from_rows(
+                (index_to_docstore_id[pos], docstore.search(index_to_docstore_id[pos]).metadata)
+                for pos in range(len(index_to_docstore_id))
+            )
+        vectors_path = os.path.join(index_dir, VECTORS_FILE)
+        if os.path.exists(vectors_path):
+            vectors = np.load(vectors_path, mmap_mode="r")
+        else:  # artifacts from before vectors.npy held a flat index
+            vectors = index.reconstruct_n(0, index.ntotal)
+        return index, songs, vectors
+
+    def search_songs(
         self,
         query: str,
         top_k: int = 10,
         require_decade: str | None = None,
         require_genre: str | None = None,
         require_mood: str | None = None,
-    ) -> str:
-        # 1) fetch more than needed
-        docs = self.vectorstore.similarity_search(query, k=top_k * 10)
-
-        # 2) strict filter by metadata
-        filtered = []
-        for d in docs:
-            m = d.metadata
-            if require_decade and m.get("Decade", "").lower() != require_decade.lower():
-                continue
-            if require_genre and require_genre.lower() not in m.get("Genre", "").lower():
-                continue
-            if require_mood and require_mood.lower() not in m.get("Mood", "").lower():
+    ) -> List[SongMatch]:
+        """Best `top_k` songs for `query`, best first, restricted to the required decade/genre/mood."""
+        snap = self._state
+        # 1) exact id subset for the metadata filters (None = no filter)
+        subset = snap.facets.select(require_decade, require_genre, require_mood)
+        if subset is not None and len(subset) == 0:
+            return []
+
+        # 2) vector search restricted to that subset
+        return self._search(snap, self._embed_queries([query])[0], top_k, subset)
+
+    def search_songs_many(self, requests: List[dict]) -> List[List[SongMatch]]:
+        """
+        search_songs() for several requests at once; each request holds its
+        keyword arguments ({"query": ..., "top_k": ..., "require_genre": ...}).
+        Queries are embedded in one pass, and the unfiltered ones share a single
+        FAISS search, so a multi-step playlist edit costs about one search.
+        """
+        if not requests:
+            return []
+        snap = self._state
+        subsets = [
+            snap.facets.select(r.get("require_decade"), r.get("require_genre"), r.get("require_mood"))
+            for r in requests
+        ]
+        top_ks = [r.get("top_k", 10) for r in requests]
+        vectors = self._embed_queries([r["query"] for r in requests])
+
+        results: List[List[SongMatch] | None] = [None] * len(requests)
+        plain = [i for i, subset in enumerate(subsets) if subset is None]
+        ntotal = snap.index.ntotal
+        if plain and ntotal:
+            k = min(ntotal, max(1, 2 * max(top_ks[i] for i in plain)))
+            scores, positions = self.index_spec.search(snap.index, snap.vectors, vectors[plain], k)
+            for i, row_scores, row in zip(plain, scores, positions):
+                found = self._collect(snap.songs, row, row_scores, top_ks[i])
+                if len(found) >= top_ks[i] or k >= ntotal:
+                    results[i] = found
+        for i, found in enumerate(results):
+            if found is None:  # filtered, or too many duplicates in the shared top k
+                results[i] = self._search(snap, vectors[i], top_ks[i], subsets[i])
+        return results
+
+    def recommend_songs(self, query: str, top_k: int = 10, **filters) -> str:
+        """search_songs() as numbered "Artist – Title (Decade)" lines."""
+        return format_songs(self.search_songs(query, top_k=top_k, **filters))
+
+    def recommend_songs_many(self, requests: List[dict]) -> List[str]:
+        """search_songs_many() with each result formatted like recommend_songs()."""
+        return [format_songs(found) for found in self.search_songs_many(requests)]
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Query embeddings, one row per query; cache misses go through the encoder's query path."""
+        keys = [" ".join(q.split()) for q in queries]
+        with self._query_lock:
+            found = {}
+            for key in keys:
+                if key in self._query_cache:
+                    self._query_cache.move_to_end(key)
+                    found[key] = self._query_cache[key]
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            # embed_query, not embed_documents: encoders with a query prompt/instruction
+            # (e5, bge, instructor-style models) embed the two sides differently
+            embedded = np.asarray([self.embeddings.embed_query(q) for q in missing], dtype="float32")
+            with self._query_lock:
+                for key, vector in zip(missing, embedded):
+                    found[key] = self._query_cache[key] = vector
+                    self._query_cache.move_to_end(key)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return np.stack([found[key] for key in keys])
+
+    def _search(self, snap: _Snapshot, query_vector: np.ndarray, top_k: int, subset: np.ndarray | None) -> List[SongMatch]:
+        """Top-k songs deduped by (artist, title), searching only ids in `subset` when given."""
+        limit = snap.index.ntotal if subset is None else len(subset)
+        if limit == 0:
+            return []
+        vector = query_vector.reshape(1, -1)
+
+        if subset is not None and limit <= EXACT_SUBSET_MAX:
+            # small filtered set: exact scores, whatever the index type
+            scores = np.asarray(snap.vectors[subset], dtype="float32") @ vector[0]
+            order = np.argsort(-scores, kind="stable")
+            return self._collect(snap.songs, subset[order], scores[order], top_k)
+
+        # duplicates (same song listed under several moods) are rare: ask for a little
+        # more than top_k and widen only if deduping leaves us short
+        k = min(limit, max(1, top_k * 2))
+        while True:
+            scores, positions = self.index_spec.search(snap.index, snap.vectors, vector, k, subset)
+            results = self._collect(snap.songs, positions[0], scores[0], top_k)
+            if len(results) >= top_k or k >= limit:
+                return results
+            k = min(limit, k * 2)
+
+    @staticmethod
+    def _collect(songs: SongTable, positions, scores, top_k: int) -> List[SongMatch]:
+        seen, results = set(), []
+        for pos, score in zip(positions, scores):
+            if len(results) >= top_k:
+                break
+            if pos < 0:
                 continue
-            filtered.append(d)
-
-        # fallback: if filtering is too strict, use original docs
-        final_docs = filtered if filtered else docs
-
-        # 3) dedupe
-        seen = set()
-        results = []
-        for d in final_docs:
-            a = d.metadata.get("Artist", "").strip()
-            t = d.metadata.get("Title", "").strip()
-            key = (a.lower(), t.lower())
+            meta = songs.row(int(pos))
+            key = (meta.get("Artist", "").strip().lower(), meta.get("Title", "").strip().lower())
             if key not in seen:
                 seen.add(key)
-                results.append(d)
-            if len(results) >= top_k:
-                break
-
-        # 4) format
-        return "\n".join(
-            f"{i+1}. {d.metadata.get('Artist','?')} – {d.metadata.get('Title','?')} ({d.metadata.get('Decade','?')})"
-            for i, d in enumerate(results)
-        )
-
+                results.append(SongMatch.from_metadata(songs.id(int(pos)), meta, score))
+        return results
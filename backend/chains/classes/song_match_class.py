@@ -0,0 +1,47 @@
+# backend/chains/classes/song_match_class.py
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class SongMatch:
+    """One MusicRAGChain search hit: the song's metadata plus its similarity to the query."""
+
+    id: str
+    artist: str
+    title: str
+    decade: str
+    genre: str
+    mood: str
+    score: float
+
+    @classmethod
+    def from_metadata(cls, doc_id: str, meta: Dict[str, str], score: float) -> "SongMatch":
+        return cls(
+            id=doc_id,
+            artist=meta.get("Artist", ""),
+            title=meta.get("Title", ""),
+            decade=meta.get("Decade", ""),
+            genre=meta.get("Genre", ""),
+            mood=meta.get("Mood", ""),
+            score=float(score),
+        )
+
+    def as_dict(self) -> Dict[str, str]:
+        """The playlist entry shape used by sessions and playlist operations."""
+        return {
+            "artist": self.artist,
+            "title": self.title,
+            "decade": self.decade,
+            "genre": self.genre,
+            "mood": self.mood,
+        }
+
+    @property
+    def label(self) -> str:
+        return f"{self.artist or '?'} – {self.title or '?'} ({self.decade or '?'})"
+
+
+def format_songs(songs: Iterable[SongMatch]) -> str:
+    """Numbered "Artist – Title (Decade)" lines, for prompts and chat replies."""
+    return "\n".join(f"{i+1}. {s.label}" for i, s in enumerate(songs))
@@ -0,0 +1,102 @@
+# backend/chains/classes/song_table_class.py
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+TEXT_COLUMNS = ("id", "Title", "Artist")
+CATEGORY_COLUMNS = ("Decade", "Genre", "Mood")
+TABLE_FILE = "songs.json"
+
+
+class SongTable:
+    """
+    Song metadata by FAISS id, stored column-wise rather than as one Python
+    object per song. Free-text columns (row id, Title, Artist) are a single
+    UTF-8 byte array plus int64 offsets; low-cardinality columns (Decade,
+    Genre, Mood) are int32 codes into a small vocabulary. load() memory-maps
+    the arrays, so worker processes share the pages and a lookup touches only
+    the rows it reads.
+    """
+
+    def __init__(
+        self,
+        text: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        categories: Dict[str, Tuple[np.ndarray, List[str]]],
+    ):
+        self.text = text              # column -> (uint8 bytes, int64 offsets of len n+1)
+        self.categories = categories  # column -> (int32 codes of len n, vocabulary)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Dict[str, str]]]) -> "SongTable":
+        """Table from (row id, metadata) pairs, in FAISS id order."""
+        rows = list(rows)
+        text = {}
+        for col in TEXT_COLUMNS:
+            encoded = [(row_id if col == "id" else meta.get(col, "")).encode("utf-8") for row_id, meta in rows]
+            offsets = np.zeros(len(rows) + 1, dtype="int64")
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            text[col] = (np.frombuffer(b"".join(encoded), dtype="uint8"), offsets)
+        categories = {}
+        for col in CATEGORY_COLUMNS:
+            vocab: Dict[str, int] = {}
+            codes = np.fromiter(
+                (vocab.setdefault(meta.get(col, ""), len(vocab)) for _, meta in rows),
+                dtype="int32", count=len(rows),
+            )
+            categories[col] = (codes, list(vocab))
+        return cls(text, categories)
+
+    # ---------- persistence ----------
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, TABLE_FILE))
+
+    def save(self, directory: str) -> None:
+        for col, (data, offsets) in self.text.items():
+            np.save(os.path.join(directory, f"songs.{col.lower()}.bytes.npy"), data)
+            np.save(os.path.join(directory, f"songs.{col.lower()}.offsets.npy"), offsets)
+        for col, (codes, _) in self.categories.items():
+            np.save(os.path.join(directory, f"songs.{col.lower()}.codes.npy"), codes)
+        with open(os.path.join(directory, TABLE_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "count": len(self),
+                "vocab": {col: vocab for col, (_, vocab) in self.categories.items()},
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "SongTable":
+        with open(os.path.join(directory, TABLE_FILE), "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+        def array(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"songs.{name}.npy"), mmap_mode="r")
+
+        text = {col: (array(f"{col.lower()}.bytes"), array(f"{col.lower()}.offsets")) for col in TEXT_COLUMNS}
+        categories = {col: (array(f"{col.lower()}.codes"), header["vocab"][col]) for col in CATEGORY_COLUMNS}
+        return cls(text, categories)
+
+    # ---------- access ----------
+
+    def __len__(self) -> int:
+        return len(self.text["id"][1]) - 1
+
+    def _text(self, col: str, pos: int) -> str:
+        data, offsets = self.text[col]
+        return bytes(data[offsets[pos]:offsets[pos + 1]]).decode("utf-8")
+
+    def id(self, pos: int) -> str:
+        return self._text("id", pos)
+
+    def ids(self) -> List[str]:
+        data, offsets = self.text["id"]
+        raw, bounds = bytes(data), offsets.tolist()
+        return [raw[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+
+    def row(self, pos: int) -> Dict[str, str]:
+        """Metadata of one song, keyed like the dataset rows (Title, Artist, Decade, Genre, Mood)."""
+        meta = {col: self._text(col, pos) for col in TEXT_COLUMNS if col != "id"}
+        for col, (codes, vocab) in self.categories.items():
+            meta[col] = vocab[int(codes[pos])]
+        return meta
@@ -0,0 +1,103 @@
+"""
+Sentence encoders for the RAG chain, loaded on first use and once per process.
+
+Loading all-mpnet-base-v2 takes seconds and a few hundred MB, and many
+requests (health checks, downloads, plain chat) never embed anything. The
+chain therefore holds a LazyEmbeddings and the model is only loaded by the
+first query or ingest. Every chain in the process then shares that one model.
+
+The encoder is configurable: any sentence-transformers model name, run on
+PyTorch ("torch") or an ONNX Runtime / OpenVINO export ("onnx", "openvino").
+`model_file` picks a specific export inside the model repo, e.g. the
+quantized "onnx/model_qint8_avx512_vnni.onnx".
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+_models: Dict[Tuple[str, str, str | None], Embeddings] = {}
+_lock = threading.Lock()
+
+
+def encoder_id(model_name: str, embeddings: Embeddings | None = None) -> Dict[str, str | None]:
+    """
+    Manifest fields naming the encoder behind an index's vectors. Vectors from
+    another model, runtime or export (e.g. a quantized ONNX file) are not
+    interchangeable, so any difference means re-embedding.
+    """
+    return {
+        "embedding_model": model_name,
+        "embedding_backend": getattr(embeddings, "backend", "torch"),
+        "embedding_model_file": getattr(embeddings, "model_file", None),
+    }
+
+
+def same_encoder(manifest: dict, model_name: str, embeddings: Embeddings | None = None) -> bool:
+    """Whether `manifest` was written with this encoder; older manifests only name the model (torch)."""
+    recorded = {"embedding_backend": "torch", "embedding_model_file": None, **manifest}
+    return all(recorded.get(k) == v for k, v in encoder_id(model_name, embeddings).items())
+
+
+def load_embeddings(model_name: str, backend: str = "torch", model_file: str | None = None) -> Embeddings:
+    """The process-wide encoder for this configuration; the first call loads it, concurrent callers wait."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+    key = (model_name, backend, model_file)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = _load(model_name, backend, model_file)
+    return model
+
+
+def _load(model_name: str, backend: str, model_file: str | None) -> Embeddings:
+    # imported here: pulls in torch / transformers, which processes that never embed don't need
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    model_kwargs = {}
+    if backend != "torch":
+        model_kwargs["backend"] = backend
+    if model_file:
+        model_kwargs["model_kwargs"] = {"file_name": model_file}
+    t0 = time.perf_counter()
+    model = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={"normalize_embeddings": True},
+    )
+    logger.info("Loaded embedding model %s (%s) in %.1fs", model_name, backend, time.perf_counter() - t0)
+    return model
+
+
+class LazyEmbeddings(Embeddings):
+    """Embeddings that load their model on the first embed call instead of at construction."""
+
+    def __init__(self, model_name: str, backend: str = "torch", model_file: str | None = None):
+        self.model_name = model_name
+        self.backend = backend
+        self.model_file = model_file
+
+    @property
+    def model(self) -> Embeddings:
+        return load_embeddings(self.model_name, self.backend, self.model_file)
+
+    def load(self) -> Embeddings:
+        """Load the model now instead of on the first embed call."""
+        return self.model
+
+    @property
+    def loaded(self) -> bool:
+        return (self.model_name, self.backend, self.model_file) in _models
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.embed_query(text)
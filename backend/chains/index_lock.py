@@ -0,0 +1,49 @@
+"""
+Inter-process lock on a RAG index directory.
+
+Every uvicorn/gunicorn worker loads, syncs and saves the same RAG_INDEX_DIR.
+Holding index_dir_lock() while reading or replacing the artifact means one
+worker writes at a time, and no worker opens files from a half-swapped
+directory. The lock is an flock on "<index_dir>.lock" next to the directory.
+Within a process it is re-entrant, so save() can run inside a locked sync().
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: serializes threads of this process only
+    fcntl = None
+
+# lock file path -> [thread lock, depth, fd]
+_locks: Dict[str, list] = {}
+_guard = threading.Lock()
+
+
+@contextmanager
+def index_dir_lock(index_dir: str) -> Iterator[None]:
+    """Exclusive lock on `index_dir` across processes; blocks until it is free."""
+    path = os.path.abspath(index_dir) + ".lock"
+    with _guard:
+        entry = _locks.setdefault(path, [threading.RLock(), 0, None])
+    with entry[0]:
+        if entry[1] == 0 and fcntl is not None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                raise
+            entry[2] = fd
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and entry[2] is not None:
+                fcntl.flock(entry[2], fcntl.LOCK_UN)
+                os.close(entry[2])
+                entry[2] = None
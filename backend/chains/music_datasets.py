@@ -0,0 +1,59 @@
+import os, json, glob, hashlib
+
+
+def dataset_files(dataset_folder: str) -> list[str]:
+    return sorted(glob.glob(os.path.join(dataset_folder, "*.json")))
+
+
+def song_row(song: dict) -> str:
+    return (
+        f"Title: {song['title']} | Artist: {song['artist']} | Mood: {song['mood']} | "
+        f"Genre: {song['genre']} | Decade: {song['decade']}"
+    )
+
+
+def row_id(row: str) -> str:
+    """Content-addressed docstore id: an edited song is a new row, an identical one is the same row."""
+    return hashlib.sha1(row.encode("utf-8")).hexdigest()
+
+
+def read_dataset_file(file_path: str) -> list[str]:
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        return [song_row(song) for song in json.load(f)]
+
+
+def load_all_music_datasets(dataset_folder: str):
+    all_songs = []
+    for file_path in dataset_files(dataset_folder):
+        all_songs.extend(read_dataset_file(file_path))
+    return all_songs
+
+
+def file_sha256(file_path: str) -> str:
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_hashes(dataset_folder: str) -> dict[str, str]:
+    return {os.path.basename(p): file_sha256(p) for p in dataset_files(dataset_folder)}
+
+
+def dataset_fingerprint(dataset_folder: str, embedding_model_name: str, hashes: dict[str, str] | None = None) -> str:
+    """sha256 over every dataset file's name and hash plus the embedding model; changes iff something must be re-embedded."""
+    hashes = file_hashes(dataset_folder) if hashes is None else hashes
+    h = hashlib.sha256(embedding_model_name.encode("utf-8"))
+    for name in sorted(hashes):
+        h.update(f"\0{name}\0{hashes[name]}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def dataset_signature(dataset_folder: str) -> tuple:
+    """Cheap change detector (names, sizes, mtimes) for polling without hashing file contents."""
+    sig = []
+    for p in dataset_files(dataset_folder):
+        st = os.stat(p)
+        sig.append((os.path.basename(p), st.st_size, st.st_mtime_ns))
+    return tuple(sig)
@@ -1,23 +1,24 @@
-import os, json, glob
 from chains.classes.music_rag_chain_class import MusicRAGChain
-from app.core.config import DEFAULT_MODEL_NAME
-
-def load_all_music_datasets(dataset_folder: str):
-    all_songs = []
-    json_files = glob.glob(os.path.join(dataset_folder, "*.json"))
-    for file_path in json_files:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            songs = json.load(f)
-            for song in songs:
-                all_songs.append(
-                    f"Title: {song['title']} | Artist: {song['artist']} | Mood: {song['mood']} | "
-                    f"Genre: {song['genre']} | Decade: {song['decade']}"
-                )
-    return all_songs
+from chains.classes.index_spec_class import IndexSpec
+from chains.embeddings import LazyEmbeddings
+from chains.music_datasets import load_all_music_datasets
+from app.core.config import (
+    DATASET_FOLDER, EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, EMBEDDING_MODEL_FILE, EMBEDDING_PRELOAD,
+    RAG_INDEX_DIR, RAG_WATCH_INTERVAL_S, RAG_QUERY_CACHE_SIZE,
+)
 
-DATASET_FOLDER = os.path.join("datasets")
-music_data = load_all_music_datasets(DATASET_FOLDER)
-rag_chain = MusicRAGChain(
-    music_data,
-    embedding_model_name="sentence-transformers/all-mpnet-base-v2"
+# loads the prebuilt index (python -m chains.build_index); embeds only songs that changed since.
+# The encoder itself is loaded on the first query unless EMBEDDING_PRELOAD is set.
+rag_chain = MusicRAGChain.load_or_build(
+    DATASET_FOLDER,
+    RAG_INDEX_DIR,
+    embedding_model_name=EMBEDDING_MODEL_NAME,
+    index_spec=IndexSpec.from_config(),
+    query_cache_size=RAG_QUERY_CACHE_SIZE,
+    embeddings=LazyEmbeddings(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND, EMBEDDING_MODEL_FILE),
 )
+if EMBEDDING_PRELOAD:
+    rag_chain.embeddings.load()
+if RAG_WATCH_INTERVAL_S > 0:
+    # hot reload: dataset edits are picked up without a restart
+    rag_chain.watch(DATASET_FOLDER, index_dir=RAG_INDEX_DIR, interval=RAG_WATCH_INTERVAL_S)
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import pickle
+
+import faiss
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.services.playlist_operations import execute_playlist_operations
+from chains.classes.index_spec_class import KINDS, IndexSpec
+from chains.classes.music_rag_chain_class import MusicRAGChain, _doc_text, _parse_row
+from chains.classes.song_match_class import SongMatch, format_songs
+from chains.classes.song_table_class import SongTable
+from chains.music_datasets import dataset_fingerprint, row_id, song_row
+
+GENRES = ["rock", "pop", "metal", "disco", "jazz"]
+MOODS = ["happy", "sad", "energetic"]
+DECADES = ["1970s", "1980s", "1990s"]
+QUERIES = ["happy rock", "sad jazz from the 1990s", "Band 3", "energetic disco"]
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic stand-in encoder (hashed bag of words) that records what it embedded."""
+    def __init__(self, dim=32, backend="torch", model_file=None):
+        self.dim, self.backend, self.model_file = dim, backend, model_file
+        self.documents, self.queries = [], []
+    def vector(self, text):
+        v = np.zeros(self.dim, dtype="float32")
+        for word in text.lower().replace("|", " ").replace(":", " ").split():
+            v[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        return (v / (np.linalg.norm(v) or 1)).tolist()
+    def embed_documents(self, texts):
+        self.documents += texts
+        return [self.vector(t) for t in texts]
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self.vector(text)
+
+
+def _songs(n, start=0):
+    return [{"title": f"Song {i}", "artist": f"Band {i % 17}", "mood": MOODS[i % 3],
+             "genre": GENRES[i % 5], "decade": DECADES[i % 3]} for i in range(start, start + n)]
+
+def _write(folder, name, songs):
+    (folder / name).write_text(json.dumps(songs), encoding="utf-8")
+
+def _dataset(tmp_path, n=120):
+    folder = tmp_path / "datasets"
+    folder.mkdir()
+    _write(folder, "a.json", _songs(n // 2))
+    _write(folder, "b.json", _songs(n - n // 2, n // 2))
+    return folder
+
+def _ids(matches):
+    return [m.id for m in matches]
+
+
+@pytest.mark.parametrize("kind,storage", [(k, s) for k in KINDS for s in ("float32", "float16", "int8") if k != "ivf-pq" or s == "float32"])
+def test_save_and_load_round_trip(tmp_path, kind, storage):
+    spec = IndexSpec(kind=kind, storage=storage)
+    chain = MusicRAGChain(music_data=[song_row(s) for s in _songs(120)], index_spec=spec, embeddings=HashEmbeddings())
+    index_dir = str(tmp_path / "rag_index")
+    chain.save(index_dir)
+    chain.save(index_dir)  # replacing an existing artifact
+    assert sorted(os.listdir(tmp_path)) == ["rag_index", "rag_index.lock"]
+
+    enc = HashEmbeddings()
+    loaded = MusicRAGChain(index_dir=index_dir, index_spec=spec, embeddings=enc)
+    assert MusicRAGChain.read_manifest(index_dir)["index"]["kind"] == kind
+    assert loaded.index.ntotal == 120 and list(loaded.songs.ids()) == list(chain.songs.ids())
+    for query in QUERIES:
+        assert _ids(loaded.search_songs(query, top_k=5)) == _ids(chain.search_songs(query, top_k=5))
+    assert enc.documents == []
+    assert isinstance(loaded._state.vectors, np.memmap)  # mapped from vectors.npy, not read in
+
+
+def test_load_or_build_reuses_a_saved_index(tmp_path):
+    folder = _dataset(tmp_path)
+    index_dir = str(tmp_path / "rag_index")
+    built = MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=HashEmbeddings())
+    assert MusicRAGChain.read_manifest(index_dir)["fingerprint"] == dataset_fingerprint(str(folder), "m")
+
+    enc = HashEmbeddings()
+    loaded = MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=enc)
+    assert enc.documents == [] and loaded.index.ntotal == 120
+    for query in QUERIES:
+        assert _ids(loaded.search_songs(query, top_k=5)) == _ids(built.search_songs(query, top_k=5))
+
+
+def test_sync_embeds_only_the_delta(tmp_path):
+    folder = _dataset(tmp_path)
+    enc = HashEmbeddings()
+    chain = MusicRAGChain(embeddings=enc)
+    assert chain.sync(str(folder))["added"] == 120 and len(enc.documents) == 120
+
+    songs = _songs(60, 60)
+    songs[0]["mood"] = "sad"                 # edited: Song 60
+    del songs[1]                             # removed: Song 61
+    songs += _songs(1, 500)                  # added: Song 500
+    _write(folder, "b.json", songs)
+    enc.documents.clear()
+    stats = chain.sync(str(folder))
+    assert stats == {"added": 2, "removed": 2, "changed_files": ["b.json"], "total": 120}
+    assert sorted(enc.documents) == sorted(_doc_text(_parse_row(song_row(s))) for s in (songs[0], songs[-1]))
+
+    assert chain.sync(str(folder))["added"] == 0 and len(enc.documents) == 2
+    found = {m.title: m for m in chain.search_songs("Song", top_k=200)}
+    assert "Song 61" not in found and "Song 500" in found and found["Song 60"].mood == "sad"
+
+
+def test_second_worker_loads_a_sync_saved_by_the_first(tmp_path):
+    folder = _dataset(tmp_path)
+    index_dir = str(tmp_path / "rag_index")
+    first = MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=HashEmbeddings())
+    enc = HashEmbeddings()
+    second = MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=enc)
+
+    _write(folder, "c.json", _songs(5, 300))
+    assert first.sync(str(folder), index_dir=index_dir)["added"] == 5
+    stats = second.sync(str(folder), index_dir=index_dir)
+    assert stats["reloaded"] and stats["added"] == 5 and stats["total"] == 125
+    assert enc.documents == []
+
+
+def test_filters_restrict_results_and_empty_subsets_return_nothing():
+    chain = MusicRAGChain(music_data=[song_row(s) for s in _songs(120)], embeddings=HashEmbeddings())
+    assert chain.search_songs("rock", require_genre="polka") == []
+    assert chain.search_songs("rock", require_decade="1960s", require_genre="rock") == []
+    found = chain.search_songs("happy", top_k=10, require_genre="ROCK", require_decade="1980s")
+    assert len(found) == 8 and {(m.genre, m.decade) for m in found} == {("rock", "1980s")}
+    assert "Song 60" not in {m.title for m in chain.search_songs("Song 60", top_k=50, require_mood="sad")}
+
+
+@pytest.mark.parametrize("kind,rebuilds", [("flat", 0), ("ivf-flat", 0), ("hnsw", 1)])
+def test_sync_edits_the_index_in_place(tmp_path, monkeypatch, kind, rebuilds):
+    folder = _dataset(tmp_path, n=200)
+    enc = HashEmbeddings()
+    chain = MusicRAGChain(index_spec=IndexSpec(kind=kind, nprobe=64), embeddings=enc)
+    chain.sync(str(folder))
+    builds = []
+    build = IndexSpec.build
+    monkeypatch.setattr(IndexSpec, "build", lambda self, *a, **kw: builds.append(1) or build(self, *a, **kw))
+
+    _write(folder, "c.json", _songs(3, 900))           # additions only
+    chain.sync(str(folder))
+    _write(folder, "a.json", _songs(95, 5))            # Song 0-4 removed
+    chain.sync(str(folder))
+    assert len(builds) == rebuilds  # HNSW can't delete graph nodes, the others are edited
+    assert chain.index.ntotal == 198
+
+    # ids still line up with the song table after the removals renumbered them
+    for query in QUERIES:
+        q = np.asarray(enc.vector(query))
+        for m in chain.search_songs(query, top_k=5):
+            meta = chain.songs.row(list(chain.songs.ids()).index(m.id))
+            assert m.score == pytest.approx(float(np.asarray(enc.vector(_doc_text(meta))) @ q), abs=1e-4)
+
+
+def test_search_songs_many_matches_search_songs():
+    enc = HashEmbeddings()
+    chain = MusicRAGChain(music_data=[song_row(s) for s in _songs(120)], embeddings=enc)
+    requests = [
+        {"query": "happy rock", "top_k": 5},
+        {"query": "sad jazz", "top_k": 3, "require_decade": "1990s"},
+        {"query": "Band 3", "top_k": 8},
+        {"query": "energetic", "top_k": 4, "require_genre": "polka"},
+    ]
+    enc.queries.clear()
+    batch = chain.search_songs_many(requests)
+    # queries go through embed_query (the encoder's query side), each embedded once
+    assert sorted(enc.queries) == sorted(r["query"] for r in requests)
+    assert not {r["query"] for r in requests} & set(enc.documents)
+    for request, found in zip(requests, batch):
+        single = chain.search_songs(**request)
+        assert _ids(found) == _ids(single)
+        assert [m.score for m in found] == pytest.approx([m.score for m in single], abs=1e-5)
+    assert len(enc.queries) == len(requests)  # the single searches hit the query cache
+    assert chain.recommend_songs_many(requests) == [chain.recommend_songs(**r) for r in requests]
+
+
+def test_results_are_song_matches_with_full_metadata():
+    songs = _songs(120)
+    chain = MusicRAGChain(music_data=[song_row(s) for s in songs], embeddings=HashEmbeddings())
+    by_title = {s["title"]: s for s in songs}
+    found = chain.search_songs("Song 7", top_k=5)
+    assert found and all(isinstance(m, SongMatch) for m in found)
+    assert [m.as_dict() for m in found] == [by_title[m.title] for m in found]
+    assert chain.recommend_songs("Song 7", top_k=5) == format_songs(found)
+
+    ops = {"operations": [
+        {"action": "add", "filters": {"genre": "rock"}, "count": 2},
+        {"action": "replace", "range": [1, 1], "filters": {"mood": "sad"}},
+    ]}
+    playlist = execute_playlist_operations([], ops, chain)
+    assert playlist == [chain.search_songs("mood: sad", top_k=1)[0].as_dict(),
+                        chain.search_songs("genre: rock", top_k=2)[1].as_dict()]
+
+
+def test_legacy_pickle_artifact_is_upgraded_without_embedding(tmp_path):
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_core.documents import Document
+
+    folder = _dataset(tmp_path)
+    rows = [song_row(s) for s in _songs(120)]
+    metas = [_parse_row(r) for r in rows]
+    legacy = HashEmbeddings()
+    index = faiss.IndexFlatIP(legacy.dim)
+    index.add(np.asarray(legacy.embed_documents([_doc_text(m) for m in metas]), dtype="float32"))
+    index_dir = tmp_path / "rag_index"
+    index_dir.mkdir()
+    faiss.write_index(index, str(index_dir / "index.faiss"))
+    docstore = InMemoryDocstore({row_id(r): Document(page_content=_doc_text(m), metadata=m) for r, m in zip(rows, metas)})
+    with open(index_dir / "index.pkl", "wb") as f:
+        pickle.dump((docstore, {pos: row_id(r) for pos, r in enumerate(rows)}), f)
+    (index_dir / "manifest.json").write_text(json.dumps(
+        {"fingerprint": dataset_fingerprint(str(folder), "m"), "embedding_model": "m"}))
+
+    enc = HashEmbeddings()
+    chain = MusicRAGChain.load_or_build(str(folder), str(index_dir), "m", embeddings=enc)
+    assert enc.documents == []
+    assert SongTable.exists(str(index_dir)) and not (index_dir / "index.pkl").exists()
+    assert (index_dir / "vectors.npy").exists()
+    fresh = MusicRAGChain(music_data=rows, embeddings=HashEmbeddings())
+    for query in QUERIES:
+        assert _ids(chain.search_songs(query, top_k=5)) == _ids(fresh.search_songs(query, top_k=5))
+
+
+def test_encoder_change_re_embeds_and_is_recorded(tmp_path):
+    folder = _dataset(tmp_path)
+    index_dir = str(tmp_path / "rag_index")
+    MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=HashEmbeddings())
+
+    onnx = HashEmbeddings(backend="onnx", model_file="onnx/model_qint8_avx512_vnni.onnx")
+    MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=onnx)
+    assert len(onnx.documents) == 120
+    manifest = MusicRAGChain.read_manifest(index_dir)
+    assert (manifest["embedding_backend"], manifest["embedding_model_file"]) == ("onnx", onnx.model_file)
+
+    same = HashEmbeddings(backend="onnx", model_file=onnx.model_file)
+    MusicRAGChain.load_or_build(str(folder), index_dir, "m", embeddings=same)
+    assert same.documents == []
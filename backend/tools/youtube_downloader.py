@@ -15,10 +15,11 @@ class YouTubeDownloader:
         safe_name = re.sub(r'[<>:"/\\|?*]', "_", name)
         return safe_name.replace("–", "-")
 
-    def download(self, song_name: str) -> str:
+    def download(self, song_name: str, progress=None) -> str:
         """
         Search YouTube for the song and download the best audio as .mp3.
         Returns the path to the downloaded file.
+        `progress(dict)` receives yt-dlp progress updates; raising from it aborts.
         """
         safe_name = self.sanitize_filename(song_name)
         output_template = os.path.join(self.download_folder, f"{safe_name}.%(ext)s")
@@ -38,6 +39,14 @@ class YouTubeDownloader:
             ],
         }
 
+        if progress:
+            ydl_opts["progress_hooks"] = [lambda d: progress({
+                "stage": "fetching" if d.get("status") == "downloading" else "transcoding",
+                "downloaded_bytes": d.get("downloaded_bytes"),
+                "total_bytes": d.get("total_bytes") or d.get("total_bytes_estimate"),
+                "eta": d.get("eta"),
+            })]
+
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(song_name, download=True)
             filename = ydl.prepare_filename(info)
@@ -1,45 +1,55 @@
 # backend/agent/builder.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools.render import render_text_description
 
 # NEW: message history wrapper + store
-from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
-from backend.state.memory import LatestListStore
+from backend.state.memory import BaseListStore
+from backend.state.history import HistoryStore
 from backend.classes import MusicBrainzClient
 from backend.tools.suggest_songs import make_suggest_songs_tool
 from backend.tools.modify_list import make_modify_latest_tool
 from backend.tools.download_latest import make_download_latest_tool
+from backend.tools.download_jobs import DownloadJobManager
 
-# simple in-process history store (per-session)
-_histories: Dict[str, InMemoryChatMessageHistory] = {}
+# in-process history store (per-session): LRU/TTL across sessions, token-budget window per session
+_histories = HistoryStore()
 
-def _get_history(session_id: str) -> InMemoryChatMessageHistory:
-    if session_id not in _histories:
-        _histories[session_id] = InMemoryChatMessageHistory()
-    return _histories[session_id]
+def _get_history(session_id: str) -> BaseChatMessageHistory:
+    return _histories.get(session_id)
+
+def _with_session_id(inputs: dict, config: RunnableConfig) -> dict:
+    # session identity travels only in the runnable config; expose it to the prompt
+    return {**inputs, "session_id": config["configurable"]["session_id"]}
 
 def build_agent(
     mbc: MusicBrainzClient,
-    store: LatestListStore,
+    store: BaseListStore,
     model: str,
-    session_id: str,
+    jobs: DownloadJobManager | None = None,
 ):
+    """
+    Build the agent once (prompt, LLM, tools, executor) and reuse it for every
+    request. Invoke with {"input": ...} and config={"configurable": {"session_id": ...}}.
+    """
     system_template = Path(__file__).resolve().parents[1] / "prompts" / "agent_system.txt"
     system_text = system_template.read_text(encoding="utf-8")
 
     llm = ChatOpenAI(model=model, temperature=0)
 
+    # resolve YouTube hits as soon as a list exists, so a later download is media transfer only
+    downloader = jobs.downloader if jobs is not None else None
     tools = [
-        make_suggest_songs_tool(mbc, store),
-        make_modify_latest_tool(mbc, store),
-        make_download_latest_tool(store),
+        make_suggest_songs_tool(mbc, store, downloader=downloader),
+        make_modify_latest_tool(mbc, store, downloader=downloader),
+        make_download_latest_tool(store, jobs=jobs),
     ]
 
     prompt = ChatPromptTemplate.from_messages([
@@ -59,9 +69,8 @@ def build_agent(
     tool_text = render_text_description(tools)
     tool_names = ", ".join(t.name for t in tools)
 
-    # bind static vars
+    # bind static vars; {session_id} is filled per call from the config
     prompt = prompt.partial(
-        session_id=session_id,   # fills {session_id} in your system prompt
         tools=tool_text,
         tool_names=tool_names,
     )
@@ -71,8 +80,8 @@ def build_agent(
 
     # Wrap with message history
     runnable = RunnableWithMessageHistory(
-        executor,
-        get_session_history=_get_history,        # function(session_id) -> InMemoryChatMessageHistory
+        RunnableLambda(_with_session_id) | executor,
+        get_session_history=_get_history,        # function(session_id) -> chat history
         input_messages_key="input",              # where user text comes in
         history_messages_key="chat_history",     # the placeholder you added above
         output_messages_key="output",            # where final text is written
@@ -0,0 +1,99 @@
+"""
+Per-song overhead of a fresh YoutubeDL per download vs. a pooled, long-lived
+session (YDLPool), measured against a local stand-in HTTP media server so the
+numbers reflect yt-dlp setup cost rather than YouTube's network.
+
+    python -m backend.benchmarks.ydl_sessions --songs 40 --size-kb 256
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import yt_dlp
+
+from backend.tools.ydl_pool import YDLPool
+
+OPTS = {"format": "bestaudio/best", "noplaylist": True, "quiet": True, "noprogress": True}
+
+
+class _MediaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real CDN
+
+    def __init__(self, payload: bytes, *args, **kwargs):
+        self.payload = payload
+        super().__init__(*args, **kwargs)
+
+    def _headers(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/webm")
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._headers()
+
+    def do_GET(self):
+        self._headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # a closed YoutubeDL drops its keep-alive sockets; that is expected here
+
+
+def _serve(size_kb: int):
+    server = _Server(("127.0.0.1", 0), partial(_MediaHandler, b"\x1a\x45\xdf\xa3" * (size_kb * 256)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _fresh(url: str, outtmpl: str) -> None:
+    with yt_dlp.YoutubeDL({**OPTS, "outtmpl": outtmpl}) as ydl:
+        ydl.extract_info(url, download=True)
+
+
+def _pooled(pool: YDLPool, url: str, outtmpl: str) -> None:
+    with pool.session() as session, session.item(outtmpl) as ydl:
+        ydl.extract_info(url, download=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=40)
+    parser.add_argument("--size-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    server, base = _serve(args.size_kb)
+    pool = YDLPool(OPTS, max_idle=1)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = {"fresh YoutubeDL": lambda url, out: _fresh(url, out),
+                    "pooled session": lambda url, out: _pooled(pool, url, out)}
+            for label, run in runs.items():
+                run(f"{base}/warmup.webm", str(Path(tmp) / f"warmup-{label}.%(ext)s"))
+                times = []
+                for i in range(args.songs):
+                    out = str(Path(tmp) / f"{label}-{i}.%(ext)s")
+                    t0 = time.perf_counter()
+                    run(f"{base}/song-{i}.webm", out)
+                    times.append((time.perf_counter() - t0) * 1000)
+                print(f"{label:16s} median {statistics.median(times):7.1f} ms  "
+                      f"mean {statistics.mean(times):7.1f} ms  p95 {sorted(times)[int(len(times) * 0.95) - 1]:7.1f} ms")
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
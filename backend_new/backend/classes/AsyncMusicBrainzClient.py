@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .Recording import Recording
+from .RecordingQuery import RecordingQuery
+from .LookupCache import LookupCache
+from .SearchCache import SearchCache
+from .RateLimiter import RateLimiter, DEFAULT_LIMITER
+from .MusicBrainzClient import MusicBrainzClient, EnrichmentPlan, to_ngs_shape
+
+if TYPE_CHECKING:
+    from .LocalRecordingIndex import LocalRecordingIndex
+
+MB_WS_URL = "https://musicbrainz.org/ws/2"
+USER_AGENT = "MusicChatbot/0.1 ( test@tets.com )"
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMusicBrainzClient:
+    """
+    asyncio-native MusicBrainz client over the JSON web service (httpx).
+
+    Same search_recordings / Recording contract as MusicBrainzClient and the
+    same caches and rate limiter can be shared with it. Concurrent requests for
+    the same URL are coalesced into one upstream call (single-flight) whose
+    result is handed to every waiter.
+    """
+
+    def __init__(
+        self,
+        base_url: str = MB_WS_URL,
+        cache: Optional[LookupCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        http: Optional[httpx.AsyncClient] = None,
+        timeout: float = 15.0,
+        local_index: Optional["LocalRecordingIndex"] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.search_cache = search_cache
+        self.local_index = local_index
+        self.limiter = limiter or DEFAULT_LIMITER
+        self._http = http or httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+            timeout=timeout,
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: set = set()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def search_recordings(
+        self,
+        query: str | RecordingQuery,
+        limit: int = 10,
+        enrich_missing_dates: bool = False,
+        enrich_genres: bool = False,
+    ) -> List[Recording]:
+        """See MusicBrainzClient.search_recordings."""
+        lucene_query = query.to_lucene() if isinstance(query, RecordingQuery) else query
+        if self.search_cache is None:
+            return await self._search(lucene_query, limit, enrich_missing_dates, enrich_genres)
+
+        key = MusicBrainzClient._search_cache_key(query, limit, enrich_missing_dates, enrich_genres)
+        cached, stale = self.search_cache.get(key)
+        if cached is not None:
+            if stale and self.search_cache.begin_refresh(key):
+                task = asyncio.create_task(
+                    self._revalidate(key, lucene_query, limit, enrich_missing_dates, enrich_genres)
+                )
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return cached
+
+        out = await self._search(lucene_query, limit, enrich_missing_dates, enrich_genres)
+        self.search_cache.put(key, out)
+        return out
+
+    async def _revalidate(self, key: str, lucene_query: str, limit: int, enrich_missing_dates: bool, enrich_genres: bool) -> None:
+        try:
+            # a refresh has no one waiting on it: it must not take interactive-lane tokens
+            out = await self._search(lucene_query, limit, enrich_missing_dates, enrich_genres, lane=RateLimiter.BACKGROUND)
+            self.search_cache.put(key, out)
+        except Exception:
+            logger.exception("Background refresh of search %r failed", lucene_query)
+        finally:
+            self.search_cache.end_refresh(key)
+
+    async def _search(
+        self,
+        lucene_query: str,
+        limit: int,
+        enrich_missing_dates: bool,
+        enrich_genres: bool,
+        lane: int = RateLimiter.INTERACTIVE,
+    ) -> List[Recording]:
+        if self.local_index is not None:
+            return self.local_index.search(lucene_query, limit)
+        res = await self._get("recording", {"query": lucene_query, "limit": str(limit)}, lane)
+        out = MusicBrainzClient._recordings_from_search(res)
+        if enrich_missing_dates or enrich_genres:
+            await self._enrich_many(out, need_date=enrich_missing_dates, need_genre=enrich_genres)
+        return out
+
+    async def stream_recordings(
+        self,
+        query: str | RecordingQuery,
+        limit: int = 10,
+        enrich_missing_dates: bool = False,
+        enrich_genres: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Progressive form of search_recordings. Yields:
+          {"event": "results", "recordings": [...]}   base page, right after the search call
+          {"event": "patch", "index", "mbid", "fields"}  as each enrichment lookup resolves
+          {"event": "done"}
+        """
+        lucene_query = query.to_lucene() if isinstance(query, RecordingQuery) else query
+        key = None
+        if self.search_cache is not None:
+            key = MusicBrainzClient._search_cache_key(query, limit, enrich_missing_dates, enrich_genres)
+            cached, stale = self.search_cache.get(key)
+            if cached is not None and not stale:
+                yield {"event": "results", "recordings": [r.to_json() for r in cached]}
+                yield {"event": "done"}
+                return
+
+        if self.local_index is not None:
+            yield {"event": "results", "recordings": [r.to_json() for r in self.local_index.search(lucene_query, limit)]}
+            yield {"event": "done"}
+            return
+
+        res = await self._get("recording", {"query": lucene_query, "limit": str(limit)}, RateLimiter.INTERACTIVE)
+        out = MusicBrainzClient._recordings_from_search(res)
+        yield {"event": "results", "recordings": [r.to_json() for r in out]}
+
+        if enrich_missing_dates or enrich_genres:
+            async for index, fields in self._enrich_iter(out, need_date=enrich_missing_dates, need_genre=enrich_genres):
+                yield {"event": "patch", "index": index, "mbid": out[index].mbid, "fields": fields}
+        if key is not None:
+            self.search_cache.put(key, out)
+        yield {"event": "done"}
+
+    async def _enrich_many(self, recs: List[Recording], need_date: bool, need_genre: bool) -> None:
+        """See MusicBrainzClient._enrich_many; each stage's lookups run concurrently."""
+        async for _ in self._enrich_iter(recs, need_date=need_date, need_genre=need_genre):
+            pass
+
+    _ENRICHED_FIELDS = ("genre", "first_release_date", "decade")
+
+    async def _enrich_iter(self, recs: List[Recording], need_date: bool, need_genre: bool) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Drive an EnrichmentPlan, applying each lookup as soon as it returns.
+        Yields (index, changed fields) for every recording a lookup updated.
+        """
+        plan = EnrichmentPlan(recs, need_date=need_date, need_genre=need_genre)
+        for entity in EnrichmentPlan.STAGES:
+            ids, includes = plan.pending(entity)
+            if not ids:
+                continue
+
+            async def one(mbid: str) -> Tuple[str, Optional[dict]]:
+                return mbid, await self._lookup_or_none(entity, mbid, includes)
+
+            for next_done in asyncio.as_completed([one(i) for i in ids]):
+                mbid, payload = await next_done
+                before = [tuple(getattr(r, f) for f in self._ENRICHED_FIELDS) for r in recs]
+                plan.fill(entity, {mbid: payload})
+                for index, (rec, old) in enumerate(zip(recs, before)):
+                    changed = {
+                        f: getattr(rec, f)
+                        for f, prev in zip(self._ENRICHED_FIELDS, old)
+                        if getattr(rec, f) != prev
+                    }
+                    if changed:
+                        yield index, changed
+
+    async def _lookup_or_none(self, entity: str, mbid: str, includes: List[str]) -> Optional[dict]:
+        try:
+            return await self._lookup(entity, mbid, includes)
+        except Exception as e:
+            logger.warning("%s lookup of %s failed: %s", entity, mbid, e)
+            return None
+
+    async def _lookup(self, entity: str, mbid: str, includes: List[str]) -> dict:
+        if self.cache is not None:
+            cached = self.cache.get(entity, mbid, includes)
+            if cached is not None:
+                return cached
+        payload = await self._get(f"{entity}/{mbid}", {"inc": "+".join(includes)}, RateLimiter.BACKGROUND)
+        if self.cache is not None:
+            self.cache.put(entity, mbid, includes, payload)
+        return payload
+
+    async def _get(self, path: str, params: Dict[str, str], lane: int) -> dict:
+        """GET a ws/2 resource, sharing one upstream call between concurrent identical requests."""
+        params = {k: v for k, v in params.items() if v}
+        params["fmt"] = "json"
+        key = self._flight_key(path, params)
+        task = self._inflight.get(key)
+        if task is None:
+            # the upstream call is its own task: a waiter that is cancelled
+            # (e.g. its client disconnected) leaves it running for the others
+            task = asyncio.create_task(self._fetch(path, params, lane))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._flight_done(key, t))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str, params: Dict[str, str], lane: int) -> dict:
+        await self.limiter.acquire_async(lane)
+        resp = await self._http.get(f"{self.base_url}/{path}", params=params)
+        resp.raise_for_status()
+        return to_ngs_shape(resp.json())
+
+    def _flight_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every waiter has gone
+
+    @staticmethod
+    def _flight_key(path: str, params: Dict[str, str]) -> str:
+        return path + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
@@ -0,0 +1,240 @@
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .Recording import Recording
+from .MusicBrainzClient import MusicBrainzClient, EnrichmentPlan, to_ngs_shape
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    mbid TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_lc TEXT NOT NULL,
+    artist TEXT,
+    artist_lc TEXT,
+    genre TEXT,
+    first_release_date TEXT,
+    decade INTEGER,
+    duration_ms INTEGER
+);
+CREATE TABLE IF NOT EXISTS recording_tags (mbid TEXT NOT NULL, tag TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS recording_isrcs (mbid TEXT NOT NULL, isrc TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS recording_tags_tag ON recording_tags(tag);
+CREATE INDEX IF NOT EXISTS recording_isrcs_isrc ON recording_isrcs(isrc);
+CREATE INDEX IF NOT EXISTS recordings_duration ON recordings(duration_ms);
+CREATE INDEX IF NOT EXISTS recordings_first_release ON recordings(first_release_date);
+"""
+
+# field:"phrase" | field:[a TO b] | field:value | bare word
+_CLAUSE_RE = re.compile(
+    r'(?:(?P<field>\w+):)?(?:"(?P<phrase>(?:[^"\\]|\\.)*)"|\[(?P<lo>\S+)\s+TO\s+(?P<hi>\S+)\]|(?P<word>[^\s()]+))'
+)
+
+_PADDED_DATE = "(first_release_date || substr('0000-01-01', length(first_release_date) + 1))"
+
+
+def _pad_date(date: str, fill: str) -> str:
+    """Complete a partial YYYY[-MM[-DD]] date from `fill` ("0000-01-01" or "9999-12-31")."""
+    return date + fill[len(date):]
+
+
+def _contains(value: str) -> str:
+    """LIKE pattern for `value` anywhere in the column, with its % and _ taken literally."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class LocalRecordingIndex:
+    """
+    Offline stand-in for the MusicBrainz recording search, backed by SQLite.
+
+    Built from MusicBrainz JSON data dumps (one recording per line, ws/2 JSON
+    shape) or any JSON/JSONL file of recordings in that shape. Genre and first
+    release date are resolved at build time from the embedded release,
+    release-group and artist data, so search() needs no network at all.
+
+    Understands the clauses RecordingQuery.to_lucene() emits: artist, recording,
+    tag, isrc, dur:[a TO b] and firstreleasedate:[a TO b], joined by AND.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = Lock()
+
+    # ---------- build ----------
+
+    @classmethod
+    def build(cls, sources: Iterable[str | Path], path: str | Path, batch_size: int = 5000) -> "LocalRecordingIndex":
+        index = cls(path)
+        batch: List[dict] = []
+        for src in sources:
+            for raw in cls._read_records(Path(src)):
+                batch.append(to_ngs_shape(raw))
+                if len(batch) >= batch_size:
+                    index.add(batch)
+                    batch = []
+        if batch:
+            index.add(batch)
+        return index
+
+    @staticmethod
+    def _read_records(src: Path) -> Iterator[dict]:
+        with src.open("r", encoding="utf-8") as f:
+            head = f.read(1)
+            f.seek(0)
+            if head == "[":
+                yield from json.load(f)
+                return
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def add(self, records: List[dict]) -> None:
+        """Insert (or replace) recordings given in musicbrainzngs shape, enriching them from embedded data."""
+        recs = [MusicBrainzClient._recordings_from_search({"recording-list": [r]})[0] for r in records]
+        self._enrich_offline(recs, records)
+
+        rows, tags, isrcs = [], [], []
+        for rec, raw in zip(recs, records):
+            rows.append((
+                rec.mbid, rec.title, rec.title.lower(), rec.artist, (rec.artist or "").lower(),
+                rec.genre, rec.first_release_date, rec.decade, rec.duration_ms,
+            ))
+            for t in raw.get("tag-list") or []:
+                if t.get("name"):
+                    tags.append((rec.mbid, t["name"].lower()))
+            for g in raw.get("genres") or []:
+                if g.get("name"):
+                    tags.append((rec.mbid, g["name"].lower()))
+            for code in raw.get("isrcs") or raw.get("isrc-list") or []:
+                isrcs.append((rec.mbid, str(code).upper()))
+
+        ids = [(r[0],) for r in rows]
+        with self._lock:
+            self._db.executemany("DELETE FROM recording_tags WHERE mbid = ?", ids)
+            self._db.executemany("DELETE FROM recording_isrcs WHERE mbid = ?", ids)
+            self._db.executemany("INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany("INSERT INTO recording_tags VALUES (?, ?)", set(tags))
+            self._db.executemany("INSERT INTO recording_isrcs VALUES (?, ?)", set(isrcs))
+            self._db.commit()
+
+    @staticmethod
+    def _enrich_offline(recs: List[Recording], records: List[dict]) -> None:
+        """Run the same EnrichmentPlan as the online client, fed from the dump's embedded objects."""
+        payloads: Dict[str, Dict[str, dict]] = {e: {} for e in EnrichmentPlan.STAGES}
+        for raw in records:
+            if raw.get("id"):
+                payloads["recording"][raw["id"]] = raw
+            for rel in raw.get("release-list") or []:
+                if rel.get("id"):
+                    payloads["release"].setdefault(rel["id"], rel)
+                rg = rel.get("release-group") or {}
+                if rg.get("id"):
+                    payloads["release-group"].setdefault(rg["id"], rg)
+            for el in raw.get("artist-credit") or []:
+                if isinstance(el, dict) and (el.get("artist") or {}).get("id"):
+                    payloads["artist"].setdefault(el["artist"]["id"], el["artist"])
+
+        plan = EnrichmentPlan(recs, need_date=True, need_genre=True)
+        for entity in EnrichmentPlan.STAGES:
+            ids, _ = plan.pending(entity)
+            if ids:
+                plan.fill(entity, {i: payloads[entity].get(i) for i in ids})
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+
+    # ---------- search ----------
+
+    def search(self, lucene_query: str, limit: int = 10) -> List[Recording]:
+        where, params = self._compile(lucene_query)
+        sql = (
+            "SELECT mbid, title, genre, artist, first_release_date, decade, duration_ms FROM recordings"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY rowid LIMIT ?"
+        )
+        with self._lock:
+            rows = self._db.execute(sql, (*params, limit)).fetchall()
+        return [
+            Recording(mbid=r[0], title=r[1], genre=r[2], artist=r[3],
+                      first_release_date=r[4], decade=r[5], duration_ms=r[6])
+            for r in rows
+        ]
+
+    @classmethod
+    def _compile(cls, lucene_query: str) -> Tuple[List[str], List[object]]:
+        where: List[str] = []
+        params: List[object] = []
+        text = (lucene_query or "").strip()
+        if text in ("", "*"):
+            return where, params
+
+        for m in _CLAUSE_RE.finditer(text):
+            field = (m.group("field") or "").lower()
+            phrase = m.group("phrase")
+            word = m.group("word")
+            if word is not None and word.upper() in ("AND", "+"):
+                continue
+            if word is not None and word.upper() in ("OR", "NOT"):
+                raise ValueError(f"Unsupported query operator for local index: {word}")
+            value = (phrase.replace('\\"', '"') if phrase is not None else word or "").lower()
+
+            if m.group("lo") is not None:
+                lo, hi = m.group("lo"), m.group("hi")
+                if field == "dur":
+                    if lo != "*":
+                        where.append("duration_ms >= ?")
+                        params.append(int(lo))
+                    if hi != "*":
+                        where.append("duration_ms <= ?")
+                        params.append(int(hi))
+                elif field == "firstreleasedate":
+                    # partial dates ("1980", "1980-07") count from their first day; the
+                    # plain year-prefix bounds keep the index on first_release_date usable
+                    if lo != "*":
+                        where.extend(["first_release_date >= ?", f"{_PADDED_DATE} >= ?"])
+                        params.extend([lo[:4], _pad_date(lo, "0000-01-01")])
+                    if hi != "*":
+                        where.extend(["first_release_date < ?", f"{_PADDED_DATE} <= ?"])
+                        params.extend([hi[:4] + "~", _pad_date(hi, "9999-12-31")])
+                else:
+                    raise ValueError(f"Unsupported range field for local index: {field}")
+            elif field == "artist":
+                where.append("artist_lc LIKE ? ESCAPE '\\'")
+                params.append(_contains(value))
+            elif field == "recording":
+                where.append("title_lc LIKE ? ESCAPE '\\'")
+                params.append(_contains(value))
+            elif field == "tag":
+                where.append("mbid IN (SELECT mbid FROM recording_tags WHERE tag = ?)")
+                params.append(value)
+            elif field == "isrc":
+                where.append("mbid IN (SELECT mbid FROM recording_isrcs WHERE isrc = ?)")
+                params.append(value.upper())
+            elif field == "":
+                where.append("(title_lc LIKE ? ESCAPE '\\' OR artist_lc LIKE ? ESCAPE '\\')")
+                params.extend([_contains(value), _contains(value)])
+            else:
+                raise ValueError(f"Unsupported field for local index: {field}")
+        return where, params
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a local recording index from MusicBrainz JSON dumps.")
+    parser.add_argument("sources", nargs="+", help="JSON / JSONL files of recordings (ws/2 JSON shape)")
+    parser.add_argument("--out", required=True, help="SQLite file to write")
+    args = parser.parse_args()
+    idx = LocalRecordingIndex.build(args.sources, args.out)
+    print(f"Indexed {len(idx)} recordings into {args.out}")
@@ -0,0 +1,138 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+# MusicBrainz tags and release dates rarely change; artists get tagged more often.
+DEFAULT_TTLS: Dict[str, float] = {
+    "recording": 7 * 86400,
+    "release": 30 * 86400,
+    "release-group": 30 * 86400,
+    "artist": 7 * 86400,
+}
+
+
+class LookupCache:
+    """
+    Two-level cache for MusicBrainz lookups keyed by (entity, mbid, includes):
+    an in-process LRU in front of a SQLite file, so answers survive restarts.
+
+    Entries expire after a per-entity TTL (swept every 256 puts); the file
+    never holds more than max_entries rows, least recently used go first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 50_000,
+        memory_entries: int = 2048,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._lru: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = Lock()
+        self._puts = 0
+
+        if str(path) != ":memory:":
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS lookups_accessed ON lookups(accessed_at)")
+        self._db.commit()
+        self._rows = self._db.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    @staticmethod
+    def make_key(entity: str, mbid: str, includes: Iterable[str]) -> str:
+        return f"{entity}:{mbid}:{','.join(sorted(includes))}"
+
+    def get(self, entity: str, mbid: str, includes: Iterable[str]) -> Optional[dict]:
+        key = self.make_key(entity, mbid, includes)
+        now = time.time()
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    self._lru.move_to_end(key)
+                    return hit[1]
+                del self._lru[key]
+
+            row = self._db.execute(
+                "SELECT payload, expires_at FROM lookups WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM lookups WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE lookups SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            payload = json.loads(row[0])
+            self._remember(key, row[1], payload)
+            return payload
+
+    def put(self, entity: str, mbid: str, includes: Iterable[str], payload: dict) -> None:
+        key = self.make_key(entity, mbid, includes)
+        now = time.time()
+        expires_at = now + self.ttls.get(entity, DEFAULT_TTLS["recording"])
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            self._db.execute(
+                "INSERT OR REPLACE INTO lookups (key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), expires_at, now),
+            )
+            self._rows += 1  # over-counts replaced keys; _trim() recounts
+            if self._rows > self.max_entries:
+                self._trim()
+            self._puts += 1
+            if self._puts % 256 == 0:
+                self._prune(now)
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    def prune(self) -> None:
+        """Drop expired entries and trim the file to max_entries."""
+        with self._lock:
+            self._prune(time.time())
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _remember(self, key: str, expires_at: float, payload: dict) -> None:
+        self._lru[key] = (expires_at, payload)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_entries:
+            self._lru.popitem(last=False)
+
+    def _prune(self, now: float) -> None:
+        self._db.execute("DELETE FROM lookups WHERE expires_at <= ?", (now,))
+        self._trim()
+
+    def _trim(self) -> None:
+        """Evict least recently used rows down to max_entries, less 1/16 headroom so the
+        next puts don't each trim again."""
+        self._rows = self._db.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        if self._rows <= self.max_entries:
+            return
+        excess = self._rows - (self.max_entries - self.max_entries // 16)
+        self._db.execute(
+            "DELETE FROM lookups WHERE key IN "
+            "(SELECT key FROM lookups ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        self._rows -= excess
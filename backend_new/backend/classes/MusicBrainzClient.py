@@ -1,12 +1,70 @@
-from typing import Optional, List
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Optional, List, Dict, Tuple
 from .Recording import Recording
 from .RecordingQuery import RecordingQuery
+from .LookupCache import LookupCache
+from .SearchCache import SearchCache
+from .RateLimiter import RateLimiter, DEFAULT_LIMITER
 import musicbrainzngs as mb
 
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from .LocalRecordingIndex import LocalRecordingIndex
+
+# JSON web-service keys -> the musicbrainzngs names the shared parsing code expects
+_KEY_RENAMES = {
+    "recordings": "recording-list",
+    "releases": "release-list",
+    "tags": "tag-list",
+}
+
+
+def to_ngs_shape(obj: Any) -> Any:
+    """Map a ws/2 JSON payload onto the musicbrainzngs dict shape used by the parsing code."""
+    if isinstance(obj, list):
+        return [to_ngs_shape(x) for x in obj]
+    if isinstance(obj, dict):
+        out = {_KEY_RENAMES.get(k, k): to_ngs_shape(v) for k, v in obj.items()}
+        if isinstance(out.get("artist-credit"), list):
+            out["artist-credit"] = _credit_to_ngs(out["artist-credit"])
+        return out
+    return obj
+
+
+def _credit_to_ngs(credits: list) -> list:
+    # JSON: [{"name", "joinphrase", "artist"}]; ngs: [{"artist", "name"}, " & ", ...]
+    out: list = []
+    for c in credits:
+        if not isinstance(c, dict):
+            out.append(c)
+            continue
+        out.append({k: v for k, v in c.items() if k != "joinphrase"})
+        if c.get("joinphrase"):
+            out.append(c["joinphrase"])
+    return out
+
+
 class MusicBrainzClient:
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        cache: Optional[LookupCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        local_index: Optional["LocalRecordingIndex"] = None,
+    ):
         mb.set_useragent("MusicChatbot", "0.1", "test@tets.com")
-        mb.set_rate_limit(1.0) 
+        # pacing is done by our own priority-aware limiter instead of musicbrainzngs' global sleep
+        mb.set_rate_limit(False)
+        self.limiter = limiter or DEFAULT_LIMITER
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.search_cache = search_cache
+        # offline mode: answer searches from a prebuilt index (already enriched)
+        self.local_index = local_index
 
     @staticmethod
     def _artist_credit_to_str(ac_list) -> str:
@@ -54,35 +112,88 @@ class MusicBrainzClient:
         3) else (if enrich_missing_dates) lookup recording to infer
 
         Genres (if enrich_genres=True):
-        recording -> release-group -> artist (pick highest 'count' item).
+        recording -> release -> release-group -> artist (pick highest 'count' item).
+        Lookups are planned across the whole page, so shared ids are fetched once.
+
+        With a search_cache, equivalent queries are answered from cache; stale
+        entries are returned immediately and refreshed in the background.
         """
         lucene_query = query.to_lucene() if isinstance(query, RecordingQuery) else query
+        if self.search_cache is None:
+            return self._search(lucene_query, limit, enrich_missing_dates, enrich_genres)
+
+        key = self._search_cache_key(query, limit, enrich_missing_dates, enrich_genres)
+        cached, stale = self.search_cache.get(key)
+        if cached is not None:
+            if stale and self.search_cache.begin_refresh(key):
+                threading.Thread(
+                    target=self._revalidate,
+                    args=(key, lucene_query, limit, enrich_missing_dates, enrich_genres),
+                    daemon=True,
+                ).start()
+            return cached
+
+        out = self._search(lucene_query, limit, enrich_missing_dates, enrich_genres)
+        self.search_cache.put(key, out)
+        return out
+
+    def _revalidate(self, key: str, lucene_query: str, limit: int, enrich_missing_dates: bool, enrich_genres: bool) -> None:
+        try:
+            # a refresh has no one waiting on it: it must not take interactive-lane tokens
+            out = self._search(lucene_query, limit, enrich_missing_dates, enrich_genres, lane=RateLimiter.BACKGROUND)
+            self.search_cache.put(key, out)
+        except Exception:
+            logger.exception("Background refresh of search %r failed", lucene_query)
+        finally:
+            self.search_cache.end_refresh(key)
+
+    def _search(
+        self,
+        lucene_query: str,
+        limit: int,
+        enrich_missing_dates: bool,
+        enrich_genres: bool,
+        lane: int = RateLimiter.INTERACTIVE,
+    ) -> List[Recording]:
+        if self.local_index is not None:
+            return self.local_index.search(lucene_query, limit)
+        self.limiter.acquire(lane)
         res = mb.search_recordings(query=lucene_query, limit=limit)
+        out = self._recordings_from_search(res)
+
+        if enrich_missing_dates or enrich_genres:
+            self._enrich_many(out, need_date=enrich_missing_dates, need_genre=enrich_genres)
+
+        return out
 
+
+    @classmethod
+    def _recordings_from_search(cls, res: dict) -> List[Recording]:
+        """Base (un-enriched) recordings from a search payload."""
         out: List[Recording] = []
         for r in res.get("recording-list", []):
-            first_date = self._earliest_date_from_releases(r.get("release-list")) or r.get("first-release-date")
-            year = self._year_from_date(first_date)
+            first_date = cls._earliest_date_from_releases(r.get("release-list")) or r.get("first-release-date")
+            year = cls._year_from_date(first_date)
             out.append(Recording(
                 mbid=r.get("id", ""),
                 title=r.get("title", ""),
-                artist=self._artist_credit_to_str(r.get("artist-credit")),
+                artist=cls._artist_credit_to_str(r.get("artist-credit")),
                 first_release_date=first_date,
-                decade=self._to_decade(year),
-                duration_ms=int(r["length"]) if "length" in r else None,
+                decade=cls._to_decade(year),
+                duration_ms=int(r["length"]) if r.get("length") is not None else None,  # ws/2 JSON may send null
                 genre=None,  # filled during enrichment
             ))
-
-        if enrich_missing_dates or enrich_genres:
-            for rec in out:
-                self._enrich_recording_cascade(rec, need_date=enrich_missing_dates, need_genre=enrich_genres)
-
         return out
 
+    @staticmethod
+    def _search_cache_key(query: str | RecordingQuery, limit: int, enrich_missing_dates: bool, enrich_genres: bool) -> str:
+        canonical = query.cache_key() if isinstance(query, RecordingQuery) else " ".join(query.split())
+        return SearchCache.make_key(canonical, limit, enrich_missing_dates, enrich_genres)
 
     # --- inside MusicBrainzClient ---
 
-    def _pick_top_name(self, items: list[dict]) -> Optional[str]:
+    @staticmethod
+    def _pick_top_name(items: list[dict]) -> Optional[str]:
         """Pick the name with highest 'count' (if present), else the first."""
         if not items:
             return None
@@ -98,85 +209,61 @@ class MusicBrainzClient:
         """
         One recording lookup (with correct includes), then (if needed)
         Release -> Release Group -> Artist lookups for genre.
-        Respects the global 1 req/sec rate limit configured in __init__.
+        Single-recording form of _enrich_many.
         """
-        try:
-            # 1) Recording lookup: releases (for dates + RG ids) and artist-credits for artist ids.
-            includes = []
-            if need_date or need_genre:
-                includes.extend(["releases", "artist-credits"])
-            if need_genre:
-                includes.append("tags")  # <-- 'genres' is NOT a valid include
-
-            data = mb.get_recording_by_id(rec.mbid, includes=includes)
-            recording = data.get("recording", {})
-
-            # ---- Date enrichment from recording -> releases
-            if need_date and not rec.first_release_date:
-                rels = recording.get("release-list", []) or []
-                earliest = self._earliest_date_from_releases(rels)
-                if earliest:
-                    rec.first_release_date = earliest
-                    rec.decade = self._to_decade(self._year_from_date(earliest))
-
-            if not need_genre or rec.genre:
-                return
-
-            # ---- Genre enrichment cascade
-
-            # (a) Recording-level tags
-            rec.genre = self._pick_top_name(recording.get("tag-list") or [])
-
-            # (b) Release-level (first linked release)
-            rgid = None
-            if not rec.genre:
-                rels = recording.get("release-list") or []
-                if rels:
-                    first_release_id = rels[0].get("id")
-                    if first_release_id:
-                        try:
-                            # Ask the release for its own tags, and include release-group linkage.
-                            rdata = mb.get_release_by_id(first_release_id, includes=["tags", "release-groups"])
-                            release = rdata.get("release", {})
-                            # try release tags directly
-                            rec.genre = self._pick_top_name(release.get("tag-list") or [])
-                            # capture RG id for next step
-                            rg = release.get("release-group") or {}
-                            rgid = rg.get("id")
-                        except Exception as e:
-                            print(f"[release error] {e}")
-
-            # (c) Release-group level (if still no genre)
-            if not rec.genre and rgid:
-                try:
-                    rg_data = mb.get_release_group_by_id(rgid, includes=["tags"])
-                    rg = rg_data.get("release-group", {})
-                    rec.genre = self._pick_top_name(rg.get("tag-list") or [])
-                except Exception as e:
-                    print(f"[genre error] {e}")
-
-            # (d) Artist level (first credited artist) — often the most populated
-            if not rec.genre:
-                ac = recording.get("artist-credit") or []
-                first_artist = None
-                for el in ac:
-                    if isinstance(el, dict) and "artist" in el:
-                        first_artist = el["artist"].get("id")
-                        if first_artist:
-                            break
-                if first_artist:
-                    try:
-                        a_data = mb.get_artist_by_id(first_artist, includes=["tags"])
-                        artist = a_data.get("artist", {})
-                        rec.genre = self._pick_top_name(artist.get("tag-list") or [])
-                    except Exception as e:
-                        print(f"[artist error] {e}")
-
-        except Exception as e:
-            # swallow enrichment failures; base search results still returned
-            print(f"[enrich error] {e}")
+        self._enrich_many([rec], need_date=need_date, need_genre=need_genre)
 
+    def _enrich_many(self, recs: List[Recording], need_date: bool, need_genre: bool) -> None:
+        """
+        Enrich a whole result page stage by stage. Every distinct recording,
+        release, release-group and artist id is looked up once and the answer
+        is shared by all recordings that need it.
+        """
+        plan = EnrichmentPlan(recs, need_date=need_date, need_genre=need_genre)
+        for entity in EnrichmentPlan.STAGES:
+            ids, includes = plan.pending(entity)
+            if ids:
+                plan.fill(entity, self._lookup_many(entity, ids, includes))
 
+    def _lookup(self, entity: str, mbid: str, includes: List[str]) -> dict:
+        """
+        Single MusicBrainz lookup; returns the entity payload (e.g. data['release']).
+        Served from the lookup cache when one is configured.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(entity, mbid, includes)
+            if cached is not None:
+                return cached
+        fetch = getattr(mb, self._LOOKUPS[entity])
+        self.limiter.acquire(RateLimiter.BACKGROUND)
+        payload = fetch(mbid, includes=includes).get(entity, {})
+        if self.cache is not None:
+            self.cache.put(entity, mbid, includes, payload)
+        return payload
+
+    def _lookup_many(self, entity: str, ids: List[str], includes: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Look up distinct ids concurrently. Failed lookups map to None so the
+        plan can fall through to the next stage.
+        """
+        def one(mbid: str) -> Optional[dict]:
+            try:
+                return self._lookup(entity, mbid, includes)
+            except Exception as e:
+                logger.warning("%s lookup of %s failed: %s", entity, mbid, e)
+                return None
+
+        if len(ids) == 1:
+            return {ids[0]: one(ids[0])}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(ids))) as pool:
+            return dict(zip(ids, pool.map(one, ids)))
+
+    _LOOKUPS = {
+        "recording": "get_recording_by_id",
+        "release": "get_release_by_id",
+        "release-group": "get_release_group_by_id",
+        "artist": "get_artist_by_id",
+    }
 
     def _enrich_recording(self, rec: Recording, need_date: bool, need_genre: bool) -> None:
         """Single lookup to enrich date and/or genres."""
@@ -189,6 +276,7 @@ class MusicBrainzClient:
             if not includes:
                 return
 
+            self.limiter.acquire(RateLimiter.BACKGROUND)
             data = mb.get_recording_by_id(rec.mbid, includes=includes)
             recording = data.get("recording", {})
 
@@ -213,4 +301,92 @@ class MusicBrainzClient:
                     rec.genre = best_tag.get("name")
 
         except Exception as e:
-            print(f"[enrich error] {e}")
+            logger.warning("Enrichment of recording %s failed: %s", rec.mbid, e)
+
+
+class EnrichmentPlan:
+    """
+    Tracks what each recording of a result page still needs and which
+    distinct ids must be looked up at every stage of the genre cascade:
+    recording -> release -> release-group -> artist.
+
+    The plan does no I/O: callers ask for pending(entity), fetch those ids
+    however they like (sync, threaded, async) and hand the payloads to fill().
+    """
+
+    STAGES = ("recording", "release", "release-group", "artist")
+
+    def __init__(self, recs: List[Recording], need_date: bool, need_genre: bool):
+        self.recs = recs
+        self.need_date = need_date
+        self.need_genre = need_genre
+        # per-recording ids discovered along the cascade
+        self._links: List[Dict[str, Optional[str]]] = [{} for _ in recs]
+
+    def _wants_genre(self, rec: Recording) -> bool:
+        return self.need_genre and not rec.genre
+
+    def pending(self, entity: str) -> Tuple[List[str], List[str]]:
+        """Distinct ids to look up for this stage, and the includes to ask for."""
+        if entity == "recording":
+            includes = []
+            if self.need_date or self.need_genre:
+                includes.extend(["releases", "artist-credits"])
+            if self.need_genre:
+                includes.append("tags")  # <-- 'genres' is NOT a valid include
+            wanted = [
+                r.mbid for r in self.recs
+                if r.mbid and ((self.need_date and not r.first_release_date) or self._wants_genre(r))
+            ]
+            return list(dict.fromkeys(wanted)), includes
+
+        includes = ["tags", "release-groups"] if entity == "release" else ["tags"]
+        wanted = [
+            links.get(entity) for rec, links in zip(self.recs, self._links)
+            if self._wants_genre(rec) and links.get(entity)
+        ]
+        return list(dict.fromkeys(wanted)), includes
+
+    def fill(self, entity: str, payloads: Dict[str, Optional[dict]]) -> None:
+        """Apply looked-up payloads (None for failed lookups) to every recording that needs them."""
+        if entity == "recording":
+            for rec, links in zip(self.recs, self._links):
+                recording = payloads.get(rec.mbid)
+                if recording is not None:
+                    self._fill_from_recording(rec, links, recording)
+            return
+
+        for rec, links in zip(self.recs, self._links):
+            if not self._wants_genre(rec) or not links.get(entity):
+                continue
+            payload = payloads.get(links[entity])
+            if payload is None:
+                continue
+            rec.genre = MusicBrainzClient._pick_top_name(payload.get("tag-list") or [])
+            if entity == "release":
+                # capture RG id for next step
+                links["release-group"] = (payload.get("release-group") or {}).get("id")
+
+    def _fill_from_recording(self, rec: Recording, links: Dict[str, Optional[str]], recording: dict) -> None:
+        rels = recording.get("release-list") or []
+
+        # ---- Date enrichment from recording -> releases
+        if self.need_date and not rec.first_release_date:
+            earliest = MusicBrainzClient._earliest_date_from_releases(rels)
+            if earliest:
+                rec.first_release_date = earliest
+                rec.decade = MusicBrainzClient._to_decade(MusicBrainzClient._year_from_date(earliest))
+
+        if not self._wants_genre(rec):
+            return
+
+        # (a) Recording-level tags
+        rec.genre = MusicBrainzClient._pick_top_name(recording.get("tag-list") or [])
+
+        # (b) first linked release, (d) first credited artist — used by later stages
+        if rels:
+            links["release"] = rels[0].get("id")
+        for el in recording.get("artist-credit") or []:
+            if isinstance(el, dict) and "artist" in el and el["artist"].get("id"):
+                links["artist"] = el["artist"]["id"]
+                break
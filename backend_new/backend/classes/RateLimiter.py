@@ -0,0 +1,131 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Sequence, Tuple
+
+
+class RateLimiter:
+    """
+    Token bucket with priority lanes, shared by every MusicBrainz caller.
+
+    Tokens refill at `rate` per second up to `burst`. Callers queue in their
+    lane; a lower lane number always goes first (FIFO within a lane), so a
+    user's primary search never waits behind someone else's enrichment backlog.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 1,
+        lanes: Sequence[str] = ("interactive", "background"),
+        window: int = 256,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.lanes = tuple(lanes)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []  # heap of (lane, seq)
+        self._seq = itertools.count()
+        self._waits: Dict[int, Deque[float]] = {i: deque(maxlen=window) for i in range(len(self.lanes))}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, lane: int = BACKGROUND) -> float:
+        """Block until this caller may issue one request; returns seconds waited."""
+        if not 0 <= lane < len(self.lanes):
+            raise ValueError(f"unknown lane {lane}")
+        start = time.monotonic()
+        with self._cond:
+            ticket = (lane, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify_all()  # a new head may have arrived
+            try:
+                while True:
+                    self._refill(time.monotonic())
+                    if self._queue[0] == ticket:
+                        if self._tokens >= 1:
+                            heapq.heappop(self._queue)
+                            self._tokens -= 1
+                            break
+                        self._cond.wait((1 - self._tokens) / self.rate)
+                    else:
+                        self._cond.wait()
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                raise
+            finally:
+                self._cond.notify_all()
+            waited = time.monotonic() - start
+            self._waits[lane].append(waited)
+        return waited
+
+    async def acquire_async(self, lane: int = BACKGROUND) -> float:
+        """
+        Async form of acquire(): shares the same bucket and queue, but waits
+        with asyncio.sleep so no thread is held while the caller is paced.
+        """
+        if not 0 <= lane < len(self.lanes):
+            raise ValueError(f"unknown lane {lane}")
+        start = time.monotonic()
+        with self._cond:
+            ticket = (lane, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify_all()
+        try:
+            while True:
+                with self._cond:
+                    self._refill(time.monotonic())
+                    if self._queue[0] == ticket and self._tokens >= 1:
+                        heapq.heappop(self._queue)
+                        self._tokens -= 1
+                        self._cond.notify_all()
+                        waited = time.monotonic() - start
+                        self._waits[lane].append(waited)
+                        return waited
+                    # time until the next token; non-head waiters re-check then as well
+                    delay = max((1 - self._tokens) / self.rate, 0.01)
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+            raise
+
+    def stats(self) -> dict:
+        """Queue depth and recent wait times (seconds) per lane."""
+        with self._cond:
+            self._refill(time.monotonic())
+            depth = {name: 0 for name in self.lanes}
+            for lane, _ in self._queue:
+                depth[self.lanes[lane]] += 1
+            waits = {}
+            for lane, samples in self._waits.items():
+                ordered = sorted(samples)
+                waits[self.lanes[lane]] = {
+                    "count": len(ordered),
+                    "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                    "p95": ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0,
+                    "max": ordered[-1] if ordered else 0.0,
+                }
+            return {"rate": self.rate, "burst": self.burst, "tokens": self._tokens,
+                    "queue_depth": depth, "wait_s": waits}
+
+
+# MusicBrainz allows ~1 request/second per client; share one bucket per process.
+DEFAULT_LIMITER = RateLimiter(rate=1.0, burst=1)
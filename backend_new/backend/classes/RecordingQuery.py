@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Optional
 
 
@@ -35,4 +35,23 @@ class RecordingQuery:
             end = f"{int(self.decade) + 9}-12-31"
             parts.append(f'firstreleasedate:[{start} TO {end}]')
         parts.extend(self.extra_terms)
-        return " AND ".join(parts) if parts else "*"
\ No newline at end of file
+        return " AND ".join(parts) if parts else "*"
+
+    def normalized(self) -> "RecordingQuery":
+        """Equivalent query with case/whitespace folded and extra_terms sorted."""
+        def norm(text: Optional[str]) -> Optional[str]:
+            return " ".join(text.split()).lower() if text and text.strip() else None
+
+        terms = {norm(t) for t in self.extra_terms}
+        return replace(
+            self,
+            artist=norm(self.artist),
+            title=norm(self.title),
+            genre=norm(self.genre),
+            isrc=self.isrc.strip().upper() if self.isrc and self.isrc.strip() else None,
+            decade=int(self.decade) if self.decade is not None else None,
+            extra_terms=sorted(t for t in terms if t),
+        )
+
+    def cache_key(self) -> str:
+        return self.normalized().to_lucene()
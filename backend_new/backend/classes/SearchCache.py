@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from threading import Lock
+from typing import List, Optional, Set, Tuple
+from .Recording import Recording
+
+
+class SearchCache:
+    """
+    In-process LRU of fully enriched search results with stale-while-revalidate.
+
+    An entry is fresh for fresh_ttl seconds; after that and until stale_ttl it
+    is still served, but the caller is told to refresh it in the background.
+    Recordings are copied on the way in and out so callers can't mutate entries.
+    """
+
+    def __init__(self, fresh_ttl: float = 3600, stale_ttl: float = 7 * 86400, max_entries: int = 512):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, List[Recording]]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(lucene: str, limit: int, enrich_missing_dates: bool, enrich_genres: bool) -> str:
+        return f"{lucene}|limit={limit}|dates={int(enrich_missing_dates)}|genres={int(enrich_genres)}"
+
+    def get(self, key: str) -> Tuple[Optional[List[Recording]], bool]:
+        """Returns (recordings, is_stale); (None, False) on a miss."""
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None, False
+            age = time.time() - hit[0]
+            if age >= self.stale_ttl:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return [replace(r) for r in hit[1]], age >= self.fresh_ttl
+
+    def put(self, key: str, recordings: List[Recording]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), [replace(r) for r in recordings])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh for key; False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,4 +1,9 @@
-from .MusicBrainzClient import MusicBrainzClient
+from .MusicBrainzClient import MusicBrainzClient, EnrichmentPlan
 from .RecordingQuery import RecordingQuery
 from .Recording import Recording
-from .Artist import Artist
\ No newline at end of file
+from .Artist import Artist
+from .LookupCache import LookupCache
+from .SearchCache import SearchCache
+from .RateLimiter import RateLimiter
+from .AsyncMusicBrainzClient import AsyncMusicBrainzClient
+from .LocalRecordingIndex import LocalRecordingIndex
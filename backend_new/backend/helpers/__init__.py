@@ -1,3 +1,3 @@
-from .config import OPENAI_MODEL, get_openai_client
-from .deps import get_mb_client
-from .nl import nl_to_query_and_limit
+from .config import OPENAI_MODEL, MB_CACHE_PATH, MB_LOCAL_INDEX, LATEST_STORE_URL, LATEST_STORE_TTL, DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_MB, get_openai_client
+from .deps import get_mb_client, get_async_mb_client
+from .nl import nl_to_query_and_limit, parse_nl_rules
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
 from openai import OpenAI
 
@@ -6,7 +8,26 @@ load_dotenv()
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# Persistent MusicBrainz lookup cache (SQLite file)
+MB_CACHE_PATH = os.getenv("MB_CACHE_PATH", str(Path.home() / ".cache" / "music-chatbot" / "musicbrainz.sqlite"))
+
+# Optional offline recording index (python -m backend.classes.LocalRecordingIndex ... --out <file>)
+MB_LOCAL_INDEX = os.getenv("MB_LOCAL_INDEX")
+
+# Latest-list storage shared by the agent tools: memory:// | sqlite:///path | redis://host:6379/0
+LATEST_STORE_URL = os.getenv("LATEST_STORE_URL", "memory://")
+LATEST_STORE_TTL = float(os.getenv("LATEST_STORE_TTL", "86400"))
+
+# Content-addressed cache of downloaded audio (video id + codec/quality), size-bounded
+DOWNLOAD_CACHE_DIR = os.getenv("DOWNLOAD_CACHE_DIR", str(Path.home() / ".cache" / "music-chatbot" / "audio"))
+DOWNLOAD_CACHE_MAX_MB = int(os.getenv("DOWNLOAD_CACHE_MAX_MB", "2048"))
+
+# nl_to_query_and_limit: requests the rule parser explains at least this well skip the LLM (1.01 = always ask)
+NL_RULES_MIN_CONFIDENCE = float(os.getenv("NL_RULES_MIN_CONFIDENCE", "0.75"))
+
+@lru_cache(maxsize=1)
 def get_openai_client() -> OpenAI:
+    """One client per process: it pools its HTTP connections and is safe to share between threads."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set. See README for setup.")
@@ -1,9 +1,13 @@
 # backend/helpers/nl.py
 import json
+import logging
 import re
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 from backend.classes import RecordingQuery
-from .config import get_openai_client, OPENAI_MODEL
+from .config import get_openai_client, OPENAI_MODEL, NL_RULES_MIN_CONFIDENCE
+
+logger = logging.getLogger(__name__)
 
 SCHEMA_TEXT = """
 Return ONLY valid JSON (no prose) for:
@@ -48,7 +52,187 @@ def _heuristic_limit(nl: str) -> Optional[int]:
         pass
     return None
 
-def nl_to_query_and_limit(nl: str) -> Tuple[RecordingQuery, Optional[int]]:
+
+# ---------- rule-based fast path ----------
+
+# MusicBrainz tag -> spellings users type; longest phrases are matched first
+GENRES = {
+    "hard rock": [], "classic rock": [], "alternative rock": ["alt rock", "alt-rock"], "indie rock": [],
+    "punk rock": [], "soft rock": [], "progressive rock": ["prog rock", "prog"], "psychedelic rock": [],
+    "glam rock": [], "garage rock": [], "folk rock": [], "pop rock": [], "pop punk": ["pop-punk"],
+    "post-punk": ["post punk"], "heavy metal": [], "death metal": [], "black metal": [],
+    "thrash metal": [], "nu metal": ["nu-metal"], "hip hop": ["hip-hop", "hiphop"],
+    "r&b": ["rnb", "r'n'b", "rhythm and blues"], "drum and bass": ["drum & bass", "drum n bass", "dnb"],
+    "synth-pop": ["synthpop", "synth pop"], "new wave": [], "trip hop": ["trip-hop"],
+    "bossa nova": [], "k-pop": ["kpop"], "j-pop": ["jpop"], "lo-fi": ["lofi", "lo fi"],
+    "singer-songwriter": [], "rock and roll": ["rock n roll", "rock 'n' roll", "rock & roll"],
+    "rock": [], "pop": [], "metal": [], "jazz": [], "blues": [], "country": [], "folk": [], "soul": [],
+    "funk": [], "disco": [], "reggae": [], "ska": [], "punk": [], "emo": [], "grunge": [], "indie": [],
+    "electronic": [], "edm": [], "house": [], "techno": [], "trance": [], "dubstep": [], "ambient": [],
+    "classical": [], "opera": [], "rap": [], "trap": [], "gospel": [], "latin": [], "salsa": [],
+    "reggaeton": [], "afrobeat": [], "dancehall": [], "grime": [], "shoegaze": [], "britpop": [],
+    "industrial": [], "downtempo": [], "chillout": [], "lounge": [], "soundtrack": [], "swing": [],
+    "bluegrass": [], "americana": [], "motown": [],
+}
+_GENRE_ALIASES = sorted(
+    ((alias, tag) for tag, aliases in GENRES.items() for alias in [tag, *aliases]),
+    key=lambda pair: -len(pair[0]),
+)
+
+# words that carry no search meaning of their own; anything else left over lowers confidence
+_FILLER = set("""
+a an the some any few of from in on with and or for to by me my i i'd i'm we us you please can could would
+give get find show list play make want need like recommend suggest songs song tracks track music tunes
+recordings recording hits playlist mix top best good great popular era decade years year released
+that are is be era's era which only just more
+""".split())
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20, "thirty": 30, "fifty": 50,
+    "dozen": 12,
+}
+_DECADE_WORDS = {
+    "fifties": 1950, "sixties": 1960, "seventies": 1970, "eighties": 1980, "nineties": 1990,
+    "noughties": 2000,
+}
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_UNIT = r"(minutes?|mins?|seconds?|secs?)"
+_DURATION_PATTERNS = [
+    # (pattern, kind); kinds: range / max / min / about
+    (re.compile(rf"\bbetween\s+{_NUM}\s*(?:{_UNIT}\b)?\s*(?:and|to|-|–)\s*{_NUM}\s*{_UNIT}\b"), "range"),
+    (re.compile(rf"\b{_NUM}\s*(?:{_UNIT}\b)?\s*(?:-|–|to)\s*{_NUM}\s*{_UNIT}\b"), "range"),
+    (re.compile(rf"\b(?:under|less than|shorter than|below|at most|max(?:imum)?|up to|no longer than)\s+{_NUM}\s*{_UNIT}\b"), "max"),
+    (re.compile(rf"\b(?:over|more than|longer than|above|at least|min(?:imum)?)\s+{_NUM}\s*{_UNIT}\b"), "min"),
+    (re.compile(rf"\b(?:about|around|roughly|approximately|~)?\s*{_NUM}\s*{_UNIT}\b(?:\s+long)?"), "about"),
+]
+_DECADE_4 = re.compile(r"\b(?:the\s+)?(1[0-9]|20)([0-9])0'?s\b")
+_DECADE_2 = re.compile(r"(?<![\w])(?:the\s+)?'?([0-9])0'?s\b")
+_ARTIST = re.compile(
+    r"\bby\s+([^|,.;!?]+?)(?=\s+(?:from|in|between|under|over|less|more|longer|shorter|released|with|"
+    r"that|during|around|about)\b|\s*[|,.;!?]|\s*$)"
+)
+_TOKEN = re.compile(r"[\w&'+-]+")
+# "Queen and David Bowie": one act or two? RecordingQuery can only say one
+_SEVERAL_ARTISTS = re.compile(r"\band\b|[&,]", re.I)
+# "top 40 hits": a chart name, not a count
+_TOP_N = re.compile(r"\btop\s+(?:\d+|" + "|".join(_NUMBER_WORDS) + r")\b")
+_CHART_WORDS = re.compile(r"\b(?:hits?|charts?)\b")
+
+ABOUT_TOLERANCE_MS = 15_000  # "210 seconds" / "4 minutes" = within 15 s of that
+
+
+@dataclass
+class NLParse:
+    query: RecordingQuery
+    limit: Optional[int]
+    confidence: float  # share of the request the rules explained, 0..1
+
+
+def _ms(value: str, unit: str) -> int:
+    return int(float(value) * (60_000 if unit.startswith("min") else 1_000))
+
+
+class _Text:
+    """Lowercased request whose recognized spans are blanked out as they are consumed."""
+
+    def __init__(self, nl: str):
+        self.original = nl
+        self.masked = nl.lower()
+
+    def consume(self, start: int, end: int) -> None:
+        self.masked = self.masked[:start] + "|" * (end - start) + self.masked[end:]
+
+    def take(self, pattern: re.Pattern) -> List[re.Match]:
+        found = list(pattern.finditer(self.masked))
+        for m in found:
+            self.consume(*m.span())
+        return found
+
+    def leftover(self) -> List[str]:
+        return [t for t in _TOKEN.findall(self.masked) if t.strip("'-") and t not in _FILLER]
+
+
+def parse_nl_rules(nl: str) -> NLParse:
+    """
+    Deterministic parse of the common request shapes: counts ("10 songs",
+    "top 25", "ten"), decades ("80s", "1990s", "the eighties"), durations
+    ("3-5 minutes", "under 4 min", "210 seconds"), known genre tags and
+    "by <artist>". confidence drops with every word the rules could not place
+    and when the request is contradictory or ambiguous (two decades, two
+    genres, "by X and Y", "top 40 hits").
+    """
+    text = _Text(nl or "")
+    q = RecordingQuery()
+    conflicts = 0
+    if _TOP_N.search(text.masked) and _CHART_WORDS.search(text.masked):
+        conflicts += 1
+
+    durations = []
+    for pattern, kind in _DURATION_PATTERNS:
+        durations += [(kind, m) for m in text.take(pattern)]
+    for kind, m in durations:
+        if kind == "range":
+            lo_unit = m.group(2) or m.group(4)
+            q.min_duration_ms, q.max_duration_ms = sorted((_ms(m.group(1), lo_unit), _ms(m.group(3), m.group(4))))
+        elif kind == "max":
+            q.max_duration_ms = _ms(m.group(1), m.group(2))
+        elif kind == "min":
+            q.min_duration_ms = _ms(m.group(1), m.group(2))
+        else:
+            ms = _ms(m.group(1), m.group(2))
+            q.min_duration_ms, q.max_duration_ms = max(0, ms - ABOUT_TOLERANCE_MS), ms + ABOUT_TOLERANCE_MS
+    kinds = sorted(kind for kind, _ in durations)
+    if len(kinds) > 1 and kinds != ["max", "min"]:  # "over 3 and under 5 minutes" is fine, two ranges are not
+        conflicts += 1
+
+    decades = {int(m.group(1) + m.group(2) + "0") for m in text.take(_DECADE_4)}
+    for m in text.take(_DECADE_2):
+        d = int(m.group(1))
+        decades.add(2000 + d * 10 if d <= 2 else 1900 + d * 10)
+    for word, decade in _DECADE_WORDS.items():
+        if text.take(re.compile(rf"\b(?:the\s+)?{word}\b")):
+            decades.add(decade)
+    if decades:
+        q.decade = min(decades)
+        conflicts += len(decades) - 1
+
+    artist = text.take(_ARTIST)
+    if artist:
+        m = artist[0]
+        q.artist = text.original[m.start(1):m.end(1)].strip()
+        conflicts += len(artist) - 1 + bool(_SEVERAL_ARTISTS.search(q.artist))
+
+    genres = []
+    for alias, tag in _GENRE_ALIASES:
+        if text.take(re.compile(rf"(?<![\w-]){re.escape(alias)}(?![\w-])")) and tag not in genres:
+            genres.append(tag)
+    if genres:
+        q.genre = genres[0]
+        conflicts += len(genres) - 1
+
+    limits = [int(m.group(1)) for m in text.take(re.compile(r"(?<![\w.])(\d{1,3})(?!\w|\.\d)"))]
+    for word, value in _NUMBER_WORDS.items():
+        limits += [value for _ in text.take(re.compile(rf"\b{word}\b"))]
+    limit = None
+    if len(limits) == 1 and 1 <= limits[0] <= 100:
+        limit = limits[0]
+    elif limits:
+        conflicts += 1
+
+    slots = sum(x is not None for x in (q.artist, q.genre, q.decade, q.min_duration_ms or q.max_duration_ms, limit))
+    if slots == 0:
+        return NLParse(q, None, 0.0)
+    confidence = slots / (slots + len(text.leftover()))
+    if conflicts:
+        confidence = min(confidence, 0.5)
+    return NLParse(q, limit, round(confidence, 3))
+
+
+# ---------- LLM ----------
+
+def _llm_parse(nl: str) -> Tuple[RecordingQuery, Optional[int]]:
     client = get_openai_client()
     resp = client.chat.completions.create(
         model=OPENAI_MODEL,
@@ -77,3 +261,11 @@ def nl_to_query_and_limit(nl: str) -> Tuple[RecordingQuery, Optional[int]]:
         extra_terms=extra_terms,
     )
     return q, (int(limit) if isinstance(limit, int) else None)
+
+def nl_to_query_and_limit(nl: str, min_confidence: float = NL_RULES_MIN_CONFIDENCE) -> Tuple[RecordingQuery, Optional[int]]:
+    """Structured query + limit for `nl`: from the local rules when they explain it, else from the LLM."""
+    parsed = parse_nl_rules(nl)
+    if parsed.confidence >= min_confidence:
+        return parsed.query, parsed.limit
+    logger.debug("nl rules confidence %.2f for %r; asking the LLM", parsed.confidence, nl)
+    return _llm_parse(nl)
@@ -1,29 +1,40 @@
 # backend/agent/agent.py
 from typing import Optional
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from backend.classes import MusicBrainzClient
-from backend.helpers import get_mb_client 
+from fastapi.responses import StreamingResponse
+from backend.classes import MusicBrainzClient, LookupCache, SearchCache, LocalRecordingIndex
+from backend.helpers import get_mb_client, MB_CACHE_PATH, MB_LOCAL_INDEX, LATEST_STORE_URL, LATEST_STORE_TTL, DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_MB
 from contextlib import asynccontextmanager
 from openai import OpenAI
 import os, uuid
 from pydantic import BaseModel, ConfigDict
-from backend.state.memory import LatestListStore
+from backend.state.memory import BaseListStore, make_list_store
 from backend.agent.builder import build_agent
+from backend.tools import DownloadJobManager, DownloadListInput, JobQueueFull, YouTubeDownloader, DownloadCache
+from backend.tools.archive_stream import ArchiveFormat, MEDIA_TYPES, stream_archive
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.mb_client = MusicBrainzClient()
+    local_index = LocalRecordingIndex(MB_LOCAL_INDEX) if MB_LOCAL_INDEX else None
+    app.state.mb_client = MusicBrainzClient(
+        cache=LookupCache(MB_CACHE_PATH), search_cache=SearchCache(), local_index=local_index
+    )
     app.state.openai_client = OpenAI()
-    app.state.latest_store = LatestListStore()
+    app.state.latest_store = make_list_store(LATEST_STORE_URL, ttl=LATEST_STORE_TTL)
+    download_cache = DownloadCache(DOWNLOAD_CACHE_DIR, max_bytes=DOWNLOAD_CACHE_MAX_MB * 1024 * 1024)
+    app.state.download_jobs = DownloadJobManager(YouTubeDownloader(cache=download_cache))
+    # prompt, LLM, tools and executor are built once and shared by all sessions
+    app.state.agent = build_agent(
+        mbc=app.state.mb_client, store=app.state.latest_store, model=OPENAI_MODEL,
+        jobs=app.state.download_jobs,
+    )
     yield    
 
 
 app = FastAPI(title="MusicBrainz Wrapper API", version="0.1.0", lifespan=lifespan)
 
-app.state.latest_store = LatestListStore(cap=10) 
-
 # Simple CORS for local dev; tighten for prod
 app.add_middleware(
     CORSMiddleware,
@@ -41,12 +52,19 @@ def get_mb_client() -> MusicBrainzClient:
 def health():
     return {"status": "ok"}
 
+@app.get("/musicbrainz/rate-limit", tags=["meta"])
+def musicbrainz_rate_limit(mbc = Depends(get_mb_client)):
+    return mbc.limiter.stats()
+
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 # Dependency to get store
-def get_store() -> LatestListStore:
+def get_store() -> BaseListStore:
     return app.state.latest_store
 
+def get_agent():
+    return app.state.agent
+
 class AgentIn(BaseModel):
     query: str
     session_id: Optional[str] = None
@@ -60,11 +78,9 @@ class AgentOut(BaseModel):
 @app.post("/agent/chat", response_model=AgentOut, tags=["agent"])
 def agent_chat(
     body: AgentIn,
-    mbc = Depends(get_mb_client),
-    store: LatestListStore = Depends(get_store),
+    agent = Depends(get_agent),
 ):
     session_id = body.session_id or f"anon-{uuid.uuid4().hex[:8]}"
-    agent = build_agent(mbc=mbc, store=store, model=OPENAI_MODEL, session_id=session_id)
 
     result = agent.invoke(
         {"input": body.query},
@@ -72,3 +88,57 @@ def agent_chat(
     )
     return AgentOut(response=result.get("output", ""))
 
+
+# ---- Background download jobs
+def get_jobs() -> DownloadJobManager:
+    return app.state.download_jobs
+
+@app.post("/jobs/downloads", status_code=202, tags=["jobs"])
+def enqueue_download(
+    body: DownloadListInput,
+    session_id: Optional[str] = None,
+    jobs: DownloadJobManager = Depends(get_jobs),
+):
+    try:
+        job = jobs.submit(body.songs, max_songs=body.max_songs, session_id=session_id)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_json()
+
+@app.get("/jobs/{job_id}", tags=["jobs"])
+def get_job(job_id: str, jobs: DownloadJobManager = Depends(get_jobs)):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job.to_json()
+
+@app.delete("/jobs/{job_id}", tags=["jobs"])
+def cancel_job(job_id: str, jobs: DownloadJobManager = Depends(get_jobs)):
+    if jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return {"job_id": job_id, "cancelled": jobs.cancel(job_id)}
+
+
+# ---- Streaming archives of downloaded songs (built on the fly, no temp file)
+def _archive_response(job_list: list, fmt: ArchiveFormat, name: str) -> StreamingResponse:
+    entries = ((os.path.basename(it.path), it.path) for it in DownloadJobManager.iter_finished(job_list))
+    return StreamingResponse(
+        stream_archive(entries, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+@app.get("/jobs/{job_id}/archive", tags=["jobs"])
+def job_archive(job_id: str, format: ArchiveFormat = "zip", jobs: DownloadJobManager = Depends(get_jobs)):
+    """Streams as soon as the first song is ready; songs still downloading are added when they finish."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return _archive_response([job], format, f"playlist-{job_id[:8]}")
+
+@app.get("/sessions/{session_id}/archive", tags=["jobs"])
+def session_archive(session_id: str, format: ArchiveFormat = "zip", jobs: DownloadJobManager = Depends(get_jobs)):
+    job_list = jobs.for_session(session_id)
+    if not job_list:
+        raise HTTPException(status_code=404, detail="No downloads for this session")
+    return _archive_response(job_list, format, f"session-{session_id[:8]}")
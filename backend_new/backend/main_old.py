@@ -2,24 +2,30 @@
 from typing import List, Optional
 from fastapi import FastAPI, Depends, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from backend.classes import MusicBrainzClient,RecordingQuery
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from backend.classes import MusicBrainzClient, AsyncMusicBrainzClient, RecordingQuery, LookupCache, SearchCache, LocalRecordingIndex
 from backend.dto.RecordingDTO import RecordingDTO, NLQueryIn
-from backend.helpers import get_mb_client, get_openai_client, nl_to_query_and_limit  
+from backend.helpers import get_mb_client, get_async_mb_client, get_openai_client, nl_to_query_and_limit, MB_CACHE_PATH, MB_LOCAL_INDEX, DOWNLOAD_CACHE_DIR, DOWNLOAD_CACHE_MAX_MB
 from contextlib import asynccontextmanager
 from openai import OpenAI
 from typing import Literal
+import json
 from pydantic import BaseModel, ConfigDict
 from backend.tools.intention import IntentionClassifier
-from backend.tools import YouTubeDownloader, DownloadListInput, DownloadResult
+from backend.tools import YouTubeDownloader, DownloadCache, DownloadJobManager, DownloadListInput, JobQueueFull
 from backend.tools import make_nl_parser_tool
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # init singletons once per process
-    app.state.mb_client = MusicBrainzClient()
+    lookup_cache, search_cache = LookupCache(MB_CACHE_PATH), SearchCache()
+    local_index = LocalRecordingIndex(MB_LOCAL_INDEX) if MB_LOCAL_INDEX else None
+    app.state.mb_client = MusicBrainzClient(cache=lookup_cache, search_cache=search_cache, local_index=local_index)
+    app.state.async_mb_client = AsyncMusicBrainzClient(cache=lookup_cache, search_cache=search_cache, local_index=local_index)
     app.state.openai_client = OpenAI()  # reads OPENAI_API_KEY from env
     yield
-    # optional: teardown logic
+    await app.state.async_mb_client.aclose()
 
 app = FastAPI(title="MusicBrainz Wrapper API", version="0.1.0", lifespan=lifespan)
 
@@ -42,12 +48,12 @@ def health():
 
 
 @app.post("/search/recordings", response_model=List[RecordingDTO], tags=["search"])
-def search_recordings(
+async def search_recordings(
     body: Optional[RecordingQuery] = None,          
     limit: int = Query(20, ge=1, le=100),
     enrich_missing_dates: bool = Query(True),
     enrich_genres: bool = Query(True),
-    mbc: MusicBrainzClient = Depends(get_mb_client),
+    mbc: AsyncMusicBrainzClient = Depends(get_async_mb_client),
 ):
     """
     Send any subset of fields; empty body does a wildcard search (*).
@@ -55,7 +61,7 @@ def search_recordings(
     q = body or RecordingQuery()                    
 
     try:
-        results = mbc.search_recordings(
+        results = await mbc.search_recordings(
             query=q,
             limit=limit,
             enrich_missing_dates=enrich_missing_dates,
@@ -77,23 +83,62 @@ def search_recordings(
         for r in results
     ]
 
+@app.post("/search/recordings/stream", tags=["search"])
+async def search_recordings_stream(
+    body: Optional[RecordingQuery] = None,
+    limit: int = Query(20, ge=1, le=100),
+    enrich_missing_dates: bool = Query(True),
+    enrich_genres: bool = Query(True),
+    format: Literal["ndjson", "sse"] = Query("ndjson"),
+    mbc: AsyncMusicBrainzClient = Depends(get_async_mb_client),
+):
+    """
+    Same search, streamed: one "results" event with the un-enriched list as soon
+    as the search call returns, then a "patch" event per recording as genre /
+    first_release_date resolve, then "done".
+    """
+    q = body or RecordingQuery()
+
+    def encode(event: dict) -> str:
+        if format == "sse":
+            return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        return json.dumps(event) + "\n"
+
+    async def events():
+        try:
+            async for event in mbc.stream_recordings(
+                query=q,
+                limit=limit,
+                enrich_missing_dates=enrich_missing_dates,
+                enrich_genres=enrich_genres,
+            ):
+                if event["event"] == "results":
+                    event["recordings"] = [RecordingDTO(**r).model_dump() for r in event["recordings"]]
+                yield encode(event)
+        except Exception as e:
+            yield encode({"event": "error", "detail": f"Upstream error: {e}"})
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
+
 @app.post("/nl/search/recordings", response_model=List[RecordingDTO], tags=["search"])
-def search_recordings_nl(
+async def search_recordings_nl(
     body: NLQueryIn,
     limit: int = Query(20, ge=1, le=100),
     enrich_missing_dates: bool = Query(True),
     enrich_genres: bool = Query(True),
-    mbc = Depends(get_mb_client),
+    mbc: AsyncMusicBrainzClient = Depends(get_async_mb_client),
     openai_client: OpenAI = Depends(get_openai_client),
 ):
     try:
-        q, nl_limit = nl_to_query_and_limit(body.query)
+        # the OpenAI call is blocking; keep it off the event loop
+        q, nl_limit = await run_in_threadpool(nl_to_query_and_limit, body.query)
         effective_limit = nl_limit or limit
         # clamp for safety
         if effective_limit < 1: effective_limit = 1
         if effective_limit > 100: effective_limit = 100
 
-        results = mbc.search_recordings(
+        results = await mbc.search_recordings(
             query=q,
             limit=effective_limit,
             enrich_missing_dates=enrich_missing_dates,
@@ -129,11 +174,30 @@ def detect_intention(body: IntentionIn):
     res = _intention.classify(body.query)
     return IntentionOut(intention=res.intention, reason=res.reason)
 
-yd = YouTubeDownloader()
+yd = YouTubeDownloader(cache=DownloadCache(DOWNLOAD_CACHE_DIR, max_bytes=DOWNLOAD_CACHE_MAX_MB * 1024 * 1024))
+download_jobs = DownloadJobManager(yd)
 
-@app.post("/tools/youtube/download", response_model=list[DownloadResult], tags=["tools"])
+@app.post("/tools/youtube/download", status_code=202, tags=["tools"])
 def youtube_download(body: DownloadListInput):
-    return [r.dict() for r in yd.download_batch(body.songs, max_songs=body.max_songs)]
+    """Queues the batch as a background job; poll GET /jobs/{job_id} for per-song progress."""
+    try:
+        job = download_jobs.submit(body.songs, max_songs=body.max_songs)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_json()
+
+@app.get("/jobs/{job_id}", tags=["jobs"])
+def get_job(job_id: str):
+    job = download_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job.to_json()
+
+@app.delete("/jobs/{job_id}", tags=["jobs"])
+def cancel_job(job_id: str):
+    if download_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return {"job_id": job_id, "cancelled": download_jobs.cancel(job_id)}
 
 
 class NLParseIn(BaseModel):
@@ -0,0 +1,124 @@
+# backend/state/history.py
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, SystemMessage
+
+# (previous summary, turns being folded) -> new summary
+Summarizer = Callable[[str, List[BaseMessage]], str]
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    # ~4 characters per token plus per-message overhead; good enough for budgeting
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return len(content) // 4 + 4
+
+
+def extractive_summary(previous: str, folded: List[BaseMessage], max_chars: int = 1200) -> str:
+    """Default summarizer: one clipped line per folded message, oldest lines dropped past max_chars."""
+    lines = [l for l in previous.splitlines() if l] if previous else []
+    for m in folded:
+        text = " ".join(str(m.content).split())
+        lines.append(f"- {m.type}: {text[:160]}{'…' if len(text) > 160 else ''}")
+    while lines and sum(len(l) + 1 for l in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class WindowedChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history that keeps recent messages verbatim within a token budget and
+    folds anything older into a compact summary, exposed as one leading
+    SystemMessage. Keeps prompt size flat however long the session runs.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        min_messages: int = 4,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.min_messages = min_messages
+        self.summarizer = summarizer or extractive_summary
+        self.summary = ""
+        self._recent: List[BaseMessage] = []
+        self._lock = RLock()
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        with self._lock:
+            if not self.summary:
+                return list(self._recent)
+            return [SystemMessage(content="Summary of earlier conversation:\n" + self.summary)] + self._recent
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        with self._lock:
+            self._recent.extend(messages)
+            self._fold()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.summary = ""
+            self._recent = []
+
+    def _fold(self) -> None:
+        total = sum(estimate_tokens(m) for m in self._recent)
+        cut = 0
+        while total > self.max_tokens and len(self._recent) - cut > self.min_messages:
+            total -= estimate_tokens(self._recent[cut])
+            cut += 1
+        if cut:
+            folded, self._recent = self._recent[:cut], self._recent[cut:]
+            self.summary = self.summarizer(self.summary, folded)
+
+
+class HistoryStore:
+    """
+    Per-session chat histories with LRU eviction (max_sessions) and idle expiry
+    (ttl seconds). Pass `store.get` as get_session_history.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl: float = 6 * 3600,
+        factory: Callable[[], BaseChatMessageHistory] = WindowedChatMessageHistory,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.factory = factory
+        self._sessions: "OrderedDict[str, Tuple[float, BaseChatMessageHistory]]" = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, session_id: str) -> BaseChatMessageHistory:
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._sessions.get(session_id)
+            history = entry[1] if entry else self.factory()
+            self._sessions[session_id] = (now, history)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return history
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict(self, now: float) -> None:
+        # oldest-access first, so stop at the first live entry
+        while self._sessions:
+            sid, (seen, _) = next(iter(self._sessions.items()))
+            if now - seen < self.ttl:
+                break
+            del self._sessions[sid]
@@ -1,25 +1,170 @@
 # backend/state/memory.py
 from __future__ import annotations
-from typing import Dict, List, Any
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from threading import RLock
 
-class LatestListStore:
-    def __init__(self):
-        self._data: Dict[str, List[Dict[str, Any]]] = {}
+Items = List[Dict[str, Any]]
+
+
+class BaseListStore(ABC):
+    """Latest suggested list per session. Implementations must be safe to share across threads."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Items: ...
+
+    @abstractmethod
+    def set(self, session_id: str, items: Items) -> None: ...
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None: ...
+
+    def is_empty(self, session_id: str) -> bool:
+        return not bool(self.get(session_id))
+
+
+class LatestListStore(BaseListStore):
+    """
+    In-process store split into shards, each with its own lock, so sessions
+    don't contend on one RLock. Entries expire after ttl seconds (None = never)
+    and each shard keeps at most its share of max_sessions (LRU).
+    """
+
+    def __init__(self, num_shards: int = 16, ttl: Optional[float] = None, max_sessions: int = 10_000):
+        self.ttl = ttl
+        self.num_shards = max(1, num_shards)
+        self._per_shard = max(1, -(-max_sessions // self.num_shards))
+        self._shards: List[Tuple["OrderedDict[str, Tuple[float, Items]]", RLock]] = [
+            (OrderedDict(), RLock()) for _ in range(self.num_shards)
+        ]
+
+    def _shard(self, session_id: str):
+        return self._shards[hash(session_id) % self.num_shards]
+
+    def get(self, session_id: str) -> Items:
+        data, lock = self._shard(session_id)
+        with lock:
+            entry = data.get(session_id)
+            if entry is None:
+                return []
+            if entry[0] <= time.time():
+                del data[session_id]
+                return []
+            data.move_to_end(session_id)
+            return list(entry[1])
+
+    def set(self, session_id: str, items: Items) -> None:
+        data, lock = self._shard(session_id)
+        expires_at = time.time() + self.ttl if self.ttl is not None else float("inf")
+        with lock:
+            data[session_id] = (expires_at, list(items))
+            data.move_to_end(session_id)
+            while len(data) > self._per_shard:
+                data.popitem(last=False)
+
+    def clear(self, session_id: str) -> None:
+        data, lock = self._shard(session_id)
+        with lock:
+            data.pop(session_id, None)
+
+
+class SQLiteListStore(BaseListStore):
+    """
+    File-backed store; every uvicorn worker on the host opening the same file
+    sees the same lists. Entries expire after ttl seconds (None = never).
+    """
+
+    def __init__(self, path: str | Path, ttl: Optional[float] = None, max_sessions: int = 10_000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS latest_lists ("
+            " session_id TEXT PRIMARY KEY, items TEXT NOT NULL,"
+            " expires_at REAL, updated_at REAL NOT NULL)"
+        )
+        self._db.commit()
         self._lock = RLock()
 
-    def get(self, session_id: str) -> List[Dict[str, Any]]:
+    def get(self, session_id: str) -> Items:
         with self._lock:
-            return list(self._data.get(session_id, []))
+            row = self._db.execute(
+                "SELECT items, expires_at FROM latest_lists WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return []
+        return json.loads(row[0])
 
-    def set(self, session_id: str, items: List[Dict[str, Any]]) -> None:
+    def set(self, session_id: str, items: Items) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
         with self._lock:
-            self._data[session_id] = list(items)
+            self._db.execute(
+                "INSERT OR REPLACE INTO latest_lists (session_id, items, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, json.dumps(list(items)), expires_at, now),
+            )
+            self._db.execute("DELETE FROM latest_lists WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM latest_lists WHERE session_id IN (SELECT session_id FROM latest_lists"
+                " ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,),
+            )
+            self._db.commit()
 
-    def is_empty(self, session_id: str) -> bool:
+    def clear(self, session_id: str) -> None:
         with self._lock:
-            return not bool(self._data.get(session_id))
+            self._db.execute("DELETE FROM latest_lists WHERE session_id = ?", (session_id,))
+            self._db.commit()
+
+
+class RedisListStore(BaseListStore):
+    """
+    Store on any Redis-protocol server (Redis, Valkey, KeyDB, a local stand-in).
+    `client` needs get(key), set(key, value, px=milliseconds) and delete(key).
+    """
+
+    def __init__(self, client: Any, ttl: Optional[float] = None, prefix: str = "latest:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisListStore":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RedisListStore requires the 'redis' package (pip install redis).") from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, session_id: str) -> Items:
+        raw = self.client.get(self.prefix + session_id)
+        return json.loads(raw) if raw else []
+
+    def set(self, session_id: str, items: Items) -> None:
+        # milliseconds, at least 1: Redis rejects a zero expiry, which ex=int(ttl) gives for ttl < 1
+        px = max(1, int(self.ttl * 1000)) if self.ttl is not None else None
+        self.client.set(self.prefix + session_id, json.dumps(list(items)), px=px)
 
     def clear(self, session_id: str) -> None:
-        with self._lock:
-            self._data.pop(session_id, None)
+        self.client.delete(self.prefix + session_id)
+
+
+def make_list_store(url: Optional[str] = None, ttl: Optional[float] = None) -> BaseListStore:
+    """
+    memory:// (default) | sqlite:///path/to/file.sqlite | redis://host:6379/0
+    """
+    if not url or url.startswith("memory://"):
+        return LatestListStore(ttl=ttl)
+    if url.startswith("sqlite:///"):
+        return SQLiteListStore(url[len("sqlite:///"):], ttl=ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisListStore.from_url(url, ttl=ttl)
+    raise ValueError(f"Unsupported LATEST_STORE_URL: {url}")
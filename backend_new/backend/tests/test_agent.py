@@ -0,0 +1,50 @@
+import re
+
+from fastapi.testclient import TestClient
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import backend.agent.builder as builder
+import backend.main as main
+
+
+class EchoModel(BaseChatModel):
+    """Answers "<session id from the system prompt>: <every user turn it was shown>", never calls tools."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        sid = re.search(r"Your session id is: (\S+)\.", messages[0].content).group(1)
+        heard = [m.content for m in messages if m.type == "human"]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"{sid}: " + " / ".join(heard)))])
+
+
+def test_one_agent_serves_separate_sessions(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(builder, "ChatOpenAI", lambda model, temperature: EchoModel())
+    monkeypatch.setattr(main, "MB_CACHE_PATH", str(tmp_path / "mb.sqlite"))
+    monkeypatch.setattr(main, "DOWNLOAD_CACHE_DIR", str(tmp_path / "audio"))
+    builds = []
+    build_agent = main.build_agent
+    monkeypatch.setattr(main, "build_agent", lambda **kw: builds.append(1) or build_agent(**kw))
+
+    with TestClient(main.app) as client:
+        def chat(session_id, query):
+            r = client.post("/agent/chat", json={"query": query, "session_id": session_id})
+            assert r.status_code == 200
+            return r.json()["response"]
+
+        assert chat("agent-a", "rock please") == "agent-a: rock please"
+        assert chat("agent-b", "jazz please") == "agent-b: jazz please"
+        assert chat("agent-a", "more") == "agent-a: rock please / more"
+        assert chat("agent-b", "more") == "agent-b: jazz please / more"
+    assert len(builds) == 1  # built in the lifespan, not per request
+
+    history = builder._histories.get("agent-a").messages
+    assert [m.content for m in history] == ["rock please", "agent-a: rock please", "more", "agent-a: rock please / more"]
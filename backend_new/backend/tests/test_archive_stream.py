@@ -0,0 +1,50 @@
+import io
+import tarfile
+import threading
+import zipfile
+
+from backend.tools import DownloadJobManager, YouTubeDownloader, SongItem
+from backend.tools.archive_stream import stream_archive
+
+
+def _songs(tmp_path, names, size=300_000):
+    out = []
+    for i, n in enumerate(names):
+        p = tmp_path / f"{i}.mp3"
+        p.write_bytes(bytes([i]) * size)
+        out.append((n, str(p)))
+    return out
+
+
+def test_zip_and_tar_round_trip_in_bounded_chunks(tmp_path):
+    entries = _songs(tmp_path, ["a.mp3", "b.mp3", "a.mp3"])
+    chunks = list(stream_archive(entries, "zip"))
+    assert max(len(c) for c in chunks) < 300_000  # never a whole file at once
+    zf = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert zf.namelist() == ["a.mp3", "b.mp3", "a (2).mp3"] and zf.testzip() is None
+    assert zf.read("a (2).mp3") == bytes([2]) * 300_000
+
+    tf = tarfile.open(fileobj=io.BytesIO(b"".join(stream_archive(entries, "tar"))))
+    assert tf.getnames() == ["a.mp3", "b.mp3", "a (2).mp3"]
+    assert tf.extractfile("b.mp3").read() == bytes([1]) * 300_000
+
+
+def test_archive_starts_before_job_finishes(monkeypatch, tmp_path):
+    files = dict(_songs(tmp_path, ["fast", "slow"]))
+    release = threading.Event()
+    yd = YouTubeDownloader()
+    def fake_download(q, progress=None):
+        if q == "slow":
+            release.wait(5)
+        return files[q]
+    monkeypatch.setattr(yd, "download", fake_download)
+
+    jobs = DownloadJobManager(yd)
+    job = jobs.submit([SongItem(title="slow"), SongItem(title="fast")], session_id="s1")
+    assert jobs.for_session("s1") == [job]
+
+    finished = DownloadJobManager.iter_finished([job], poll=0.01)
+    first = next(finished)
+    assert first.query == "fast"  # completion order, not input order
+    release.set()
+    assert [it.query for it in finished] == ["slow"]
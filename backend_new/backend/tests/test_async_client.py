@@ -0,0 +1,113 @@
+import asyncio
+import httpx
+from backend.classes import AsyncMusicBrainzClient, RateLimiter, SearchCache
+
+def test_concurrent_identical_searches_share_one_upstream_call():
+    hits = []
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"recordings": [{
+            "id": "r1", "title": "Beat It", "length": 258000,
+            "artist-credit": [{"name": "Michael Jackson", "joinphrase": "", "artist": {"id": "a1"}}],
+            "releases": [{"id": "rel1", "date": "1983-02-14"}],
+        }]})
+
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mbc = AsyncMusicBrainzClient(http=http, limiter=RateLimiter(rate=1000, burst=100))
+        results = await asyncio.gather(*(mbc.search_recordings('artist:"Michael Jackson"', limit=5) for _ in range(3)))
+        await mbc.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert len(hits) == 1
+    assert all(r[0].artist == "Michael Jackson" and r[0].decade == 1980 for r in results)
+
+def test_stream_sends_base_results_before_enrichment():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/recording"):
+            return httpx.Response(200, json={"recordings": [{"id": "r1", "title": "Thriller", "length": None}]})
+        if "/recording/" in request.url.path:
+            return httpx.Response(200, json={
+                "releases": [{"id": "rel1", "date": "1982-11-30"}],
+                "tags": [{"name": "pop", "count": 5}],
+            })
+        return httpx.Response(404)
+
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mbc = AsyncMusicBrainzClient(http=http, limiter=RateLimiter(rate=1000, burst=100))
+        events = [e async for e in mbc.stream_recordings("Thriller", limit=1, enrich_missing_dates=True, enrich_genres=True)]
+        await mbc.aclose()
+        return events
+
+    events = asyncio.run(run())
+    assert [e["event"] for e in events] == ["results", "patch", "done"]
+    assert events[0]["recordings"][0]["genre"] is None
+    assert events[1]["fields"] == {"genre": "pop", "first_release_date": "1982-11-30", "decade": 1980}
+
+def test_cancelling_one_waiter_does_not_fail_the_others():
+    hits = []
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"recordings": [{"id": "r1", "title": "Beat It"}]})
+
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mbc = AsyncMusicBrainzClient(http=http, limiter=RateLimiter(rate=1000, burst=100))
+        owner = asyncio.create_task(mbc.search_recordings("Beat It", limit=1))
+        await asyncio.sleep(0.01)  # the owner's upstream call is in flight
+        follower = asyncio.create_task(mbc.search_recordings("Beat It", limit=1))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        result = await follower
+        await mbc.aclose()
+        return owner, result
+
+    owner, result = asyncio.run(run())
+    assert owner.cancelled()
+    assert [r.title for r in result] == ["Beat It"] and len(hits) == 1
+
+def test_stale_refresh_uses_background_lane():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"recordings": []})
+
+    async def run():
+        limiter = RateLimiter(rate=1000, burst=100)
+        lanes = []
+        acquire = limiter.acquire_async
+        async def recording_acquire(lane=RateLimiter.BACKGROUND):
+            lanes.append(lane)
+            await acquire(lane)
+        limiter.acquire_async = recording_acquire
+
+        cache = SearchCache(fresh_ttl=0)
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mbc = AsyncMusicBrainzClient(http=http, search_cache=cache, limiter=limiter)
+        await mbc.search_recordings("Thriller", limit=5)
+        await mbc.search_recordings("Thriller", limit=5)  # stale: served, refreshed in the background
+        await asyncio.gather(*mbc._background)
+        await mbc.aclose()
+        return lanes
+
+    assert asyncio.run(run()) == [RateLimiter.INTERACTIVE, RateLimiter.BACKGROUND]
+
+def test_failed_lookups_are_logged(caplog):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/recording"):
+            return httpx.Response(200, json={"recordings": [{"id": "r1", "title": "Thriller"}]})
+        return httpx.Response(503)
+
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mbc = AsyncMusicBrainzClient(http=http, limiter=RateLimiter(rate=1000, burst=100))
+        out = await mbc.search_recordings("Thriller", limit=1, enrich_genres=True)
+        await mbc.aclose()
+        return out
+
+    with caplog.at_level("WARNING", logger="backend.classes.AsyncMusicBrainzClient"):
+        (rec,) = asyncio.run(run())
+    assert rec.genre is None
+    assert "recording lookup of r1 failed" in caplog.text
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+from backend.tools.download_cache import DownloadCache
+from backend.tools.search_resolver import Resolution
+from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
+
+
+def _file(path, size):
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def _fake_search(q):
+    return Resolution(query=q, video_id="vidA", title=q, duration=200, formats=[], info={"id": "vidA"})
+
+
+def test_put_get_query_index_and_eviction(tmp_path):
+    cache = DownloadCache(tmp_path / "cache", max_bytes=250)
+    a = cache.put("vidA", "mp3", "192", _file(tmp_path / "a.mp3", 100), query="Michael Jackson - Billie Jean")
+    assert a.endswith("vidA-mp3-192.mp3") and os.path.exists(a)
+    assert cache.get_by_query("michael jackson –  billie jean", "mp3", "192") == a
+    assert cache.get("vidA", "mp3", "320") is None
+
+    # a second query resolving to the same video shares the file
+    cache.remember_query("Billie Jean", "vidA")
+    assert cache.get_by_query("Billie Jean", "mp3", "192") == a
+
+    cache.put("vidB", "mp3", "192", _file(tmp_path / "b.mp3", 100))
+    cache.get("vidA", "mp3", "192")  # touch A so B is least recently used
+    cache.put("vidC", "mp3", "192", _file(tmp_path / "c.mp3", 100))
+    assert cache.get("vidB", "mp3", "192") is None
+    assert cache.get("vidA", "mp3", "192") == a
+    assert cache.total_bytes() <= 250
+
+
+def test_repeat_download_is_a_lookup(monkeypatch, tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    yd = YouTubeDownloader(cache=cache)
+    yd.download_folder = tmp_path / "dl"
+    yd.download_folder.mkdir()
+    calls = []
+
+    def fake_fetch(q, res, progress=None):
+        calls.append(q)
+        return {"id": res.video_id, "filepath": str(tmp_path / "raw.webm")}
+    def fake_transcode(info):
+        return _file(tmp_path / "raw.mp3", 10)
+    monkeypatch.setattr(yd.resolver, "_search", _fake_search)
+    monkeypatch.setattr(yd, "_fetch", fake_fetch)
+    monkeypatch.setattr(yd, "_transcode", fake_transcode)
+
+    first = yd.download("Michael Jackson - Billie Jean")
+    second = yd.download("michael jackson - billie jean")
+    assert calls == ["Michael Jackson - Billie Jean"]
+    assert first.startswith(str(yd.download_folder)) and os.path.exists(second)
+    assert os.path.samefile(first, cache.get("vidA", "mp3", "192"))
+
+
+def test_concurrent_downloads_of_one_video_fetch_it_once(monkeypatch, tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    yd = YouTubeDownloader(cache=cache, fetch_workers=4)
+    yd.download_folder = tmp_path / "dl"
+    yd.download_folder.mkdir()
+    calls, busy = [], threading.Lock()
+
+    def fake_fetch(q, res, progress=None):
+        assert busy.acquire(blocking=False), "two fetches of the same video at once"
+        calls.append(q)
+        time.sleep(0.05)
+        busy.release()
+        return {"id": res.video_id, "filepath": str(tmp_path / "raw.webm")}
+    def fake_transcode(info):
+        return _file(tmp_path / "raw.mp3", 10)
+    monkeypatch.setattr(yd.resolver, "_search", _fake_search)  # both queries resolve to vidA
+    monkeypatch.setattr(yd, "_fetch", fake_fetch)
+    monkeypatch.setattr(yd, "_transcode", fake_transcode)
+
+    res = yd.download_batch([SongItem(title="Billie Jean", artist="Michael Jackson"), SongItem(title="Billie Jean")])
+    assert [r.status for r in res] == ["ok", "ok"]
+    assert len(calls) == 1 and yd._video_locks == {}
+    assert os.path.samefile(res[0].path, res[1].path)
+
+def test_concurrent_materialize_to_one_destination(tmp_path):
+    cached = _file(tmp_path / "cached.mp3", 10)
+    dests = [tmp_path / f"song{i}.mp3" for i in range(30)]
+    start, errors = threading.Barrier(8), []
+
+    def hit():
+        for dest in dests:  # every thread races on each fresh destination
+            start.wait()
+            try:
+                DownloadCache.materialize(cached, dest)
+            except Exception as e:
+                errors.append(e)
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert errors == [] and all(os.path.samefile(cached, d) for d in dests)
+    assert sorted(os.listdir(tmp_path)) == sorted(["cached.mp3"] + [d.name for d in dests])
@@ -0,0 +1,69 @@
+import threading
+import time
+import pytest
+from backend.tools import DownloadJobManager, JobQueueFull, YouTubeDownloader, SongItem
+
+def wait_for(job, statuses=("done", "cancelled"), timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in statuses and time.time() < deadline:
+        time.sleep(0.01)
+    return job.to_json()
+
+def test_job_reports_per_song_progress(monkeypatch):
+    yd = YouTubeDownloader()
+    def fake_download(q, progress=None):
+        progress({"stage": "fetching", "downloaded_bytes": 10, "total_bytes": 10, "eta": 0})
+        if q == "bad":
+            raise RuntimeError("not found")
+        progress({"stage": "transcoding"})
+        return f"/tmp/{q}.mp3"
+    monkeypatch.setattr(yd, "download", fake_download)
+
+    jobs = DownloadJobManager(yd)
+    job = jobs.submit([SongItem(title="a"), SongItem(title="bad")])
+    state = wait_for(job)
+    assert state["status"] == "done" and state["done"] == 2
+    assert [it["stage"] for it in state["items"]] == ["done", "error"]
+    assert state["items"][0]["path"] == "/tmp/a.mp3" and state["items"][0]["total_bytes"] == 10
+
+def test_cancel_and_backpressure(monkeypatch):
+    yd = YouTubeDownloader()
+    release = threading.Event()
+    def slow_download(q, progress=None):
+        release.wait(5)
+        progress({"stage": "fetching"})
+        return q
+    monkeypatch.setattr(yd, "download", slow_download)
+
+    jobs = DownloadJobManager(yd, max_queued_jobs=1, job_workers=1)
+    running = jobs.submit([SongItem(title="a")])
+    while running.status != "running":
+        time.sleep(0.01)
+    queued = jobs.submit([SongItem(title="b")])
+    with pytest.raises(JobQueueFull):
+        jobs.submit([SongItem(title="c")])
+
+    assert jobs.cancel(running.id)
+    release.set()
+    assert wait_for(running)["items"][0]["stage"] == "cancelled"
+    assert wait_for(queued)["status"] == "done"
+
+def test_cancelling_a_queued_job_reports_it_at_once(monkeypatch):
+    yd = YouTubeDownloader()
+    release = threading.Event()
+    monkeypatch.setattr(yd, "download", lambda q, progress=None: release.wait(5) and q)
+
+    jobs = DownloadJobManager(yd, job_workers=1)
+    running = jobs.submit([SongItem(title="a")])
+    while running.status != "running":
+        time.sleep(0.01)
+    queued = jobs.submit([SongItem(title="b")])
+    assert jobs.cancel(queued.id)
+    state = jobs.get(queued.id).to_json()
+    assert state["status"] == "cancelled" and state["items"][0]["stage"] == "cancelled"
+    assert not jobs.cancel(queued.id)
+
+    release.set()
+    assert wait_for(running)["status"] == "done"
+    jobs._queue.join()  # the worker dequeued the cancelled job and skipped it
+    assert queued.to_json()["status"] == "cancelled"
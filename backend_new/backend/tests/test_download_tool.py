@@ -1,3 +1,4 @@
+from backend.tools.search_resolver import Resolution
 from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
 
 def test_download_batch_monkeypatch(monkeypatch, tmp_path):
@@ -10,3 +11,38 @@ def test_download_batch_monkeypatch(monkeypatch, tmp_path):
     res = yd.download_batch(items)
     assert res[0].status == "ok"
     assert res[0].path.endswith(".mp3")
+
+def test_download_batch_parallel_stages_keep_order(monkeypatch):
+    import threading, time
+    yd = YouTubeDownloader(fetch_workers=3, transcode_workers=1)
+    active = {"fetch": 0, "transcode": 0}
+    peak = {"fetch": 0, "transcode": 0}
+    lock = threading.Lock()
+
+    def track(stage, delay):
+        with lock:
+            active[stage] += 1
+            peak[stage] = max(peak[stage], active[stage])
+        time.sleep(delay)
+        with lock:
+            active[stage] -= 1
+
+    def fake_search(q):
+        return Resolution(query=q, video_id="vid-" + q, title=q, duration=200, formats=[], info={})
+    def fake_fetch(q, res, progress=None):
+        track("fetch", 0.05)
+        if q == "bad":
+            raise RuntimeError("not found")
+        return {"q": q}
+    def fake_transcode(info):
+        track("transcode", 0.01)
+        return f"/tmp/{info['q']}.mp3"
+    monkeypatch.setattr(yd.resolver, "_search", fake_search)
+    monkeypatch.setattr(yd, "_fetch", fake_fetch)
+    monkeypatch.setattr(yd, "_transcode", fake_transcode)
+
+    items = [SongItem(title=t) for t in ["a", "bad", "c", "d", "e", "f"]]
+    res = yd.download_batch(items)
+    assert [r.query for r in res] == ["a", "bad", "c", "d", "e", "f"]
+    assert [r.status for r in res] == ["ok", "error", "ok", "ok", "ok", "ok"]
+    assert peak["fetch"] == 3 and peak["transcode"] == 1
@@ -0,0 +1,34 @@
+import musicbrainzngs as mb
+from backend.classes import MusicBrainzClient, Recording, RateLimiter
+
+def test_enrichment_fetches_shared_ids_once(monkeypatch):
+    calls = []
+    def fake_recording(mbid, includes=None):
+        calls.append(("recording", mbid))
+        return {"recording": {
+            "release-list": [{"id": "rel-1", "date": "1982-11-30"}],
+            "artist-credit": [{"artist": {"id": "art-1", "name": "Michael Jackson"}}],
+        }}
+    def fake_release(mbid, includes=None):
+        calls.append(("release", mbid))
+        return {"release": {"release-group": {"id": "rg-1"}}}
+    def fake_release_group(mbid, includes=None):
+        calls.append(("release-group", mbid))
+        return {"release-group": {}}
+    def fake_artist(mbid, includes=None):
+        calls.append(("artist", mbid))
+        return {"artist": {"tag-list": [{"name": "pop", "count": "9"}, {"name": "soul", "count": "3"}]}}
+
+    monkeypatch.setattr(mb, "get_recording_by_id", fake_recording)
+    monkeypatch.setattr(mb, "get_release_by_id", fake_release)
+    monkeypatch.setattr(mb, "get_release_group_by_id", fake_release_group)
+    monkeypatch.setattr(mb, "get_artist_by_id", fake_artist)
+
+    recs = [Recording(mbid=f"rec-{i}", title=f"Song {i}") for i in range(3)]
+    MusicBrainzClient(limiter=RateLimiter(rate=1000, burst=100))._enrich_many(recs, need_date=True, need_genre=True)
+
+    assert [r.genre for r in recs] == ["pop", "pop", "pop"]
+    assert all(r.decade == 1980 for r in recs)
+    assert calls.count(("release", "rel-1")) == 1
+    assert calls.count(("release-group", "rg-1")) == 1
+    assert calls.count(("artist", "art-1")) == 1
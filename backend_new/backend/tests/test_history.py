@@ -0,0 +1,19 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from backend.state.history import HistoryStore, WindowedChatMessageHistory
+
+def test_old_turns_fold_into_summary():
+    h = WindowedChatMessageHistory(max_tokens=60, min_messages=2)
+    for i in range(10):
+        h.add_messages([HumanMessage(content=f"question {i} " * 10), AIMessage(content=f"answer {i} " * 10)])
+    msgs = h.messages
+    assert isinstance(msgs[0], SystemMessage) and "question 0" not in msgs[-1].content
+    assert msgs[-1].content.startswith("answer 9")
+    assert len(msgs) <= 4
+
+def test_store_evicts_least_recently_used_sessions():
+    store = HistoryStore(max_sessions=2)
+    a = store.get("a")
+    store.get("b")
+    assert store.get("a") is a
+    store.get("c")
+    assert "b" not in store and "a" in store and len(store) == 2
@@ -0,0 +1,49 @@
+import time
+from backend.state.memory import LatestListStore, SQLiteListStore, RedisListStore, make_list_store
+
+SONGS = [{"title": "Billie Jean", "artist": "Michael Jackson"}]
+
+class DictRedis:
+    """Minimal local stand-in for a Redis client."""
+    def __init__(self):
+        self.data = {}
+    def get(self, key):
+        value, expires = self.data.get(key, (None, None))
+        return None if expires is not None and expires <= time.time() else value
+    def set(self, key, value, px=None):
+        assert px is None or px > 0, "invalid expire time"
+        self.data[key] = (value, time.time() + px / 1000 if px is not None else None)
+    def delete(self, key):
+        self.data.pop(key, None)
+
+def test_sharded_memory_store_ttl_and_cap():
+    store = LatestListStore(num_shards=1, max_sessions=2)
+    for sid in ("a", "b", "c"):
+        store.set(sid, SONGS)
+    assert store.is_empty("a") and store.get("c") == SONGS
+
+    expiring = LatestListStore(ttl=-1)
+    expiring.set("a", SONGS)
+    assert expiring.get("a") == []
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = tmp_path / "latest.sqlite"
+    worker_a, worker_b = SQLiteListStore(path), make_list_store(f"sqlite:///{path}")
+    worker_a.set("s1", SONGS)
+    assert worker_b.get("s1") == SONGS
+    worker_b.clear("s1")
+    assert worker_a.is_empty("s1")
+
+def test_redis_store_with_local_stand_in():
+    client = DictRedis()
+    worker_a, worker_b = RedisListStore(client, ttl=60), RedisListStore(client, ttl=60)
+    worker_a.set("s1", SONGS)
+    assert worker_b.get("s1") == SONGS
+
+def test_redis_store_sub_second_ttl():
+    client = DictRedis()
+    store = RedisListStore(client, ttl=0.05)
+    store.set("s1", SONGS)
+    assert store.get("s1") == SONGS
+    time.sleep(0.06)
+    assert store.get("s1") == []
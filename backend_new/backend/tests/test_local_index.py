@@ -0,0 +1,46 @@
+import json
+from backend.classes import LocalRecordingIndex, MusicBrainzClient, RecordingQuery
+
+DUMP = [
+    {"id": "r1", "title": "You Shook Me All Night Long", "length": 210000, "isrcs": ["AUAP08000044"],
+     "artist-credit": [{"name": "AC/DC", "joinphrase": "", "artist": {"id": "a1", "tags": [{"name": "hard rock", "count": 20}]}}],
+     "releases": [{"id": "rel1", "date": "1980-07-25", "release-group": {"id": "rg1"}}],
+     "tags": [{"name": "hard rock", "count": 3}]},
+    {"id": "r2", "title": "Thunderstruck", "length": 292000,
+     "artist-credit": [{"name": "AC/DC", "joinphrase": "", "artist": {"id": "a1", "tags": [{"name": "hard rock", "count": 20}]}}],
+     "releases": [{"id": "rel2", "date": "1990-09-10"}]},
+    {"id": "r3", "title": "Billie Jean", "length": 294000,
+     "artist-credit": [{"name": "Michael Jackson", "joinphrase": "", "artist": {"id": "a2"}}],
+     "releases": [{"id": "rel3", "date": "1983-01-02"}], "tags": [{"name": "pop", "count": 9}]},
+]
+
+def test_local_index_answers_recording_queries(tmp_path):
+    src = tmp_path / "recording.jsonl"
+    src.write_text("\n".join(json.dumps(r) for r in DUMP), encoding="utf-8")
+    index = LocalRecordingIndex.build([src], tmp_path / "index.sqlite")
+    assert len(index) == 3
+
+    q = RecordingQuery(genre="Hard Rock", decade=1980, min_duration_ms=180000, max_duration_ms=300000)
+    mbc = MusicBrainzClient(local_index=index)
+    hits = mbc.search_recordings(q, limit=10, enrich_missing_dates=True, enrich_genres=True)
+    assert [h.title for h in hits] == ["You Shook Me All Night Long"]
+    assert hits[0].decade == 1980
+
+    # genre precomputed from the artist when the recording has no tags
+    (thunder,) = index.search(RecordingQuery(title="thunderstruck").to_lucene())
+    assert thunder.genre == "hard rock" and thunder.artist == "AC/DC"
+    assert [h.mbid for h in index.search(RecordingQuery(isrc="auap08000044").to_lucene())] == ["r1"]
+
+def test_year_only_dates_and_literal_like_characters(tmp_path):
+    src = tmp_path / "recording.jsonl"
+    rows = [
+        {"id": "y1", "title": "100% Pure Love", "artist-credit": [{"name": "Crystal Waters"}], "releases": [{"date": "1980"}]},
+        {"id": "y2", "title": "1000 Years", "artist-credit": [{"name": "Band_X"}], "releases": [{"date": "1989-12"}]},
+        {"id": "y3", "title": "Later", "length": None, "artist-credit": [{"name": "BandYX"}], "releases": [{"date": "1990"}]},
+    ]
+    src.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    index = LocalRecordingIndex.build([src], tmp_path / "index.sqlite")
+
+    assert {h.mbid for h in index.search(RecordingQuery(decade=1980).to_lucene())} == {"y1", "y2"}
+    assert [h.mbid for h in index.search('recording:"100%"')] == ["y1"]
+    assert [h.mbid for h in index.search('artist:"band_x"')] == ["y2"]
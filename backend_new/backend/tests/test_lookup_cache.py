@@ -0,0 +1,24 @@
+from backend.classes import LookupCache
+
+def test_lookup_cache_survives_reopen(tmp_path):
+    path = tmp_path / "mb.sqlite"
+    cache = LookupCache(path)
+    cache.put("artist", "mj", ["tags"], {"name": "Michael Jackson"})
+    cache.close()
+
+    reopened = LookupCache(path)
+    assert reopened.get("artist", "mj", ["tags"]) == {"name": "Michael Jackson"}
+    # includes are part of the key
+    assert reopened.get("artist", "mj", []) is None
+
+def test_lookup_cache_ttl_and_size_cap(tmp_path):
+    cache = LookupCache(tmp_path / "mb.sqlite", ttls={"release": -1}, max_entries=2)
+    cache.put("release", "r1", ["tags"], {"id": "r1"})
+    assert cache.get("release", "r1", ["tags"]) is None
+
+    for i in range(5):
+        cache.put("artist", f"a{i}", ["tags"], {"id": i})
+        assert len(cache) <= 2  # enforced on every put, not only on the periodic sweep
+    cache.prune()
+    assert len(cache) == 2
+    assert cache.get("artist", "a4", ["tags"]) == {"id": 4}
@@ -0,0 +1,54 @@
+import pytest
+import backend.helpers.nl as nl
+from backend.helpers.config import get_openai_client
+from backend.helpers.nl import nl_to_query_and_limit, parse_nl_rules
+
+@pytest.mark.parametrize("text,limit,fields", [
+    ("top 25 hip-hop tracks from the 1990s", 25, {"genre": "hip hop", "decade": 1990}),
+    ("give me ten jazz songs under 4 min", 10, {"genre": "jazz", "max_duration_ms": 240000}),
+    ("5 songs by AC/DC from the 70s", 5, {"artist": "AC/DC", "decade": 1970}),
+    ("the eighties synthpop hits", None, {"genre": "synth-pop", "decade": 1980}),
+    ("songs about 210 seconds long", None, {"min_duration_ms": 195000, "max_duration_ms": 225000}),
+    ("over 3 minutes and under 5 minutes rock", None, {"genre": "rock", "min_duration_ms": 180000, "max_duration_ms": 300000}),
+])
+def test_rules_parse_common_requests(text, limit, fields):
+    parsed = parse_nl_rules(text)
+    assert parsed.confidence == 1.0
+    assert parsed.limit == limit
+    for name, value in fields.items():
+        assert getattr(parsed.query, name) == value
+
+@pytest.mark.parametrize("text", [
+    "something for a rainy sunday afternoon",   # nothing recognized
+    "upbeat rock songs for running",            # mood words the rules can't place
+    "80s and 90s pop",                          # two decades, RecordingQuery holds one
+    "songs by Earth, Wind & Fire",              # artist cut short at the comma
+    "songs by Queen and David Bowie",           # one artist or two?
+    "Top 40 hits of the 80s",                   # a chart, not a count of 40
+])
+def test_ambiguous_requests_have_low_confidence(text):
+    assert parse_nl_rules(text).confidence < 0.75
+
+def test_llm_only_called_when_rules_are_unsure(monkeypatch):
+    calls = []
+    def fake_llm(text):
+        calls.append(text)
+        return nl.RecordingQuery(extra_terms=["rainy"]), 7
+    monkeypatch.setattr(nl, "_llm_parse", fake_llm)
+
+    q, limit = nl_to_query_and_limit("10 rock songs from the 80s")
+    assert (q.genre, q.decade, limit) == ("rock", 1980, 10)
+    assert calls == []
+
+    q, limit = nl_to_query_and_limit("something for a rainy sunday afternoon")
+    assert (q.extra_terms, limit) == (["rainy"], 7)
+    assert calls == ["something for a rainy sunday afternoon"]
+
+def test_openai_client_built_once(monkeypatch, capsys):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_openai_client.cache_clear()
+    try:
+        assert get_openai_client() is get_openai_client()
+        assert capsys.readouterr().out.count("OpenAI Key Loaded") == 1
+    finally:
+        get_openai_client.cache_clear()
@@ -0,0 +1,26 @@
+import threading
+import time
+from backend.classes import RateLimiter
+
+def test_interactive_lane_jumps_background_queue():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()  # drain the bucket
+    order = []
+
+    def take(lane, tag):
+        limiter.acquire(lane)
+        order.append(tag)
+
+    background = [threading.Thread(target=take, args=(RateLimiter.BACKGROUND, f"bg{i}")) for i in range(3)]
+    for t in background:
+        t.start()
+    time.sleep(0.01)
+    interactive = threading.Thread(target=take, args=(RateLimiter.INTERACTIVE, "search"))
+    interactive.start()
+    for t in background + [interactive]:
+        t.join()
+
+    assert order.index("search") <= 1
+    stats = limiter.stats()
+    assert stats["queue_depth"] == {"interactive": 0, "background": 0}
+    assert stats["wait_s"]["background"]["count"] == 4
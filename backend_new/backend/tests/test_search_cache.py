@@ -0,0 +1,37 @@
+import musicbrainzngs as mb
+from backend.classes import MusicBrainzClient, RecordingQuery, SearchCache, RateLimiter
+
+def test_equivalent_queries_share_cache_key():
+    a = RecordingQuery(genre="Hard Rock", decade=1980, extra_terms=["B", "a"])
+    b = RecordingQuery(genre=" hard  rock", decade=1980, extra_terms=["A", "b"])
+    assert a.cache_key() == b.cache_key()
+    assert a.cache_key() != RecordingQuery(genre="hard rock", decade=1990).cache_key()
+
+def test_search_results_served_from_cache(monkeypatch):
+    calls = []
+    def fake_search(query, limit):
+        calls.append(query)
+        return {"recording-list": [{"id": "r1", "title": "Thriller", "first-release-date": "1982"}]}
+    monkeypatch.setattr(mb, "search_recordings", fake_search)
+
+    mbc = MusicBrainzClient(search_cache=SearchCache(), limiter=RateLimiter(rate=1000, burst=100))
+    first = mbc.search_recordings(RecordingQuery(genre="Pop"), limit=5)
+    first[0].title = "mutated"
+    second = mbc.search_recordings(RecordingQuery(genre="pop"), limit=5)
+    assert second[0].title == "Thriller"
+    assert len(calls) == 1
+
+def test_stale_refresh_uses_background_lane(monkeypatch):
+    monkeypatch.setattr(mb, "search_recordings", lambda query, limit: {"recording-list": []})
+    limiter = RateLimiter(rate=1000, burst=100)
+    lanes = []
+    acquire = limiter.acquire
+    monkeypatch.setattr(limiter, "acquire", lambda lane=RateLimiter.BACKGROUND: lanes.append(lane) or acquire(lane))
+
+    cache = SearchCache(fresh_ttl=0)
+    mbc = MusicBrainzClient(search_cache=cache, limiter=limiter)
+    mbc.search_recordings(RecordingQuery(genre="pop"), limit=5)
+    key = mbc._search_cache_key(RecordingQuery(genre="pop"), 5, False, False)
+    assert cache.begin_refresh(key)  # hold the flag so search_recordings does not start its own thread
+    mbc._revalidate(key, RecordingQuery(genre="pop").to_lucene(), 5, False, False)
+    assert lanes == [RateLimiter.INTERACTIVE, RateLimiter.BACKGROUND]
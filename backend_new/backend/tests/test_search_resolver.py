@@ -0,0 +1,65 @@
+import threading
+import time
+
+from backend.tools.download_cache import DownloadCache
+from backend.tools.search_resolver import Resolution, SearchResolver
+from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
+
+
+def _fake_search(calls, delay=0.0):
+    def search(q):
+        calls.append(q)
+        time.sleep(delay)
+        vid = "vid-" + q.split()[-1].lower()
+        return Resolution(query=q, video_id=vid, title=q, duration=200, formats=[], info={"id": vid})
+    return search
+
+
+def test_resolve_is_cached_and_single_flight(monkeypatch):
+    r = SearchResolver(ttl=60)
+    calls = []
+    monkeypatch.setattr(r, "_search", _fake_search(calls, delay=0.05))
+
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(r.resolve("Michael Jackson - Billie Jean"))) for _ in range(5)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1 and {o.video_id for o in out} == {"vid-jean"}
+    assert r.resolve("michael  jackson - billie jean").video_id == "vid-jean"
+    assert len(calls) == 1
+
+    r.ttl = 0
+    r.resolve("Michael Jackson - Billie Jean")
+    assert len(calls) == 2
+
+
+def test_result_is_stored_before_the_inflight_future_is_dropped(monkeypatch):
+    r = SearchResolver(ttl=60)
+    monkeypatch.setattr(r, "_search", _fake_search([]))
+    store, seen = r._store, []
+    def checking_store(key, res):
+        seen.append(key in r._inflight)  # no window where neither the entry nor the future is visible
+        store(key, res)
+    monkeypatch.setattr(r, "_store", checking_store)
+    r.resolve("Thriller")
+    assert seen == [True] and r._inflight == {} and r.peek("thriller").video_id == "vid-thriller"
+
+
+def test_prefetch_then_download_skips_search(monkeypatch, tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    yd = YouTubeDownloader(cache=cache)
+    yd.download_folder = tmp_path
+    calls = []
+    monkeypatch.setattr(yd.resolver, "_search", _fake_search(calls))
+
+    yd.prefetch([SongItem(title="Billie Jean", artist="Michael Jackson"), SongItem(title="Thriller")])
+    deadline = time.time() + 2
+    while len(yd.resolver) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(yd.resolver) == 2
+
+    # the resolved video is already cached: no search, no media transfer
+    (tmp_path / "t.mp3").write_bytes(b"x")
+    cache.put("vid-thriller", "mp3", "192", str(tmp_path / "t.mp3"))
+    path = yd.download("Thriller")
+    assert path.endswith("Thriller.mp3") and len(calls) == 2
@@ -0,0 +1,17 @@
+from backend.tools.ydl_pool import YDLPool
+
+
+def test_pool_reuses_session_and_swaps_per_item_options():
+    pool = YDLPool({"quiet": True, "outtmpl": "default.%(ext)s"}, max_idle=2)
+    with pool.session() as s1, s1.item("/tmp/a.%(ext)s") as ydl:
+        assert ydl.params["outtmpl"]["default"] == "/tmp/a.%(ext)s"
+    with pool.session() as s2, s2.item() as ydl:
+        assert s2 is s1
+        assert ydl.params["outtmpl"]["default"] == "default.%(ext)s"
+
+    seen = []
+    with pool.session() as s, s.item("/tmp/b.%(ext)s", progress=seen.append):
+        s._on_progress({"downloaded_bytes": 10, "total_bytes_estimate": 100, "eta": 3})
+    s._on_progress({"downloaded_bytes": 20})  # outside item(): no callback
+    assert seen == [{"stage": "fetching", "downloaded_bytes": 10, "total_bytes": 100, "eta": 3}]
+    pool.close()
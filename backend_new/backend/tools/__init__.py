@@ -7,6 +7,15 @@ from .youtube_downloader import (
     make_youtube_download_tool,
 )
 
+from .download_cache import DownloadCache
+from .search_resolver import SearchResolver, Resolution
+
 from .nl_parser import(
     make_nl_parser_tool
-)
\ No newline at end of file
+)
+
+from .download_jobs import (
+    DownloadJobManager,
+    DownloadJob,
+    JobQueueFull,
+)
@@ -0,0 +1,104 @@
+# backend/tools/archive_stream.py
+from __future__ import annotations
+import os
+import tarfile
+import time
+import zipfile
+from typing import Iterable, Iterator, Literal, Set, Tuple
+
+ArchiveFormat = Literal["zip", "tar"]
+
+# (name inside the archive, path on disk)
+Entry = Tuple[str, str]
+
+CHUNK_SIZE = 256 * 1024
+
+MEDIA_TYPES = {"zip": "application/zip", "tar": "application/x-tar"}
+
+
+class _Sink:
+    """Write-only, non-seekable buffer that the archive writers fill and the generator drains."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out, self._parts = b"".join(self._parts), []
+        return out
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _unique(entries: Iterable[Entry]) -> Iterator[Entry]:
+    seen: Set[str] = set()
+    for name, path in entries:
+        base, ext = os.path.splitext(name)
+        candidate, n = name, 2
+        while candidate in seen:
+            candidate, n = f"{base} ({n}){ext}", n + 1
+        seen.add(candidate)
+        yield candidate, path
+
+
+def stream_zip(entries: Iterable[Entry], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    ZIP archive built on the fly. Entries are stored (MP3 doesn't compress)
+    with data descriptors, so nothing is seeked back to and memory stays at
+    about one chunk however many files there are. `entries` may be a
+    generator that yields files as they finish downloading.
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for name, path in _unique(entries):
+            info = zipfile.ZipInfo(name, date_time=time.localtime(os.path.getmtime(path))[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with zf.open(info, mode="w", force_zip64=True) as dst:
+                for chunk in _read_chunks(path, chunk_size):
+                    dst.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()  # central directory
+
+
+def stream_tar(entries: Iterable[Entry], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """ustar/pax archive built on the fly: header, file data in chunks, block padding."""
+    written = 0
+    for name, path in _unique(entries):
+        st = os.stat(path)
+        info = tarfile.TarInfo(name)
+        info.size, info.mtime, info.mode = st.st_size, int(st.st_mtime), 0o644
+        header = info.tobuf(format=tarfile.PAX_FORMAT)
+        yield header
+        written += len(header)
+        for chunk in _read_chunks(path, chunk_size):
+            yield chunk
+        remainder = st.st_size % tarfile.BLOCKSIZE
+        padding = tarfile.BLOCKSIZE - remainder if remainder else 0
+        yield b"\0" * padding
+        written += st.st_size + padding
+    # end-of-archive marker, then pad to a full record like tarfile does
+    written += 2 * tarfile.BLOCKSIZE
+    tail = -written % tarfile.RECORDSIZE
+    yield b"\0" * (2 * tarfile.BLOCKSIZE + tail)
+
+
+def stream_archive(entries: Iterable[Entry], fmt: ArchiveFormat = "zip") -> Iterator[bytes]:
+    writer = stream_zip if fmt == "zip" else stream_tar
+    for chunk in writer(entries):
+        if chunk:
+            yield chunk
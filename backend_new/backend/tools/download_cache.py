@@ -0,0 +1,143 @@
+# backend/tools/download_cache.py
+from __future__ import annotations
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+def normalize_query(query: str) -> str:
+    """'Michael Jackson – Billie  Jean' and 'michael jackson - billie jean' map to the same key."""
+    return " ".join(query.replace("–", "-").lower().split())
+
+
+class DownloadCache:
+    """
+    Content-addressed store of transcoded audio, keyed by resolved YouTube
+    video id + output codec/quality, plus an index from normalized queries
+    (SongItem.as_query()) to video ids. Files are evicted least recently used
+    once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 2 * 1024 ** 3):
+        self.root = Path(root).expanduser()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), timeout=10, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " key TEXT PRIMARY KEY, video_id TEXT NOT NULL, path TEXT NOT NULL,"
+            " size INTEGER NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS queries (query TEXT PRIMARY KEY, video_id TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS files_accessed ON files(accessed_at);"
+        )
+        self._db.commit()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(video_id: str, codec: str, quality: str) -> str:
+        return f"{video_id}-{codec}-{quality}"
+
+    def path_template(self, codec: str, quality: str) -> str:
+        """yt-dlp outtmpl that downloads straight to the content-addressed name."""
+        return str(self.root / f"%(id)s-{codec}-{quality}.%(ext)s")
+
+    # ---------- lookups ----------
+
+    def get(self, video_id: str, codec: str, quality: str) -> Optional[str]:
+        key = self.key(video_id, codec, quality)
+        with self._lock:
+            row = self._db.execute("SELECT path FROM files WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not os.path.exists(row[0]):
+                self._db.execute("DELETE FROM files WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE files SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return row[0]
+
+    def video_for_query(self, query: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT video_id FROM queries WHERE query = ?", (normalize_query(query),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_by_query(self, query: str, codec: str, quality: str) -> Optional[str]:
+        video_id = self.video_for_query(query)
+        return self.get(video_id, codec, quality) if video_id else None
+
+    # ---------- updates ----------
+
+    def remember_query(self, query: str, video_id: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO queries (query, video_id) VALUES (?, ?)",
+                (normalize_query(query), video_id),
+            )
+            self._db.commit()
+
+    def put(self, video_id: str, codec: str, quality: str, path: str, query: Optional[str] = None) -> str:
+        """Register a transcoded file (moved under root if it lives elsewhere); returns its cache path."""
+        key = self.key(video_id, codec, quality)
+        target = self.root / f"{key}{Path(path).suffix}"
+        if Path(path).resolve() != target.resolve():
+            shutil.move(path, target)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (key, video_id, path, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, video_id, str(target), target.stat().st_size, time.time()),
+            )
+            if query:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO queries (query, video_id) VALUES (?, ?)",
+                    (normalize_query(query), video_id),
+                )
+            self._evict(keep=key)
+            self._db.commit()
+        return str(target)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+
+    def _evict(self, keep: str) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, path, size in self._db.execute(
+            "SELECT key, path, size FROM files WHERE key != ? ORDER BY accessed_at", (keep,)
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM files WHERE key = ?", (key,))
+            total -= size
+
+    @staticmethod
+    def materialize(cached_path: str, dest: str | Path) -> str:
+        """Expose a cached file at dest (hard link, copy across devices); returns dest."""
+        dest = Path(dest)
+        if dest.exists() and os.path.samefile(cached_path, dest):
+            return str(dest)
+        # unique per call: concurrent cache hits for one query materialize the same dest
+        tmp = dest.with_name(f"{dest.name}.{uuid.uuid4().hex}.part-link")
+        try:
+            try:
+                os.link(cached_path, tmp)
+            except OSError:
+                shutil.copy2(cached_path, tmp)
+            os.replace(tmp, dest)
+        finally:
+            # also after success: rename() is a no-op when dest already links the same file
+            tmp.unlink(missing_ok=True)
+        return str(dest)
@@ -0,0 +1,210 @@
+# backend/tools/download_jobs.py
+from __future__ import annotations
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by submit() when the bounded job queue is full (backpressure)."""
+
+
+class DownloadCancelled(RuntimeError):
+    pass
+
+
+@dataclass
+class JobItem:
+    query: str
+    stage: str = "queued"  # queued | fetching | transcoding | done | error | cancelled
+    downloaded_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    eta: Optional[float] = None
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class DownloadJob:
+    id: str
+    items: List[JobItem]
+    status: str = "queued"  # queued | running | done | cancelled
+    session_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_json(self) -> Dict[str, Any]:
+        items = [asdict(it) for it in self.items]
+        running_etas = [it.eta for it in self.items if it.stage == "fetching" and it.eta is not None]
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "done": sum(it.stage in ("done", "error", "cancelled") for it in self.items),
+            "total": len(self.items),
+            "eta": max(running_etas) if running_etas else None,
+            "items": items,
+        }
+
+
+class DownloadJobManager:
+    """
+    Runs download batches in the background. submit() returns at once with a
+    job; progress is polled via get(). The queue of waiting jobs is bounded:
+    when it is full submit() raises JobQueueFull instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        downloader: Optional[YouTubeDownloader] = None,
+        max_queued_jobs: int = 16,
+        job_workers: int = 2,
+        max_kept_jobs: int = 500,
+    ):
+        self.downloader = downloader or YouTubeDownloader()
+        self.max_kept_jobs = max_kept_jobs
+        self._queue: "queue.Queue[DownloadJob]" = queue.Queue(maxsize=max_queued_jobs)
+        self._jobs: "OrderedDict[str, DownloadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"download-job-{i}", daemon=True)
+            for i in range(max(1, job_workers))
+        ]
+        for t in self._workers:
+            t.start()
+
+    # ---------- public API ----------
+
+    def submit(
+        self,
+        items: List[SongItem],
+        max_songs: Optional[int] = None,
+        session_id: Optional[str] = None,
+    ) -> DownloadJob:
+        if max_songs is not None:
+            items = items[:max_songs]
+        job = DownloadJob(
+            id=uuid.uuid4().hex,
+            items=[JobItem(query=it.as_query()) for it in items],
+            session_id=session_id,
+        )
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFull("Download queue is full, try again later.") from None
+            self._jobs[job.id] = job
+            self._forget_old()
+        return job
+
+    def get(self, job_id: str) -> Optional[DownloadJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in ("done", "cancelled"):
+                return False
+            job.cancel_event.set()
+            if job.status == "queued":
+                # not started: report it cancelled now; the worker skips it when dequeued
+                self._mark_cancelled(job)
+        return True
+
+    def for_session(self, session_id: str) -> List[DownloadJob]:
+        with self._lock:
+            return [j for j in self._jobs.values() if j.session_id == session_id]
+
+    @staticmethod
+    def iter_finished(jobs: List[DownloadJob], poll: float = 0.25) -> Iterator[JobItem]:
+        """
+        Yield downloaded items of the given jobs in completion order, waiting for
+        running ones. Items that failed or were cancelled are skipped.
+        """
+        pending = [it for job in jobs for it in job.items]
+        while pending:
+            still = []
+            for it in pending:
+                if it.stage == "done" and it.path:
+                    yield it
+                elif it.stage not in ("done", "error", "cancelled"):
+                    still.append(it)
+            if still and len(still) == len(pending):
+                time.sleep(poll)
+            pending = still
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    # ---------- workers ----------
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: DownloadJob) -> None:
+        with self._lock:
+            if job.cancel_event.is_set():
+                if job.status == "queued":
+                    self._mark_cancelled(job)
+                return
+            job.status = "running"
+
+        yd = self.downloader
+        workers = max(1, min(len(job.items), yd.fetch_workers + yd.transcode_workers))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda it: self._run_item(job, it), job.items))
+        job.status = "cancelled" if job.cancel_event.is_set() else "done"
+        job.finished_at = time.time()
+
+    def _run_item(self, job: DownloadJob, it: JobItem) -> None:
+        if job.cancel_event.is_set():
+            it.stage = "cancelled"
+            return
+
+        def progress(update: Dict[str, Any]) -> None:
+            if job.cancel_event.is_set():
+                raise DownloadCancelled("cancelled")
+            for key, value in update.items():
+                setattr(it, key, value)
+
+        it.stage = "fetching"
+        try:
+            it.path = self.downloader.download(it.query, progress=progress)
+            it.stage, it.eta = "done", 0
+        except Exception as e:
+            if job.cancel_event.is_set():
+                it.stage = "cancelled"
+            else:
+                it.stage, it.error = "error", str(e)
+
+    @staticmethod
+    def _mark_cancelled(job: DownloadJob) -> None:
+        for it in job.items:
+            it.stage = "cancelled"
+        job.status, job.finished_at = "cancelled", time.time()
+
+    def _forget_old(self) -> None:
+        # keep the most recent jobs; only finished ones are dropped
+        excess = len(self._jobs) - self.max_kept_jobs
+        for jid in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[jid].finished_at is not None:
+                del self._jobs[jid]
+                excess -= 1
@@ -4,17 +4,20 @@ from typing import Dict
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
 
-from backend.state.memory import LatestListStore
+from backend.state.memory import BaseListStore
 from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
+from backend.tools.download_jobs import DownloadJobManager, JobQueueFull
 
 class DownloadLatestInput(BaseModel):
     session_id: str = Field(..., description="Conversation session id")
 
 def make_download_latest_tool(
-    store: LatestListStore,
-    downloader: YouTubeDownloader | None = None
+    store: BaseListStore,
+    downloader: YouTubeDownloader | None = None,
+    jobs: DownloadJobManager | None = None,
 ) -> StructuredTool:
-    yd = downloader or YouTubeDownloader()
+    """With `jobs`, the download runs in the background and the tool returns a job id at once."""
+    yd = downloader or (jobs.downloader if jobs else YouTubeDownloader())
 
     def _impl(**kwargs) -> Dict:
         inp = DownloadLatestInput(**kwargs)
@@ -23,6 +26,17 @@ def make_download_latest_tool(
             return {"results": [], "note": "No latest list to download. Ask for suggestions first."}
 
         items = [SongItem(title=it.get("title",""), artist=it.get("artist")) for it in latest]
+        if jobs is not None:
+            try:
+                job = jobs.submit(items, session_id=inp.session_id)
+            except JobQueueFull as e:
+                return {"results": [], "note": str(e)}
+            return {
+                "job_id": job.id,
+                "status": job.status,
+                "count": len(job.items),
+                "note": f"Download started in the background. Progress: GET /jobs/{job.id}",
+            }
         results = yd.download_batch(items)
         return {"results": [r.dict() for r in results]}
 
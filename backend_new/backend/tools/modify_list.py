@@ -4,7 +4,8 @@ from typing import List, Optional, Dict
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
 
-from backend.state.memory import LatestListStore
+from backend.state.memory import BaseListStore
+from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
 from backend.helpers.nl import nl_to_query_and_limit
 from backend.classes import MusicBrainzClient
 
@@ -20,8 +21,10 @@ class ModifyInput(BaseModel):
 
 def make_modify_latest_tool(
     mbc: MusicBrainzClient,
-    store: LatestListStore,
+    store: BaseListStore,
+    downloader: YouTubeDownloader | None = None,
 ) -> StructuredTool:
+    """With `downloader`, the edited list is handed to its prefetch() so refilled songs get resolved too."""
     def _impl(**kwargs) -> Dict:
         inp = ModifyInput(**kwargs)
         current = store.get(inp.session_id)
@@ -64,6 +67,8 @@ def make_modify_latest_tool(
                     keep.append(a); seen.add(key)
 
         store.set(inp.session_id, keep)
+        if downloader is not None:
+            downloader.prefetch([SongItem(title=it.get("title", ""), artist=it.get("artist")) for it in keep])
         return {"songs": keep, "count": len(keep)}
 
     return StructuredTool.from_function(
@@ -0,0 +1,133 @@
+# backend/tools/search_resolver.py
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.tools.download_cache import normalize_query
+from backend.tools.ydl_pool import YDLPool
+
+
+@dataclass
+class Resolution:
+    query: str
+    video_id: str
+    title: Optional[str]
+    duration: Optional[float]
+    formats: List[Dict[str, Any]]
+    info: Dict[str, Any] = field(repr=False)  # sanitized yt-dlp info, enough to download without searching again
+    resolved_at: float = field(default_factory=time.time)
+
+
+class SearchResolver:
+    """
+    The ytsearch1 half of a download: query -> video id, duration and format
+    list, without fetching any media. Results are cached per normalized query
+    for `ttl` seconds (YouTube format URLs expire after a few hours), and
+    concurrent requests for the same query share one lookup.
+
+    prefetch() resolves a whole playlist in the background, so by the time the
+    user asks to download only the media transfer is left.
+    """
+
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "noplaylist": True,
+        "quiet": True,
+        "default_search": "ytsearch1",
+    }
+
+    def __init__(self, workers: int = 4, ttl: float = 3600, max_entries: int = 2000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Resolution]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="yt-resolve")
+        self._sessions = YDLPool(self.ydl_opts, max_idle=max(1, workers) + 2)
+
+    def resolve(self, query: str) -> Resolution:
+        key = normalize_query(query)
+        with self._lock:
+            hit = self._fresh(key)
+            if hit is not None:
+                return hit
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if not owner:
+            return fut.result()
+
+        try:
+            res = self._search(query)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(e)
+            raise
+        # stored before the future is dropped, so a concurrent resolve() always sees one of them
+        with self._lock:
+            self._store(key, res)
+            self._inflight.pop(key, None)
+        fut.set_result(res)
+        return res
+
+    def prefetch(self, queries: Iterable[str]) -> List[Future]:
+        """Resolve queries in the background; failures are kept on the futures, not raised."""
+        return [self._pool.submit(self.resolve, q) for q in queries if q]
+
+    def peek(self, query: str) -> Optional[Resolution]:
+        with self._lock:
+            return self._fresh(normalize_query(query))
+
+    def invalidate(self, query: str) -> None:
+        with self._lock:
+            self._entries.pop(normalize_query(query), None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ---------- internals ----------
+
+    def _search(self, query: str) -> Resolution:
+        with self._sessions.session() as session, session.item() as ydl:
+            info = ydl.extract_info(query, download=False)
+            if "entries" in info:  # ytsearch1 wraps the hit in a playlist
+                entries = list(info["entries"])
+                if not entries:
+                    raise LookupError(f"No YouTube result for {query!r}")
+                info = entries[0]
+            info = ydl.sanitize_info(info)
+        return Resolution(
+            query=query,
+            video_id=info["id"],
+            title=info.get("title"),
+            duration=info.get("duration"),
+            formats=[
+                {k: f.get(k) for k in ("format_id", "ext", "acodec", "abr", "filesize")}
+                for f in info.get("formats") or []
+            ],
+            info=info,
+        )
+
+    def _fresh(self, key: str) -> Optional[Resolution]:
+        res = self._entries.get(key)
+        if res is None:
+            return None
+        if time.time() - res.resolved_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return res
+
+    def _store(self, key: str, res: Resolution) -> None:
+        """Caller holds self._lock."""
+        self._entries[key] = res
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
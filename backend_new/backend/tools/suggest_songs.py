@@ -6,7 +6,8 @@ from langchain_core.tools import StructuredTool
 
 from backend.classes import MusicBrainzClient, RecordingQuery
 from backend.helpers.nl import nl_to_query_and_limit
-from backend.state.memory import LatestListStore
+from backend.state.memory import BaseListStore
+from backend.tools.youtube_downloader import YouTubeDownloader, SongItem
 
 CAP = 20  # hard cap per requirements
 
@@ -26,8 +27,10 @@ class SuggestInput(BaseModel):
 
 def make_suggest_songs_tool(
     mbc: MusicBrainzClient,
-    store: LatestListStore,
+    store: BaseListStore,
+    downloader: YouTubeDownloader | None = None,
 ) -> StructuredTool:
+    """With `downloader`, the YouTube hits for the new list are resolved in the background right away."""
     def _impl(**kwargs) -> Dict:
         inp = SuggestInput(**kwargs)
         # resolve limit with hard cap=20
@@ -63,6 +66,8 @@ def make_suggest_songs_tool(
         } for r in results]
 
         store.set(inp.session_id, songs)
+        if downloader is not None:
+            downloader.prefetch([SongItem(title=it.get("title", ""), artist=it.get("artist")) for it in songs])
         note = "You have reached the limit of 20 songs." if capped else None
         return {"songs": songs, "count": len(songs), "capped": capped, "note": note}
 
@@ -0,0 +1,76 @@
+# backend/tools/ydl_pool.py
+from __future__ import annotations
+import queue
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import yt_dlp
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class YDLSession:
+    """
+    One long-lived YoutubeDL. Extractor instances and the HTTP connection pool
+    survive between songs; per-song settings (output template, progress
+    callback) are swapped in by item() instead of rebuilding the object.
+    """
+
+    def __init__(self, opts: Dict[str, Any]):
+        self.progress: Optional[ProgressCallback] = None
+        self.ydl = yt_dlp.YoutubeDL({**opts, "progress_hooks": [self._on_progress]})
+        self._default_outtmpl = self.ydl.params["outtmpl"]["default"]
+
+    @contextmanager
+    def item(self, outtmpl: Optional[str] = None, progress: Optional[ProgressCallback] = None) -> Iterator[yt_dlp.YoutubeDL]:
+        self.ydl.params["outtmpl"]["default"] = outtmpl or self._default_outtmpl
+        self.progress = progress
+        try:
+            yield self.ydl
+        finally:
+            self.progress = None
+
+    def _on_progress(self, d: Dict[str, Any]) -> None:
+        if self.progress is not None:
+            self.progress({
+                "stage": "fetching",
+                "downloaded_bytes": d.get("downloaded_bytes"),
+                "total_bytes": d.get("total_bytes") or d.get("total_bytes_estimate"),
+                "eta": d.get("eta"),
+            })
+
+    def close(self) -> None:
+        self.ydl.close()
+
+
+class YDLPool:
+    """
+    Hands out YDLSessions one worker at a time. Sessions are created on first
+    demand and returned for reuse; at most max_idle are kept, so the pool grows
+    to the callers' own concurrency limit and stays there.
+    """
+
+    def __init__(self, opts: Dict[str, Any], max_idle: int = 8):
+        self.opts = dict(opts)
+        self._idle: "queue.LifoQueue[YDLSession]" = queue.LifoQueue(maxsize=max(1, max_idle))
+
+    @contextmanager
+    def session(self) -> Iterator[YDLSession]:
+        try:
+            s = self._idle.get_nowait()
+        except queue.Empty:
+            s = YDLSession(self.opts)
+        try:
+            yield s
+        finally:
+            try:
+                self._idle.put_nowait(s)
+            except queue.Full:
+                s.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
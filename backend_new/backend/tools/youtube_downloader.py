@@ -1,14 +1,24 @@
 # backend/tools/youtube_downloader.py
 from __future__ import annotations
+import copy
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Literal
+from threading import BoundedSemaphore, Lock
+from typing import Dict, Iterator, List, Optional, Literal
 
 import yt_dlp
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
 from pydantic import BaseModel, Field, validator
 from langchain_core.tools import StructuredTool
 
+from backend.tools.download_cache import DownloadCache
+from backend.tools.search_resolver import Resolution, SearchResolver
+from backend.tools.ydl_pool import YDLPool, ProgressCallback
+
 
 # ---------- Pydantic schemas for tool I/O ----------
 
@@ -46,9 +56,48 @@ class DownloadResult(BaseModel):
 # ---------- Concrete implementation (your template + batch) ----------
 
 class YouTubeDownloader:
-    def __init__(self):
+    """
+    Downloads run as two stages with separate concurrency limits: the network
+    fetch (best-audio download) and the FFmpeg MP3 transcode. The limits are
+    per downloader, so concurrent batches share them. The ytsearch1 resolution
+    before them is cached by the SearchResolver and can be done ahead of time
+    for a whole playlist with prefetch().
+
+    With a DownloadCache, transcoded files are stored once per resolved video
+    id + codec/quality and linked into the Downloads folder; a repeated query,
+    or a different query resolving to the same video, skips fetch and transcode.
+    Downloads of the same video are serialized, so concurrent requests for it
+    fetch it once.
+    """
+
+    codec = "mp3"
+    quality = "192"
+
+    def __init__(
+        self,
+        fetch_workers: int = 4,
+        transcode_workers: int = 2,
+        cache: Optional[DownloadCache] = None,
+        resolver: Optional[SearchResolver] = None,
+    ):
         self.download_folder = Path.home() / "Downloads"
         self.download_folder.mkdir(exist_ok=True)
+        self.cache = cache
+        self.resolver = resolver or SearchResolver()
+        self.fetch_workers = max(1, fetch_workers)
+        self.transcode_workers = max(1, transcode_workers)
+        self._fetch_slots = BoundedSemaphore(self.fetch_workers)
+        # one warm YoutubeDL per fetch slot; outtmpl and progress are set per song
+        self._sessions = YDLPool(
+            {"format": "bestaudio/best", "noplaylist": True, "quiet": True},
+            max_idle=self.fetch_workers,
+        )
+        self._transcode_slots = BoundedSemaphore(self.transcode_workers)
+        self._video_locks: Dict[str, list] = {}  # video id -> [lock, holders + waiters]
+        self._video_locks_guard = Lock()
+        # the FFmpeg postprocessor only reads options from its YoutubeDL; it gets its own,
+        # never a pooled session that a concurrent fetch may be re-targeting
+        self._postprocess_ydl = yt_dlp.YoutubeDL({"quiet": True})
 
     def sanitize_filename(self, name: str) -> str:
         """
@@ -58,51 +107,122 @@ class YouTubeDownloader:
         safe_name = re.sub(r'[<>:"/\\|?*]', "_", name)
         return safe_name.replace("–", "-")
 
-    def download(self, song_name: str) -> str:
+    def download(self, song_name: str, progress: Optional[ProgressCallback] = None) -> str:
         """
         Search YouTube for the song and download the best audio as .mp3.
         Returns the path to the downloaded file.
+        `progress`, if given, receives {"stage", "downloaded_bytes", "total_bytes", "eta"} updates;
+        raising from it aborts the download.
         """
-        safe_name = self.sanitize_filename(song_name)
-        output_template = os.path.join(self.download_folder, f"{safe_name}.%(ext)s")
-
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "noplaylist": True,
-            "quiet": True,
-            "default_search": "ytsearch1",
-            "outtmpl": output_template,
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }
-            ],
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(song_name, download=True)
-            filename = ydl.prepare_filename(info)
-            final_filename = os.path.splitext(filename)[0] + ".mp3"
-            return final_filename
+        if self.cache:
+            hit = self.cache.get_by_query(song_name, self.codec, self.quality)
+            if hit:
+                return self._deliver(hit, song_name)
+
+        res = self.resolver.resolve(song_name)
+        # "Artist - Title" and "Title" often resolve to the same video; the second
+        # waits here and then finds the first one's file instead of writing the
+        # same content-addressed paths alongside it
+        with self._video_lock(res.video_id):
+            if self.cache:
+                cached = self.cache.get(res.video_id, self.codec, self.quality)
+                if cached:
+                    self.cache.remember_query(song_name, res.video_id)
+                    return self._deliver(cached, song_name)
+
+            with self._fetch_slots:
+                info = self._fetch(song_name, res, progress)
+            if progress:
+                progress({"stage": "transcoding"})
+            with self._transcode_slots:
+                path = self._transcode(info)
+            if self.cache and info.get("id"):
+                path = self.cache.put(info["id"], self.codec, self.quality, path, query=song_name)
+                return self._deliver(path, song_name)
+            return path
+
+    def prefetch(self, items: List[SongItem]) -> None:
+        """Resolve the songs' YouTube hits in the background, ahead of a download request."""
+        self.resolver.prefetch(it.as_query() for it in items)
+
+    def _deliver(self, cached_path: str, song_name: str) -> str:
+        """Expose a cached file in the Downloads folder under the query's name."""
+        dest = self.download_folder / f"{self.sanitize_filename(song_name)}{Path(cached_path).suffix}"
+        return DownloadCache.materialize(cached_path, dest)
+
+    @contextmanager
+    def _video_lock(self, video_id: str) -> Iterator[None]:
+        """Serialize fetch + transcode + cache put per video id; entries are dropped when unused."""
+        with self._video_locks_guard:
+            entry = self._video_locks.setdefault(video_id, [Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._video_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._video_locks[video_id]
+
+    def _fetch(self, song_name: str, res: Resolution, progress: Optional[ProgressCallback] = None) -> dict:
+        """
+        Network stage: download the native audio stream of the query's
+        resolution (from the SearchResolver, usually prefetched).
+        """
+        if self.cache:
+            output_template = self.cache.path_template(self.codec, self.quality)
+        else:
+            safe_name = self.sanitize_filename(song_name)
+            output_template = os.path.join(self.download_folder, f"{safe_name}.%(ext)s")
+
+        with self._sessions.session() as session, session.item(output_template, progress) as ydl:
+            try:
+                info = ydl.process_ie_result(copy.deepcopy(res.info), download=True)
+            except yt_dlp.utils.DownloadError:
+                # format URLs in a prefetched resolution may have expired; resolve once more
+                if time.time() - res.resolved_at < 60:
+                    raise
+                self.resolver.invalidate(song_name)
+                res = self.resolver.resolve(song_name)
+                info = ydl.process_ie_result(copy.deepcopy(res.info), download=True)
+            downloads = info.get("requested_downloads") or []
+            info["filepath"] = downloads[0]["filepath"] if downloads else ydl.prepare_filename(info)
+        return info
+
+    def _transcode(self, info: dict) -> str:
+        """CPU stage: FFmpeg extract-audio to MP3 192k (same settings as the old postprocessor)."""
+        pp = FFmpegExtractAudioPP(self._postprocess_ydl, preferredcodec=self.codec, preferredquality=self.quality)
+        to_delete, info = pp.run(info)
+        for leftover in to_delete:
+            try:
+                os.remove(leftover)
+            except OSError:
+                pass
+        return os.path.splitext(info["filepath"])[0] + "." + self.codec
 
     def download_batch(self, items: List[SongItem], max_songs: Optional[int] = None) -> List[DownloadResult]:
         """
-        Sequentially download a list of songs. Returns per-item results.
+        Download a list of songs through the staged worker pool.
+        Returns per-item results in input order.
         """
         if max_songs is not None:
             items = items[:max_songs]
+        if not items:
+            return []
 
-        results: List[DownloadResult] = []
-        for it in items:
+        def one(it: SongItem) -> DownloadResult:
             q = it.as_query()
             try:
                 path = self.download(q)
-                results.append(DownloadResult(query=q, path=path, status="ok"))
+                return DownloadResult(query=q, path=path, status="ok")
             except Exception as e:
-                results.append(DownloadResult(query=q, status="error", error=str(e)))
-        return results
+                return DownloadResult(query=q, status="error", error=str(e))
+
+        # enough threads to keep both stages busy; the stage semaphores do the limiting
+        workers = min(len(items), self.fetch_workers + self.transcode_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(one, items))
 
 
 # ---------- LangChain Structured Tool factory ----------
@@ -21,6 +21,8 @@ trap 'echo "🧹 Stopping..."; kill 0 || true' EXIT
 
 echo "🔹 Starting FastAPI backend"
 cd backend
+# embeds only if datasets changed since the last build; startup then just loads the index
+python -m chains.build_index
 # --reload can misbehave on Windows background; start stable first
 python -m uvicorn main:app --host 127.0.0.1 --port 8000 & 
 BACKEND_PID=$!
@@ -30,7 +32,7 @@ echo "⏳ Waiting for backend..."
 # hit a simple JSON endpoint with GET
 until curl -fsS http://127.0.0.1:8000/diag/health >/dev/null; do
   printf '.'
-  sleep 20
+  sleep 1
 done
 echo -e "\n✅ Backend is up!"
 